@@ -35,6 +35,17 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_HOST: str = "127.0.0.1"
 
+    TIMELINE_DIR: str = "timelines"
+    RECORDING_DIR: str = "recordings"
+    RENDER_THREADS: int = 0
+    SHOW_ISOLATION: str = "process"
+    AUDIO_SOURCE: str | None = None
+    AUDIO_LOOP: bool = False
+    MEDIA_DIR: str = "media"
+    MOVE_IN_BLACK_FADE: float | None = 1.0
+    DMX_INPUT_RATE: float = 44.0
+    DMX_PLAYOUT_DELAY: float = 0.05
+
     model_config = SettingsConfigDict(extra="ignore", env_file=("../.env", ".env"))
 
     @property
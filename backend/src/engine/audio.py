@@ -0,0 +1,277 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Audio analysis for audio-reactive effects.
+
+An :class:`AudioAnalyzer` reads a WAV stream from a file or a named pipe
+(e.g. ``arecord -f cd -t wav > /run/hyperion/audio``) in a thread of its
+own. Every window of samples is Hann windowed and transformed with a
+radix-2 FFT; the energy of logarithmically spaced bands and an onset
+detector based on spectral flux are published as one small immutable
+:class:`AudioLevels` snapshot. The tick loop only ever reads the latest
+snapshot, so a stalled or slow audio source can never delay a tick.
+
+Levels are normalised against a slowly decaying peak per band, so quiet
+and loud material both use the full 0..255 range.
+"""
+
+import cmath
+import logging
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+logger = logging.getLogger("hyperion.engine.audio")
+
+BANDS = 8
+WINDOW = 1024
+LOW_FREQUENCY = 40.0
+HIGH_FREQUENCY = 16000.0
+# Dynamic range mapped to 0..255 below each band's running peak.
+RANGE_DB = 48.0
+PEAK_DECAY_DB = 0.05
+ONSET_HISTORY = 43
+ONSET_SENSITIVITY = 1.5
+ONSET_HOLDOFF = 0.1
+
+_SAMPLE_FORMATS = {1: "B", 2: "h", 4: "i"}
+
+
+@dataclass(frozen=True, slots=True)
+class AudioLevels:
+    """
+    The analysis of the latest audio window.
+
+    :param level: Overall loudness in [0, 255].
+    :param bands: Loudness of every band in [0, 255], lowest band first.
+    :param onsets: Number of onsets (beats, hits) detected so far.
+    """
+
+    level: int = 0
+    bands: bytes = bytes(BANDS)
+    onsets: int = 0
+
+    def band(self, index: int | None) -> int:
+        """
+        The loudness of a band.
+
+        :param index: The band, or ``None`` for the overall level.
+        :rtype: int
+        """
+        if index is None:
+            return self.level
+        return self.bands[min(max(index, 0), len(self.bands) - 1)]
+
+
+@lru_cache(maxsize=4)
+def _fft_plan(size: int) -> tuple[list[int], list[list[complex]]]:
+    bits = size.bit_length() - 1
+    order = [int(f"{index:0{bits}b}"[::-1], 2) for index in range(size)]
+    twiddles = []
+    span = 2
+    while span <= size:
+        twiddles.append([cmath.exp(-2j * math.pi * k / span) for k in range(span // 2)])
+        span *= 2
+    return order, twiddles
+
+
+def fft(samples: list[float]) -> list[complex]:
+    """
+    The discrete Fourier transform of a window.
+
+    :param samples: The window; its length must be a power of two.
+    :rtype: list[complex]
+    """
+    size = len(samples)
+    order, twiddles = _fft_plan(size)
+    values = [complex(samples[index]) for index in order]
+    half = 1
+    for stage in twiddles:
+        span = half * 2
+        for start in range(0, size, span):
+            for k, twiddle in enumerate(stage):
+                even = values[start + k]
+                odd = values[start + k + half] * twiddle
+                values[start + k] = even + odd
+                values[start + k + half] = even - odd
+        half = span
+    return values
+
+
+def band_edges(rate: int, window: int, bands: int) -> list[tuple[int, int]]:
+    """
+    FFT bin ranges of logarithmically spaced bands.
+
+    :param rate: Sample rate in Hz.
+    :param window: FFT size.
+    :param bands: Number of bands.
+    :return: ``(first, last)`` bins of every band, last exclusive.
+    :rtype: list[tuple[int, int]]
+    """
+    nyquist = window // 2
+    high = min(HIGH_FREQUENCY, rate / 2)
+    # Bins per band grow logarithmically, but every band gets at least one.
+    bounds = [max(round(LOW_FREQUENCY * window / rate), 1)]
+    for band in range(1, bands + 1):
+        frequency = LOW_FREQUENCY * (high / LOW_FREQUENCY) ** (band / bands)
+        bounds.append(max(round(frequency * window / rate), bounds[-1] + 1))
+    bounds = [min(bound, nyquist) for bound in bounds]
+    return [
+        (min(first, nyquist - 1), max(last, first + 1))
+        for first, last in zip(bounds, bounds[1:])
+    ]
+
+
+class AudioAnalyzer:
+    """
+    Analyses a WAV stream in a background thread.
+    """
+
+    def __init__(
+        self, source: str, bands: int = BANDS, window: int = WINDOW, loop: bool = False
+    ):
+        """
+        Initialise the analyzer. Nothing is read before :meth:`start`.
+
+        :param source: Path of a WAV file or of a pipe carrying a WAV stream.
+        :param bands: Number of frequency bands.
+        :param window: Samples per analysis window; a power of two.
+        :param loop: Start a file over when it ends. Pipes are never looped.
+        """
+        if window & (window - 1):
+            raise ValueError("The analysis window must be a power of two.")
+        self.source = source
+        self.bands = bands
+        self.window = window
+        self.loop = loop
+        self.levels = AudioLevels(bands=bytes(bands))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Start reading the source.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="hyperion-audio", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop reading. A thread blocked on an idle pipe ends with the process.
+        """
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        # Files are paced to real time; pipes deliver in real time anyway.
+        realtime = os.path.isfile(self.source)
+        onsets = 0
+        while not self._stop.is_set():
+            try:
+                with wave.open(self.source, "rb") as stream:
+                    onsets = self._analyse(stream, realtime, onsets)
+            except (OSError, EOFError, wave.Error) as e:
+                logger.error(f"Audio source {self.source} failed: {e}")
+                self._stop.wait(1.0)
+                continue
+            if realtime and not self.loop:
+                break
+
+    def _analyse(self, stream: wave.Wave_read, realtime: bool, onsets: int) -> int:
+        channels = stream.getnchannels()
+        width = stream.getsampwidth()
+        rate = stream.getframerate()
+        typecode = _SAMPLE_FORMATS.get(width)
+        if typecode is None:
+            raise wave.Error(f"Unsupported sample width {width}.")
+        full_scale = float(1 << (8 * width - 1))
+        offset = full_scale if width == 1 else 0.0
+
+        window = self.window
+        hann = [0.5 - 0.5 * math.cos(2 * math.pi * n / window) for n in range(window)]
+        edges = band_edges(rate, window, self.bands)
+        peaks = [-RANGE_DB] * (self.bands + 1)
+        flux_history: deque[float] = deque(maxlen=ONSET_HISTORY)
+        previous: list[float] | None = None
+        last_onset = -ONSET_HOLDOFF
+        started = time.monotonic()
+        position = 0
+
+        while not self._stop.is_set():
+            data = stream.readframes(window)
+            if len(data) < window * channels * width:
+                return onsets
+            samples = array(typecode, data)
+            if sys.byteorder == "big" and width > 1:
+                samples.byteswap()
+            # Down-mix to mono in [-1, 1].
+            mono = [
+                (sum(samples[i : i + channels]) / channels - offset) / full_scale
+                for i in range(0, len(samples), channels)
+            ]
+            spectrum = fft([s * w for s, w in zip(mono, hann)])
+            magnitudes = [abs(value) for value in spectrum[: window // 2]]
+
+            values = []
+            for band, (first, last) in enumerate(edges):
+                power = statistics.fmean(m * m for m in magnitudes[first:last])
+                values.append(self._normalise(peaks, band, power))
+            power = statistics.fmean(s * s for s in mono)
+            level = self._normalise(peaks, self.bands, power)
+
+            now = position / rate
+            if previous is not None:
+                flux = sum(max(m - p, 0.0) for m, p in zip(magnitudes, previous))
+                if len(flux_history) >= 4:
+                    threshold = statistics.fmean(flux_history) + (
+                        ONSET_SENSITIVITY * statistics.pstdev(flux_history)
+                    )
+                    if flux > threshold and now - last_onset >= ONSET_HOLDOFF:
+                        onsets += 1
+                        last_onset = now
+                flux_history.append(flux)
+            previous = magnitudes
+
+            # One assignment, so readers always see a consistent snapshot.
+            self.levels = AudioLevels(level, bytes(values), onsets)
+
+            position += window
+            if realtime:
+                delay = started + position / rate - time.monotonic()
+                if delay > 0:
+                    self._stop.wait(delay)
+        return onsets
+
+    @staticmethod
+    def _normalise(peaks: list[float], index: int, power: float) -> int:
+        db = 10 * math.log10(power + 1e-12)
+        peaks[index] = max(db, peaks[index] - PEAK_DECAY_DB)
+        value = (db - (peaks[index] - RANGE_DB)) / RANGE_DB
+        return min(max(round(value * 255), 0), 255)
@@ -14,3 +14,649 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import bisect
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from ..core import settings
+from ..models.dmx.cues import Cue, EasingProfile, TriggerType
+from ..models.dmx.effects import CueEffect, FxTypes
+from ..models.dmx.scenes import Scene
+from ..models.fixtures import AttributeGroup, AttributeType
+from .buffers import (
+    UNIVERSE_SIZE,
+    blank,
+    from_int,
+    lane_mask,
+    masked_merge,
+    to_int,
+)
+from .effects import EffectKernel, compile_effect
+from .palettes import BakedPalette
+from .patch import Patch
+from .selection import FixtureIndex
+
+
+@dataclass(slots=True)
+class UniverseState:
+    """
+    The compiled values of one universe.
+
+    :param values: The DMX values of all channels.
+    :param mask: ``0xFF`` for every channel that is part of the state.
+    """
+
+    values: bytearray = field(default_factory=blank)
+    mask: bytearray = field(default_factory=blank)
+
+    def set(self, address: int, value: int) -> None:
+        """
+        Set a single channel and mark it as part of the state.
+
+        :param address: Zero based channel index.
+        :param value: The DMX value, clamped to [0, 255].
+        """
+        self.values[address] = min(max(int(value), 0), 255)
+        self.mask[address] = 0xFF
+
+    def merged(self, delta: "UniverseState") -> "UniverseState":
+        """
+        Apply a delta on top of this state.
+
+        :param delta: The channels changed by a later cue.
+        :return: A new state; neither input is modified.
+        :rtype: UniverseState
+        """
+        return UniverseState(
+            values=bytearray(masked_merge(self.values, delta.values, delta.mask)),
+            mask=bytearray(from_int(to_int(self.mask) | to_int(delta.mask))),
+        )
+
+
+@dataclass(slots=True)
+class BakedEffect:
+    """
+    An effect of a cue with its parameters fully resolved.
+
+    :param id: Primary key of the :class:`CueEffect`.
+    :param fx_type: The effect algorithm.
+    :param parameters: Template defaults merged with the cue's overrides.
+    :param kernel: The compiled effect or ``None`` if its selection does not
+        resolve to any patched channel.
+    """
+
+    id: uuid.UUID
+    fx_type: FxTypes
+    parameters: dict
+    kernel: EffectKernel | None = None
+
+
+@dataclass(slots=True)
+class ChannelTiming:
+    """
+    The timing of a group of channels within a universe.
+
+    :param delay: Seconds from the GO until the channels start to fade.
+    :param fade: Seconds the channels take to fade.
+    :param lanes: The channels as a 16 bit lane mask, see
+        :func:`~.buffers.lane_mask`.
+    :param premove: Whether the group is a move in black, which does not
+        delay a follow.
+    """
+
+    delay: float
+    fade: float
+    lanes: int
+    premove: bool = False
+
+
+@dataclass(slots=True)
+class BakedCue:
+    """
+    A cue compiled into universe buffers, ready for playback.
+
+    :param id: Primary key of the cue.
+    :param number: The cue's position in the show's sequence.
+    :param label: Human readable cue label.
+    :param hold: Seconds to wait until the next cue is loaded.
+    :param fade: Seconds the crossfade into this cue takes.
+    :param easing: Interpolation curve used for the crossfade.
+    :param universes: The compiled scene (the cue's delta), keyed by universe.
+    :param effects: The cue's effects.
+    :param tracked: The cue's effective state including every value tracked
+        from earlier cues. Empty if tracking was not resolved.
+    :param trigger: Whether the next cue follows this one automatically.
+    :param delay: Seconds from the GO until the crossfade starts.
+    :param timings: Per universe, the channel groups with split timing. They
+        partition the universe; universes without an entry fade every
+        channel with ``delay`` and ``fade``.
+    """
+
+    id: uuid.UUID
+    number: int
+    label: str | None
+    hold: float
+    fade: float
+    easing: EasingProfile
+    universes: dict[int, UniverseState] = field(default_factory=dict)
+    effects: list[BakedEffect] = field(default_factory=list)
+    tracked: dict[int, UniverseState] = field(default_factory=dict)
+    trigger: TriggerType = TriggerType.MANUAL
+    delay: float = 0.0
+    timings: dict[int, tuple[ChannelTiming, ...]] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """
+        Seconds from the GO until the last channel has finished fading,
+        not counting moves in black.
+
+        :rtype: float
+        """
+        return max(
+            (
+                timing.delay + timing.fade
+                for timings in self.timings.values()
+                for timing in timings
+                if not timing.premove
+            ),
+            default=self.delay + self.fade,
+        )
+
+
+# Maps every non-zero value to 0xFF.
+_LIT = b"\x00" + b"\xff" * 255
+_FULL = b"\xff" * UNIVERSE_SIZE
+
+
+def _channel_mask(address: int) -> int:
+    return 0xFF << 8 * (UNIVERSE_SIZE - 1 - address)
+
+
+class Baker:
+    """
+    Compiles scenes and cues into flat universe buffers.
+
+    Baking happens once when a cue is loaded. Playback afterwards only works
+    on the resulting buffers and never resolves fixtures or attributes again.
+    """
+
+    def __init__(
+        self,
+        patch: Patch,
+        palettes: Iterable[BakedPalette] = (),
+        index: FixtureIndex | None = None,
+    ):
+        """
+        Initialise the baker.
+
+        :param patch: The patch of the show the scenes belong to.
+        :param palettes: The palettes of the show.
+        :param index: The patch's selection index, kept up to date by its
+            owner; effects select their fixtures with it.
+        """
+        self.patch = patch
+        self.index = index
+        self.palettes: dict[uuid.UUID, BakedPalette] = {p.id: p for p in palettes}
+        self._group_masks: dict[AttributeGroup, dict[int, int]] = {}
+        self._dimmers: dict[int, tuple[int, dict[int, int]]] | None = None
+
+    def patch_changed(self) -> None:
+        """
+        Drop the masks derived from the patch after it was edited.
+        """
+        self._group_masks.clear()
+        self._dimmers = None
+
+    def palette_values(
+        self, references: Iterable[tuple[uuid.UUID, uuid.UUID]]
+    ) -> list[tuple[uuid.UUID, AttributeType, int]]:
+        """
+        Resolve palette references into ``(fixture, attribute, value)``
+        triples.
+
+        References to unknown palettes are skipped.
+
+        :param references: ``(fixture, palette)`` pairs.
+        :rtype: list[tuple[uuid.UUID, AttributeType, int]]
+        """
+        values = []
+        for fixture_id, palette_id in references:
+            palette = self.palettes.get(palette_id)
+            if palette is not None:
+                values.extend(palette.values(fixture_id, self.patch))
+        return values
+
+    def bake_values(
+        self, values: Iterable[tuple[uuid.UUID, AttributeType, int]]
+    ) -> dict[int, UniverseState]:
+        """
+        Compile ``(fixture, attribute, value)`` triples into universe states.
+
+        Values of fixtures or attributes that are not patched are skipped.
+
+        :param values: The values to compile.
+        :return: The compiled states keyed by universe.
+        :rtype: dict[int, UniverseState]
+        """
+        universes: dict[int, UniverseState] = {}
+        for fixture_id, attribute, value in values:
+            position = self.patch.resolve(fixture_id, attribute)
+            if position is None:
+                continue
+            universe, address = position
+            state = universes.get(universe)
+            if state is None:
+                state = universes[universe] = UniverseState()
+            state.set(address, value)
+        return universes
+
+    def bake_scene(self, scene: Scene | None) -> dict[int, UniverseState]:
+        """
+        Compile a scene with its fixture values loaded.
+
+        Palettes are applied first, then colours, then literal values, so
+        the more specific source wins.
+
+        :param scene: The scene to compile, or ``None`` for an empty state.
+        :return: The compiled states keyed by universe.
+        :rtype: dict[int, UniverseState]
+        """
+        if scene is None:
+            return {}
+        return self.bake_values(
+            [
+                *self.palette_values(
+                    (reference.fixture_id, reference.palette_id)
+                    for reference in scene.palette_references
+                ),
+                *self.patch.color_values(
+                    (color.fixture_id, color.space, color.a, color.b, color.c)
+                    for color in scene.fixture_colors
+                ),
+                *(
+                    (value.fixture_id, value.attribute, value.value)
+                    for value in scene.fixture_associations
+                ),
+            ]
+        )
+
+    def bake_effect(self, effect: CueEffect) -> BakedEffect:
+        """
+        Resolve an effect's parameters and compile its kernel.
+
+        The cue's overrides are merged over the template defaults exactly
+        once, here; the kernel never looks at either dictionary again.
+
+        :param effect: The effect with its template loaded.
+        :return: The compiled effect.
+        :rtype: BakedEffect
+        """
+        parameters = {
+            **(effect.template.default_parameters or {}),
+            **(effect.parameters or {}),
+        }
+        fx_type = effect.template.fx_type
+        return BakedEffect(
+            id=effect.id,
+            fx_type=fx_type,
+            parameters=parameters,
+            kernel=compile_effect(
+                effect.id, fx_type, parameters, self.patch, self.index
+            ),
+        )
+
+    def _group_mask(self, group: AttributeGroup) -> dict[int, int]:
+        masks = self._group_masks.get(group)
+        if masks is None:
+            masks = self._group_masks[group] = {
+                universe: to_int(mask)
+                for universe, mask in self.patch.masks(group.attributes).items()
+            }
+        return masks
+
+    def bake_timings(
+        self, cue: Cue, delay: float, fade: float
+    ) -> dict[int, tuple[ChannelTiming, ...]]:
+        """
+        Resolve a cue's split timing into channel groups per universe.
+
+        Groups with equal timing share one channel group, and the channels
+        no split timing applies to form the last group with the cue's own
+        timing, so a crossfade needs one multiplication pair per distinct
+        timing instead of a loop over channels.
+
+        :param cue: The cue with its timings loaded.
+        :param delay: The cue's delay.
+        :param fade: The cue's fade.
+        :return: The channel groups of every universe with split timing.
+        :rtype: dict[int, tuple[ChannelTiming, ...]]
+        """
+        split: dict[tuple[float, float], dict[int, int]] = {}
+        for timing in cue.timings:
+            key = (
+                delay if timing.delay is None else max(timing.delay, 0.0),
+                fade if timing.fade is None else max(timing.fade, 0.0),
+            )
+            if key == (delay, fade):
+                continue
+            masks = split.setdefault(key, {})
+            for universe, mask in self._group_mask(timing.group).items():
+                masks[universe] = masks.get(universe, 0) | mask
+
+        parts: dict[int, list[tuple[tuple[float, float], int]]] = {}
+        for key, masks in split.items():
+            for universe, mask in masks.items():
+                parts.setdefault(universe, []).append((key, mask))
+        full = (1 << (UNIVERSE_SIZE * 8)) - 1
+        timings = {}
+        for universe, universe_parts in parts.items():
+            rest = full
+            for _, mask in universe_parts:
+                rest &= ~mask
+            if rest:
+                universe_parts.append(((delay, fade), rest))
+            timings[universe] = tuple(
+                ChannelTiming(key[0], key[1], lane_mask(from_int(mask)))
+                for key, mask in universe_parts
+            )
+        return timings
+
+    def _dimmer_index(self) -> dict[int, tuple[int, dict[int, int]]]:
+        # Per universe: the mask of all dimmer channels, and for the dimmer
+        # of every fixture the mask of the fixture's non-intensity channels.
+        if self._dimmers is None:
+            intensity = AttributeGroup.INTENSITY.attributes
+            self._dimmers = {}
+            for fixture in self.patch.fixtures.values():
+                dimmer = fixture.channels.get(AttributeType.DIMMER)
+                if dimmer is None:
+                    continue
+                others = 0
+                for attribute, channel in fixture.channels.items():
+                    if attribute not in intensity:
+                        others |= _channel_mask(channel.address)
+                mask, fixtures = self._dimmers.get(fixture.universe, (0, {}))
+                fixtures[dimmer.address] = others
+                self._dimmers[fixture.universe] = (
+                    mask | _channel_mask(dimmer.address),
+                    fixtures,
+                )
+        return self._dimmers
+
+    def move_in_black(
+        self, cue: BakedCue, following: dict[int, UniverseState], fade: float
+    ) -> None:
+        """
+        Pre-move fixtures that are dark in a cue and lit in the next one.
+
+        The intensity of consecutive tracked states is compared per
+        universe. Every fixture whose dimmer is dark in ``cue`` (and not
+        driven by one of its effects) but lit in the following cue gets the
+        following cue's position, colour and beam values added to the cue's
+        tracked state, in their own channel group that starts once the cue
+        has finished fading. The next GO then only fades the intensity.
+
+        :param cue: The cue with its tracked state resolved; modified in
+            place.
+        :param following: The tracked state of the next cue.
+        :param fade: Seconds the pre-move takes.
+        """
+        start = cue.duration
+        tracked = None
+        for universe, (dimmers, fixtures) in self._dimmer_index().items():
+            upcoming = following.get(universe)
+            if upcoming is None:
+                continue
+            current = cue.tracked.get(universe)
+            lit = to_int(upcoming.values.translate(_LIT)) & to_int(upcoming.mask)
+            waking = lit & dimmers
+            if current is not None:
+                current_lit = to_int(current.values.translate(_LIT))
+                waking &= ~(current_lit & to_int(current.mask))
+            for effect in cue.effects:
+                if effect.kernel is not None and universe in effect.kernel.masks:
+                    waking &= ~to_int(effect.kernel.masks[universe])
+            if not waking:
+                continue
+
+            premove = 0
+            for address, others in fixtures.items():
+                if waking & _channel_mask(address):
+                    premove |= others
+            changed = to_int(upcoming.mask)
+            if current is not None:
+                difference = to_int(current.values) ^ to_int(upcoming.values)
+                changed &= to_int(from_int(difference).translate(_LIT)) | ~to_int(
+                    current.mask
+                )
+            premove &= changed
+            if not premove:
+                continue
+
+            moved = UniverseState(
+                values=bytearray(upcoming.values), mask=bytearray(from_int(premove))
+            )
+            if tracked is None:
+                tracked = cue.tracked = dict(cue.tracked)
+            tracked[universe] = current.merged(moved) if current is not None else moved
+
+            lanes = lane_mask(from_int(premove))
+            timings = cue.timings.get(universe) or (
+                ChannelTiming(cue.delay, cue.fade, lane_mask(_FULL)),
+            )
+            cue.timings[universe] = (
+                *(
+                    ChannelTiming(
+                        timing.delay, timing.fade, timing.lanes & ~lanes, timing.premove
+                    )
+                    for timing in timings
+                    if timing.lanes & ~lanes
+                ),
+                ChannelTiming(start, fade, lanes, premove=True),
+            )
+
+    def bake_cue(self, cue: Cue) -> BakedCue:
+        """
+        Compile a cue with its scene and effect templates loaded.
+
+        :param cue: The cue to compile.
+        :return: The compiled cue.
+        :rtype: BakedCue
+        """
+        effects = [self.bake_effect(effect) for effect in cue.effects]
+        delay = max(cue.delay or 0.0, 0.0)
+        fade = cue.fade or 0.0
+        return BakedCue(
+            id=cue.id,
+            number=cue.number,
+            label=cue.label,
+            hold=cue.hold if cue.hold is not None else 2.0,
+            fade=fade,
+            easing=cue.easing or EasingProfile.LINEAR,
+            trigger=cue.trigger or TriggerType.MANUAL,
+            delay=delay,
+            timings=self.bake_timings(cue, delay, fade),
+            universes=self.bake_scene(cue.scene),
+            effects=effects,
+        )
+
+
+class TrackingResolver:
+    """
+    Resolves the effective (tracked) state of every cue of a show.
+
+    A cue only stores what it changes. The effective state of cue N is the
+    state of cue N-1 with the delta of cue N applied on top. States are
+    computed incrementally from the closest already resolved predecessor and
+    cached, so a jump to the 400th cue merges at most the deltas that were
+    not resolved before, and only once. Universes a delta does not touch
+    are shared with the predecessor instead of being copied.
+
+    Editing a cue invalidates its own state and the states of all later
+    cues; earlier states stay cached. Editing a palette only recompiles the
+    deltas of the cues that reference it.
+    """
+
+    def __init__(
+        self,
+        baker: Baker,
+        deltas: dict[int, list[tuple[uuid.UUID, AttributeType, int]]],
+        references: dict[int, list[tuple[uuid.UUID, uuid.UUID]]] | None = None,
+    ):
+        """
+        Initialise the resolver.
+
+        :param baker: The baker of the show.
+        :param deltas: The ``(fixture, attribute, value)`` triples of every
+            cue, keyed by cue number.
+        :param references: The ``(fixture, palette)`` references of every
+            cue's scene, keyed by cue number. They are resolved by the
+            baker and overridden by the literal values.
+        """
+        self.baker = baker
+        self.numbers = sorted(deltas)
+        self._raw = deltas
+        self._references = references or {}
+        self._deltas: dict[int, dict[int, UniverseState]] = {}
+        self._states: dict[int, dict[int, UniverseState]] = {}
+
+    def delta(self, number: int) -> dict[int, UniverseState]:
+        """
+        The compiled delta of a cue.
+
+        :param number: The cue number.
+        :rtype: dict[int, UniverseState]
+        """
+        delta = self._deltas.get(number)
+        if delta is None:
+            delta = self._deltas[number] = self.baker.bake_values(
+                [
+                    *self.baker.palette_values(self._references.get(number, ())),
+                    *self._raw.get(number, []),
+                ]
+            )
+        return delta
+
+    def palette_users(self, palette_id: uuid.UUID) -> list[int]:
+        """
+        The cues whose scenes reference a palette.
+
+        :param palette_id: The palette's primary key.
+        :rtype: list[int]
+        """
+        return [
+            number
+            for number in self.numbers
+            if any(ref[1] == palette_id for ref in self._references.get(number, ()))
+        ]
+
+    def fixture_users(self, fixture_id: uuid.UUID) -> list[int]:
+        """
+        The cues whose deltas set or reference a fixture.
+
+        :param fixture_id: The fixture's primary key.
+        :rtype: list[int]
+        """
+        return [
+            number
+            for number in self.numbers
+            if any(value[0] == fixture_id for value in self._raw.get(number, ()))
+            or any(ref[0] == fixture_id for ref in self._references.get(number, ()))
+        ]
+
+    def state(self, number: int) -> dict[int, UniverseState]:
+        """
+        The effective state of a cue.
+
+        :param number: The cue number.
+        :raises KeyError: If the cue does not exist.
+        :return: The tracked state keyed by universe.
+        :rtype: dict[int, UniverseState]
+        """
+        cached = self._states.get(number)
+        if cached is not None:
+            return cached
+
+        index = bisect.bisect_left(self.numbers, number)
+        if index == len(self.numbers) or self.numbers[index] != number:
+            raise KeyError(number)
+
+        start = index
+        while start > 0 and self.numbers[start - 1] not in self._states:
+            start -= 1
+        state = self._states[self.numbers[start - 1]] if start > 0 else {}
+
+        for position in range(start, index + 1):
+            state = dict(state)
+            for universe, delta in self.delta(self.numbers[position]).items():
+                previous = state.get(universe)
+                state[universe] = (
+                    previous.merged(delta) if previous is not None else delta
+                )
+            self._states[self.numbers[position]] = state
+        return state
+
+    def track(self, cue: BakedCue) -> BakedCue:
+        """
+        Attach the tracked state to a baked cue.
+
+        Unless :data:`Settings.MOVE_IN_BLACK_FADE` is ``None``, fixtures
+        that are dark in the cue and lit in the next one are pre-moved, see
+        :meth:`Baker.move_in_black`.
+
+        :param cue: The baked cue.
+        :return: The same cue.
+        :rtype: BakedCue
+        """
+        cue.tracked = self.state(cue.number)
+        index = bisect.bisect_right(self.numbers, cue.number)
+        fade = settings.MOVE_IN_BLACK_FADE
+        if fade is not None and index < len(self.numbers):
+            self.baker.move_in_black(
+                cue, self.state(self.numbers[index]), max(fade, 0.0)
+            )
+        return cue
+
+    def update(
+        self,
+        number: int,
+        values: list[tuple[uuid.UUID, AttributeType, int]],
+        references: list[tuple[uuid.UUID, uuid.UUID]] | None = None,
+    ) -> None:
+        """
+        Replace the delta of a cue, adding the cue if it is new.
+
+        :param number: The cue number.
+        :param values: The cue's new ``(fixture, attribute, value)`` triples.
+        :param references: The cue's new ``(fixture, palette)`` references.
+        """
+        if number not in self._raw:
+            bisect.insort(self.numbers, number)
+        self._raw[number] = values
+        self._references[number] = references or []
+        self.invalidate(number)
+
+    def remove(self, number: int) -> None:
+        """
+        Remove a deleted cue.
+
+        :param number: The cue number.
+        """
+        if number in self._raw:
+            self.invalidate(number)
+            del self._raw[number]
+            self._references.pop(number, None)
+            self.numbers.remove(number)
+
+    def invalidate(self, number: int) -> None:
+        """
+        Drop the cached states of a cue and every later cue.
+
+        :param number: The first edited cue number.
+        """
+        self._deltas.pop(number, None)
+        index = bisect.bisect_left(self.numbers, number)
+        for later in self.numbers[index:]:
+            self._states.pop(later, None)
@@ -0,0 +1,247 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Render benchmarks for sizing engine hardware.
+
+Run from the ``backend`` directory::
+
+    python -m src.engine.bench --threads 1 2 4 8 --universes 8 16 32 64 128
+
+Every universe is filled with 128 four-channel fixtures. The benchmarked
+cue crossfades all of them and runs a sine effect over every dimmer, which
+is the most expensive tick the engine renders.
+
+With ``--simulate SECONDS`` the whole engine instead plays a chain of
+follow cues on a simulated clock and reports how many show seconds it
+renders per wall clock second::
+
+    python -m src.engine.bench --simulate 600 --universes 8 32
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from ..models.dmx.cues import EasingProfile, TriggerType
+from ..models.dmx.effects import FxTypes
+from ..models.fixtures import AttributeType
+from .baker import BakedCue, BakedEffect, Baker
+from .clock import SimulatedClock
+from .effects import compile_effect
+from .fade import CueFade
+from .parallel import UniverseRenderer, free_threaded
+from .patch import Patch, PatchedChannel, PatchedFixture
+from .playback import PlaybackEngine
+from .simulation import ScriptEvent, throughput
+
+FIXTURES_PER_UNIVERSE = 128
+_ATTRIBUTES = (
+    AttributeType.DIMMER,
+    AttributeType.COLOR_RED,
+    AttributeType.COLOR_GREEN,
+    AttributeType.COLOR_BLUE,
+)
+
+
+def synthetic_patch(universes: int) -> Patch:
+    """
+    Build a patch of four-channel fixtures that fills whole universes.
+
+    :param universes: Number of universes.
+    :rtype: Patch
+    """
+    fixture_type_id = uuid.uuid4()
+    fixtures = []
+    for index in range(universes * FIXTURES_PER_UNIVERSE):
+        universe, slot = divmod(index, FIXTURES_PER_UNIVERSE)
+        channels = {
+            attribute: PatchedChannel(attribute, slot * len(_ATTRIBUTES) + offset)
+            for offset, attribute in enumerate(_ATTRIBUTES)
+        }
+        fixtures.append(
+            PatchedFixture(
+                uuid.uuid4(),
+                index + 1,
+                f"Bench {index + 1}",
+                universe,
+                fixture_type_id,
+                channels,
+            )
+        )
+    return Patch(fixtures)
+
+
+def synthetic_fade(patch: Patch, fade: float = 10.0) -> CueFade:
+    """
+    A fade into a full look with a sine effect on every dimmer.
+
+    :param patch: The patch from :func:`synthetic_patch`.
+    :param fade: Fade time in seconds.
+    :rtype: CueFade
+    """
+    baker = Baker(patch)
+    universes = baker.bake_values(
+        (fixture.id, attribute, (fixture.fid * 7 + offset * 31) % 256)
+        for fixture in patch.fixtures.values()
+        for offset, attribute in enumerate(_ATTRIBUTES)
+    )
+    effect_id = uuid.uuid4()
+    kernel = compile_effect(
+        effect_id,
+        FxTypes.SINE,
+        {"fixtures": [str(fixture_id) for fixture_id in patch.fixtures]},
+        patch,
+    )
+    cue = BakedCue(
+        id=uuid.uuid4(),
+        number=1,
+        label="bench",
+        hold=0.0,
+        fade=fade,
+        easing=EasingProfile.S_CURVE,
+        universes=universes,
+        effects=[BakedEffect(effect_id, FxTypes.SINE, {}, kernel)],
+    )
+    return CueFade(cue, {}, 0.0)
+
+
+def synthetic_show(
+    patch: Patch, cues: int = 20, fade: float = 3.0, hold: float = 2.0
+) -> list[BakedCue]:
+    """
+    A chain of follow cues, each a full look with a sine effect.
+
+    :param patch: The patch from :func:`synthetic_patch`.
+    :param cues: Number of cues.
+    :param fade: Fade time of every cue in seconds.
+    :param hold: Hold time of every cue in seconds.
+    :rtype: list[BakedCue]
+    """
+    baker = Baker(patch)
+    show = []
+    for number in range(1, cues + 1):
+        cue = synthetic_fade(patch, fade).cue
+        cue.number = number
+        cue.hold = hold
+        cue.trigger = TriggerType.FOLLOW
+        cue.universes = baker.bake_values(
+            (fixture.id, attribute, (fixture.fid * number + offset * 31) % 256)
+            for fixture in patch.fixtures.values()
+            for offset, attribute in enumerate(_ATTRIBUTES)
+        )
+        show.append(cue)
+    return show
+
+
+async def simulated(universes: int, seconds: float, workers: int = 1) -> float:
+    """
+    Play a synthetic show on a simulated clock.
+
+    :param universes: Number of universes.
+    :param seconds: Show seconds to render.
+    :param workers: Render threads.
+    :return: Show seconds rendered per wall clock second.
+    :rtype: float
+    """
+    patch = synthetic_patch(universes)
+    engine = PlaybackEngine(
+        None,
+        renderer=UniverseRenderer(workers, force=True),
+        clock=SimulatedClock(),
+    )
+    try:
+        await engine.load_cues(patch, {"main": synthetic_show(patch)})
+        return await throughput(engine, seconds, [ScriptEvent(0.0, "go")])
+    finally:
+        await engine.stop()
+        engine.renderer.close()
+
+
+def measure(fade: CueFade, renderer: UniverseRenderer, ticks: int) -> float:
+    """
+    Render ticks and return the mean time per tick.
+
+    :param fade: The fade to render.
+    :param renderer: The renderer to use.
+    :param ticks: Number of ticks; spread over the fade time at 40 Hz.
+    :return: Milliseconds per tick.
+    :rtype: float
+    """
+    fade.render(0.0, renderer)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        fade.render(tick / 40, renderer)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+
+def scaling(
+    threads: list[int], universes: list[int], ticks: int
+) -> list[tuple[int, int, float]]:
+    """
+    Measure every combination of thread and universe count.
+
+    Threads are used even on builds with the GIL, so both builds can be
+    compared.
+
+    :return: ``(universes, threads, ms_per_tick)`` rows.
+    :rtype: list[tuple[int, int, float]]
+    """
+    rows = []
+    for count in universes:
+        fade = synthetic_fade(synthetic_patch(count))
+        for workers in threads:
+            renderer = UniverseRenderer(workers, force=True)
+            try:
+                rows.append((count, workers, measure(fade, renderer, ticks)))
+            finally:
+                renderer.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hyperion render benchmark")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument(
+        "--universes", type=int, nargs="+", default=[8, 16, 32, 64, 128]
+    )
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--simulate", type=float, metavar="SECONDS")
+    args = parser.parse_args()
+
+    print(f"free-threaded: {free_threaded()}")
+    if args.simulate:
+        print(f"{'universes':>9} {'threads':>7} {'show s/s':>9}")
+        for count in args.universes:
+            for workers in args.threads:
+                speed = asyncio.run(simulated(count, args.simulate, workers))
+                print(f"{count:>9} {workers:>7} {speed:>9.1f}")
+        return
+    print(
+        f"{'universes':>9} {'threads':>7} {'ms/tick':>9} {'speedup':>8} {'max Hz':>8}"
+    )
+    baseline = {}
+    for count, workers, ms in scaling(args.threads, args.universes, args.ticks):
+        baseline.setdefault(count, ms)
+        print(
+            f"{count:>9} {workers:>7} {ms:>9.3f} "
+            f"{baseline[count] / ms:>8.2f} {1000 / ms:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Primitives for working with whole DMX universe buffers.
+
+A universe is always a 512 byte buffer. Masks are buffers of the same size
+holding ``0x00`` (channel not set) or ``0xFF`` (channel set).
+
+Hyperion deliberately does not depend on numpy. Whole-universe operations are
+therefore expressed as arbitrary precision integer arithmetic ("SIMD within a
+register"): a universe becomes one 4096 bit integer, or one 8192 bit integer
+with 16 bit lanes when intermediate results need headroom. A merge or a
+crossfade then costs a handful of C-level big integer operations instead of a
+Python loop over 512 channels.
+"""
+
+from functools import lru_cache
+
+UNIVERSE_SIZE = 512
+MAX_PRIORITY = 254
+
+_LANE_ROUNDING = int.from_bytes(b"\x00\x80" * UNIVERSE_SIZE)
+# The top bit of every 24 bit merge lane; merge keys stay below it.
+_GUARDS = int.from_bytes(b"\x80\x00\x00" * UNIVERSE_SIZE)
+_OWNED = b"\x00" + b"\xff" * 255
+
+
+def blank() -> bytearray:
+    """
+    Create an empty universe buffer.
+
+    :return: A zeroed buffer of :data:`UNIVERSE_SIZE` bytes.
+    :rtype: bytearray
+    """
+    return bytearray(UNIVERSE_SIZE)
+
+
+def to_int(buffer: bytes | bytearray) -> int:
+    """
+    Convert a universe buffer into its big integer representation.
+
+    :param buffer: The universe buffer.
+    :return: The buffer interpreted as a big endian integer.
+    :rtype: int
+    """
+    return int.from_bytes(buffer)
+
+
+def from_int(value: int) -> bytes:
+    """
+    Convert a big integer back into a universe buffer.
+
+    :param value: A value created by :func:`to_int` or derived from one.
+    :return: The 512 byte universe buffer.
+    :rtype: bytes
+    """
+    return value.to_bytes(UNIVERSE_SIZE)
+
+
+def masked_merge(
+    base: bytes | bytearray, top: bytes | bytearray, mask: bytes | bytearray
+) -> bytes:
+    """
+    Copy every channel of ``top`` selected by ``mask`` over ``base``.
+
+    :param base: The buffer providing all unmasked channels.
+    :param top: The buffer providing all masked channels.
+    :param mask: ``0xFF`` for every channel taken from ``top``.
+    :return: The merged universe buffer.
+    :rtype: bytes
+    """
+    m = to_int(mask)
+    return from_int((to_int(base) & ~m) | (to_int(top) & m))
+
+
+def _spread(buffer: bytes | bytearray) -> int:
+    lanes = bytearray(UNIVERSE_SIZE * 2)
+    lanes[1::2] = buffer
+    return int.from_bytes(lanes)
+
+
+def _gather(lanes: int) -> bytes:
+    return lanes.to_bytes(UNIVERSE_SIZE * 2)[0::2]
+
+
+def crossfade(
+    source: bytes | bytearray, target: bytes | bytearray, progress: float
+) -> bytes:
+    """
+    Linearly interpolate all channels from ``source`` to ``target``.
+
+    Both buffers are spread into 16 bit lanes so the weighted sum of every
+    channel fits into its lane without carrying into its neighbour.
+
+    :param source: The buffer at ``progress == 0``.
+    :param target: The buffer at ``progress == 1``.
+    :param progress: Normalised fade progress, clamped to [0, 1].
+    :return: The interpolated universe buffer.
+    :rtype: bytes
+    """
+    if progress <= 0.0:
+        return bytes(source)
+    if progress >= 1.0:
+        return bytes(target)
+    weight = round(progress * 256)
+    lanes = _spread(source) * (256 - weight) + _spread(target) * weight
+    return _gather(lanes + _LANE_ROUNDING)
+
+
+def lane_mask(mask: bytes | bytearray) -> int:
+    """
+    Widen a channel mask to the 16 bit lanes used by :func:`split_crossfade`.
+
+    :param mask: ``0xFF`` for every selected channel.
+    :return: ``0xFFFF`` in the lane of every selected channel.
+    :rtype: int
+    """
+    lanes = bytearray(UNIVERSE_SIZE * 2)
+    lanes[0::2] = mask
+    lanes[1::2] = mask
+    return int.from_bytes(lanes)
+
+
+def split_crossfade(
+    source: bytes | bytearray,
+    target: bytes | bytearray,
+    parts: list[tuple[float, int]],
+) -> bytes:
+    """
+    Crossfade groups of channels with their own progress each.
+
+    Every part is ``(progress, lanes)`` with ``lanes`` from
+    :func:`lane_mask`; the parts must not overlap. Each part costs two
+    big integer multiplications, however many channels it covers, and no
+    lane ever carries into its neighbour, so the parts are masked and
+    summed before a single gather.
+
+    :param source: The buffer at progress 0.
+    :param target: The buffer at progress 1.
+    :param parts: The channel groups and their normalised progress.
+    :return: The interpolated universe buffer. Channels outside every part
+        are 0.
+    :rtype: bytes
+    """
+    low = _spread(source)
+    high = _spread(target)
+    lanes = 0
+    for progress, mask in parts:
+        weight = round(min(max(progress, 0.0), 1.0) * 256)
+        lanes |= ((low * (256 - weight) + high * weight) + _LANE_ROUNDING) & mask
+    return _gather(lanes)
+
+
+def scale(buffer: bytes | bytearray, level: float) -> bytes:
+    """
+    Multiply all channels by a fader level.
+
+    :param buffer: The universe buffer.
+    :param level: The level, clamped to [0, 1].
+    :return: The scaled universe buffer.
+    :rtype: bytes
+    """
+    if level >= 1.0:
+        return bytes(buffer)
+    weight = round(max(level, 0.0) * 256)
+    return _gather(_spread(buffer) * weight + _LANE_ROUNDING)
+
+
+@lru_cache(maxsize=MAX_PRIORITY + 1)
+def _priority_table(priority: int) -> bytes:
+    # Maps a mask to the high byte of the merge keys: 0 for channels the
+    # layer does not own, priority + 1 for the others.
+    return b"\x00" + bytes([priority + 1]) * 255
+
+
+def _merge_keys(priority: int, values: bytes, mask: bytes) -> int:
+    lanes = bytearray(UNIVERSE_SIZE * 3)
+    lanes[2::3] = from_int(to_int(values) & to_int(mask))
+    lanes[1::3] = mask.translate(_priority_table(priority))
+    return int.from_bytes(lanes)
+
+
+def _lane_max(a: int, b: int) -> int:
+    # A lane's guard bit survives the subtraction exactly where a >= b. No
+    # lane borrows from its neighbour, since every key is below the guard.
+    wins = ((a | _GUARDS) - b) & _GUARDS
+    return b ^ ((a ^ b) & (wins - (wins >> 23)))
+
+
+def priority_merge(layers: list[tuple[int, bytes, bytes]]) -> tuple[bytes, bytes]:
+    """
+    Merge the layers of several playbacks channel by channel.
+
+    Every layer is ``(priority, values, mask)``. For each channel the layer
+    with the highest priority among those owning it wins; equal priorities
+    merge highest-takes-precedence. Each layer becomes one big integer of
+    24 bit lanes holding the keys ``(priority + 1) << 8 | value``. Two
+    layers are merged by comparing all lanes with one subtraction and
+    selecting the larger keys through the resulting mask, so every further
+    layer costs a constant handful of big integer operations.
+
+    :param layers: The layers; priorities in [0, :data:`MAX_PRIORITY`].
+    :return: The merged values and the mask of channels owned by any layer.
+    :rtype: tuple[bytes, bytes]
+    """
+    if not layers:
+        return bytes(UNIVERSE_SIZE), bytes(UNIVERSE_SIZE)
+    if len(layers) == 1:
+        _, values, mask = layers[0]
+        return from_int(to_int(values) & to_int(mask)), bytes(mask)
+    merged = _merge_keys(*layers[0])
+    for layer in layers[1:]:
+        merged = _lane_max(merged, _merge_keys(*layer))
+    lanes = merged.to_bytes(UNIVERSE_SIZE * 3)
+    return lanes[2::3], lanes[1::3].translate(_OWNED)
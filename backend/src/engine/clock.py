@@ -0,0 +1,101 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Time sources of the playback engine.
+
+The engine never reads the system clock directly. Live playback uses
+:class:`MonotonicClock`; simulations use :class:`SimulatedClock`, whose
+time only moves when told to, so a two hour show renders as fast as the
+CPU allows and always produces the same frames.
+"""
+
+import asyncio
+import time
+
+
+class Clock:
+    """
+    Base class of engine clocks.
+    """
+
+    def now(self) -> float:
+        """
+        The current engine time in seconds.
+
+        :rtype: float
+        """
+        raise NotImplementedError
+
+    async def sleep(self, delay: float) -> None:
+        """
+        Wait until the engine time has moved on by ``delay`` seconds.
+
+        :param delay: Seconds to wait.
+        """
+        raise NotImplementedError
+
+
+class MonotonicClock(Clock):
+    """
+    The system's monotonic clock.
+    """
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+
+class SimulatedClock(Clock):
+    """
+    A clock that only moves when it is advanced or slept on.
+
+    Sleeping advances the time at once and only yields to the event loop,
+    so the tick loop of an engine on this clock runs flat out.
+    """
+
+    def __init__(self, start: float = 0.0):
+        """
+        Initialise the clock.
+
+        :param start: The initial time in seconds.
+        """
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def set(self, now: float) -> None:
+        """
+        Jump to a time. The clock never goes backwards.
+
+        :param now: The new time in seconds.
+        """
+        self._now = max(self._now, now)
+
+    def advance(self, delay: float) -> None:
+        """
+        Move the time forward.
+
+        :param delay: Seconds to move on.
+        """
+        self._now += max(delay, 0.0)
+
+    async def sleep(self, delay: float) -> None:
+        self.advance(delay)
+        await asyncio.sleep(0)
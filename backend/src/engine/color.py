@@ -0,0 +1,181 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Conversion of abstract colours to fixture channels.
+
+Scenes and effects describe colours in a :class:`ColorSpace`. Every
+colour is first brought to linear RGB in [0, 1]; a :class:`ColorConverter`,
+compiled once per fixture type from its colour channels, then maps RGB to
+the channels that type actually has: RGB, RGBW (white extracted as the
+common part), white only, or the nearest slot of a colour wheel.
+
+Effects never convert per tick. :meth:`ColorConverter.tables` converts a
+whole cycle of colours at once into one table per channel, and the
+kernels index those tables by phase like any other waveform.
+"""
+
+import colorsys
+from collections.abc import Iterable, Sequence
+
+from ..models.dmx.scenes import ColorSpace
+from ..models.fixtures import AttributeType
+
+RGB = tuple[float, float, float]
+
+COLOR_ATTRIBUTES = (
+    AttributeType.COLOR_RED,
+    AttributeType.COLOR_GREEN,
+    AttributeType.COLOR_BLUE,
+    AttributeType.COLOR_WHITE,
+    AttributeType.COLOR_WHEEL,
+)
+
+# CIE XYZ to linear sRGB (D65).
+_XYZ_TO_RGB = (
+    (3.2406, -1.5372, -0.4986),
+    (-0.9689, 1.8758, 0.0415),
+    (0.0557, -0.2040, 1.0570),
+)
+
+
+def to_rgb(space: ColorSpace, a: float, b: float, c: float) -> RGB:
+    """
+    Convert a colour to linear RGB.
+
+    :param space: The colour space of the components.
+    :param a: Red, hue in degrees or CIE x.
+    :param b: Green, saturation or CIE y.
+    :param c: Blue, value or brightness Y.
+    :return: Red, green and blue in [0, 1].
+    :rtype: tuple[float, float, float]
+    """
+    match space:
+        case ColorSpace.HSV:
+            rgb = colorsys.hsv_to_rgb((a / 360.0) % 1.0, _unit(b), _unit(c))
+        case ColorSpace.XY:
+            rgb = _xy_to_rgb(a, b, _unit(c))
+        case _:
+            rgb = (a, b, c)
+    return tuple(_unit(value) for value in rgb)
+
+
+def _xy_to_rgb(x: float, y: float, brightness: float) -> RGB:
+    if y <= 0:
+        return 0.0, 0.0, 0.0
+    xyz = (x / y, 1.0, (1.0 - x - y) / y)
+    rgb = [max(sum(m * v for m, v in zip(row, xyz)), 0.0) for row in _XYZ_TO_RGB]
+    # Out of gamut colours keep their hue; the brightest component is full.
+    peak = max(rgb)
+    if peak <= 0:
+        return 0.0, 0.0, 0.0
+    return tuple(brightness * value / peak for value in rgb)
+
+
+def _unit(value: float) -> float:
+    return min(max(float(value), 0.0), 1.0)
+
+
+class ColorConverter:
+    """
+    Maps RGB colours to the colour channels of one fixture type.
+
+    :param attributes: The attributes of the type's channels.
+    :param wheel: ``(dmx_value, rgb)`` of every colour wheel slot.
+    """
+
+    def __init__(
+        self,
+        attributes: Iterable[AttributeType],
+        wheel: Sequence[tuple[int, RGB]] = (),
+    ):
+        attributes = set(attributes)
+        self.attributes = tuple(a for a in COLOR_ATTRIBUTES if a in attributes)
+        self.rgb = AttributeType.COLOR_RED in attributes or (
+            AttributeType.COLOR_GREEN in attributes
+            or AttributeType.COLOR_BLUE in attributes
+        )
+        self.white = AttributeType.COLOR_WHITE in attributes
+        # A wheel only selects the colour of fixtures that cannot mix it.
+        self.wheel = tuple(wheel) if not self.rgb else ()
+        self._tables: dict[tuple[RGB, ...], dict[AttributeType, bytes]] = {}
+
+    def convert(self, rgb: RGB) -> dict[AttributeType, int]:
+        """
+        The channel values showing a colour.
+
+        :param rgb: Red, green and blue in [0, 1].
+        :return: A value for every colour channel of the type.
+        :rtype: dict[AttributeType, int]
+        """
+        r, g, b = rgb
+        values: dict[AttributeType, float] = {}
+        if self.rgb:
+            if self.white:
+                w = min(r, g, b)
+                r, g, b = r - w, g - w, b - w
+                values[AttributeType.COLOR_WHITE] = w
+            values[AttributeType.COLOR_RED] = r
+            values[AttributeType.COLOR_GREEN] = g
+            values[AttributeType.COLOR_BLUE] = b
+        elif self.white:
+            values[AttributeType.COLOR_WHITE] = 0.2126 * r + 0.7152 * g + 0.0722 * b
+        result = {
+            attribute: round(255 * values[attribute])
+            for attribute in self.attributes
+            if attribute in values
+        }
+        if self.wheel and AttributeType.COLOR_WHEEL in self.attributes:
+            result[AttributeType.COLOR_WHEEL] = min(
+                self.wheel,
+                key=lambda slot: sum((s - v) ** 2 for s, v in zip(slot[1], rgb)),
+            )[0]
+        return result
+
+    def tables(self, colors: Sequence[RGB]) -> dict[AttributeType, bytes]:
+        """
+        Convert a whole sequence of colours at once.
+
+        The result is cached, so fixtures of the same type share the work.
+
+        :param colors: Up to 256 colours, e.g. one cycle of an effect.
+        :return: For every colour channel, its value for each colour.
+        :rtype: dict[AttributeType, bytes]
+        """
+        key = tuple(colors)
+        tables = self._tables.get(key)
+        if tables is None:
+            converted = [self.convert(rgb) for rgb in key]
+            tables = self._tables[key] = {
+                attribute: bytes(values[attribute] for values in converted)
+                for attribute in self.attributes
+                if attribute in converted[0]
+            }
+        return tables
+
+
+def wheel_slots(color_wheel: Iterable[dict] | None) -> tuple[tuple[int, RGB], ...]:
+    """
+    Parse the colour wheel of a fixture type.
+
+    :param color_wheel: ``{"value": dmx, "color": [r, g, b]}`` per slot,
+        with components in [0, 255].
+    :rtype: tuple[tuple[int, RGB], ...]
+    """
+    return tuple(
+        (int(slot["value"]), tuple(c / 255.0 for c in slot["color"]))
+        for slot in color_wheel or ()
+    )
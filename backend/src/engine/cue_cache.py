@@ -0,0 +1,189 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import bisect
+import logging
+from typing import Awaitable, Callable
+
+from .baker import BakedCue
+
+logger = logging.getLogger("hyperion.engine.cache")
+
+CueLoader = Callable[[int], Awaitable[BakedCue | None]]
+
+
+class CueCache:
+    """
+    Keeps the current cue (n) and the next cue (n+1) baked in memory.
+
+    Whenever the cache advances, the cue after the new current one is loaded
+    in a background task. A GO therefore only swaps references and never
+    waits on the database, unless it arrives before the prefetch finished.
+    Such misses are counted so they show up in the playback statistics.
+    """
+
+    def __init__(self, numbers: list[int], loader: CueLoader):
+        """
+        Initialise the cache.
+
+        :param numbers: All cue numbers of the show.
+        :param loader: Coroutine function loading and baking a cue by number.
+        """
+        self.numbers = sorted(numbers)
+        self.index = -1
+        self.current: BakedCue | None = None
+        self.next: BakedCue | None = None
+        self.misses = 0
+        self._loader = loader
+        self._prefetch: asyncio.Task | None = None
+
+    async def prime(self) -> None:
+        """
+        Load the first cue of the show as the next cue.
+
+        Called once when a show is loaded, before the first GO.
+        """
+        self.index = -1
+        self.current = None
+        self._schedule_prefetch()
+        await self._wait_for_prefetch()
+
+    async def advance(self) -> BakedCue | None:
+        """
+        Make the next cue the current one and start prefetching its successor.
+
+        If the prefetch failed or found nothing, the next cue is loaded once
+        more before the cue list is treated as ended, so a transient database
+        error does not stop the show.
+
+        :return: The new current cue or ``None`` at the end of the cue list.
+        :rtype: BakedCue | None
+        """
+        missed = False
+        if self.next is None and self._prefetch is not None:
+            if not self._prefetch.done():
+                missed = True
+                logger.warning("GO arrived before cue prefetch finished")
+            await self._wait_for_prefetch()
+        if self.next is None and self.index + 1 < len(self.numbers):
+            missed = True
+            self.next = await self._loader(self.numbers[self.index + 1])
+        if missed:
+            self.misses += 1
+        if self.next is None:
+            return None
+        self.current, self.next = self.next, None
+        self.index += 1
+        self._schedule_prefetch()
+        return self.current
+
+    async def goto(self, number: int) -> BakedCue | None:
+        """
+        Jump to an arbitrary cue.
+
+        Unless the target is the prefetched next cue, this loads it from the
+        database and is therefore not latency bound.
+
+        :param number: The cue number to jump to.
+        :return: The new current cue or ``None`` if it does not exist.
+        :rtype: BakedCue | None
+        """
+        if number not in self.numbers:
+            return None
+        index = self.numbers.index(number)
+        if index == self.index + 1:
+            return await self.advance()
+        self.misses += 1
+        # The prefetch is only replaced once the target has loaded, so a
+        # failed jump leaves the next GO working.
+        cue = await self._loader(number)
+        if cue is None:
+            return None
+        self.index = index
+        self.current, self.next = cue, None
+        self._schedule_prefetch()
+        return cue
+
+    def refresh(self) -> None:
+        """
+        Drop the prefetched next cue and load it again.
+
+        Used when the next cue was edited after it has been prefetched.
+        """
+        self._schedule_prefetch()
+
+    async def reload_current(self) -> BakedCue | None:
+        """
+        Load the current cue again after it was edited.
+
+        :return: The reloaded cue, or ``None`` if there is no current cue,
+            it was deleted or another cue became current while loading.
+        :rtype: BakedCue | None
+        """
+        current = self.current
+        if current is None or current.number not in self.numbers:
+            return None
+        cue = await self._loader(current.number)
+        if cue is None or self.current is not current:
+            return None
+        self.current = cue
+        return cue
+
+    def renumber(self, numbers: list[int]) -> None:
+        """
+        Replace the cue numbers after cues were added or deleted.
+
+        The current cue keeps its place; if it was deleted, the cache
+        continues with the cue after it. The next cue is loaded again.
+
+        :param numbers: All cue numbers of the show.
+        """
+        self.numbers = sorted(numbers)
+        if self.current is not None:
+            self.index = bisect.bisect_right(self.numbers, self.current.number) - 1
+        self._schedule_prefetch()
+
+    async def close(self) -> None:
+        """
+        Cancel a pending prefetch.
+        """
+        self._cancel_prefetch()
+
+    def _schedule_prefetch(self) -> None:
+        self._cancel_prefetch()
+        self.next = None
+        index = self.index + 1
+        if index < len(self.numbers):
+            self._prefetch = asyncio.create_task(self._fetch(index))
+
+    async def _fetch(self, index: int) -> None:
+        cue = await self._loader(self.numbers[index])
+        if index == self.index + 1:
+            self.next = cue
+
+    async def _wait_for_prefetch(self) -> None:
+        task = self._prefetch
+        if task is None:
+            return
+        await asyncio.wait({task})
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to prefetch cue: {task.exception()}")
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch is not None and not self._prefetch.done():
+            self._prefetch.cancel()
+        self._prefetch = None
@@ -0,0 +1,132 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Response curves applied in the output stage.
+
+Every :class:`DimmerCurve` compiles into a 256 entry table. The
+:class:`CurveStage` groups the patched channels of each universe by
+table, so correcting a universe costs one ``bytes.translate`` per
+distinct curve and one masked merge, however many channels use it.
+"""
+
+import bisect
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+
+from ..models.fixtures import DimmerCurve
+from .buffers import UNIVERSE_SIZE, from_int, to_int
+
+LINEAR = bytes(range(256))
+
+
+@lru_cache(maxsize=64)
+def _curve_table(curve: DimmerCurve, points: tuple[tuple[int, int], ...]) -> bytes:
+    match curve:
+        case DimmerCurve.SQUARE:
+            shape = [(x / 255) ** 2 for x in range(256)]
+        case DimmerCurve.S_CURVE:
+            shape = [3 * (x / 255) ** 2 - 2 * (x / 255) ** 3 for x in range(256)]
+        case DimmerCurve.CUSTOM if points:
+            return _interpolate(points)
+        case _:
+            return LINEAR
+    return bytes(round(255 * value) for value in shape)
+
+
+def _interpolate(points: Sequence[tuple[int, int]]) -> bytes:
+    xs = [x for x, _ in points]
+    table = bytearray(256)
+    for x in range(256):
+        index = bisect.bisect_right(xs, x)
+        if index == 0:
+            table[x] = points[0][1]
+        elif index == len(points):
+            table[x] = points[-1][1]
+        else:
+            (x0, y0), (x1, y1) = points[index - 1], points[index]
+            table[x] = round(y0 + (y1 - y0) * (x - x0) / (x1 - x0))
+    return bytes(table)
+
+
+def curve_table(
+    curve: DimmerCurve | None, points: Iterable[Sequence[int]] | None = None
+) -> bytes:
+    """
+    The lookup table of a response curve.
+
+    :param curve: The curve; ``None`` is linear.
+    :param points: CUSTOM only: ``[input, output]`` pairs in [0, 255],
+        interpolated linearly. Inputs outside the points keep the output of
+        the nearest point.
+    :return: 256 output values indexed by input value.
+    :rtype: bytes
+    """
+    if curve is None:
+        return LINEAR
+    clean = sorted(
+        {
+            min(max(int(x), 0), 255): min(max(int(y), 0), 255) for x, y in points or ()
+        }.items()
+    )
+    return _curve_table(curve, tuple(clean))
+
+
+class CurveStage:
+    """
+    The response curves of a patch, grouped per universe and table.
+    """
+
+    def __init__(self, channels: Iterable[tuple[int, int, bytes]] = ()):
+        """
+        Compile the stage.
+
+        :param channels: ``(universe, address, table)`` of every channel
+            with a non-linear curve.
+        """
+        groups: dict[int, dict[bytes, int]] = {}
+        for universe, address, table in channels:
+            if table == LINEAR:
+                continue
+            tables = groups.setdefault(universe, {})
+            shift = 8 * (UNIVERSE_SIZE - 1 - address)
+            tables[table] = tables.get(table, 0) | 0xFF << shift
+        self._groups: dict[int, tuple[int, tuple[tuple[bytes, int], ...]]] = {}
+        for universe, tables in groups.items():
+            union = 0
+            for mask in tables.values():
+                union |= mask
+            self._groups[universe] = (~union, tuple(tables.items()))
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def apply(self, frame: dict[int, bytes]) -> None:
+        """
+        Correct the universes of a frame in place.
+
+        :param frame: The universe buffers of the output stage.
+        """
+        for universe, (keep, tables) in self._groups.items():
+            buffer = frame.get(universe)
+            if buffer is None:
+                continue
+            # Timeline frames are memoryviews, which cannot translate.
+            buffer = bytes(buffer)
+            value = to_int(buffer) & keep
+            for table, mask in tables:
+                value |= to_int(buffer.translate(table)) & mask
+            frame[universe] = from_int(value)
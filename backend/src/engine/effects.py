@@ -0,0 +1,645 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Effect kernels for the :class:`FxTypes` generators.
+
+An effect is compiled once, when its cue is loaded. Compilation writes the
+phase offset of every selected channel into a per-universe *phase buffer*
+(one byte per channel, 256 steps per cycle). Evaluating the effect for a
+tick is then a single ``bytes.translate`` of that buffer through a table
+that combines the current phase with the waveform, followed by one masked
+merge into the frame. The cost per tick does not depend on the number of
+selected fixtures.
+
+Supported parameters (template defaults merged with cue overrides):
+
+``fixtures``
+    Fixture IDs in selection order. The order defines the phase spread.
+``group``
+    Instead of ``fixtures``: the ID of a fixture group, whose members are
+    taken in the group's selection order.
+``select``
+    Instead of ``fixtures``: criteria of the show's :class:`FixtureIndex`,
+    e.g. ``{"fixture_type": ..., "universe": 3}``; the matching fixtures
+    are taken in FID order. See :meth:`FixtureIndex.query`.
+``attribute``
+    The :class:`AttributeType` driven by the effect. Defaults to ``dimmer``.
+``speed``
+    Cycles per second. Defaults to 1.
+``beats``
+    Locks the effect to the show tempo instead of ``speed``: the length of
+    one cycle (SINE) or one step (CHASER, SPARKLE) in beats. The position
+    is taken from the show's beat count, so all locked effects stay in step
+    however late their cues started.
+``onset``
+    Steps the effect on the onsets of the audio input instead of time: one
+    cycle (SINE) or one step (CHASER, SPARKLE) per detected hit.
+``band``
+    AUDIO only: the frequency band that drives the level, 0 being the
+    lowest. Defaults to the overall loudness.
+``phase_spread``
+    Degrees of phase distributed across the selection. Defaults to 360.
+``low`` / ``high``
+    The value range of the effect. Defaults to 0 and 255. AUDIO maps silence
+    to ``low`` and full level to ``high``.
+``width``
+    CHASER only: number of fixtures lit per step. Defaults to 1.
+``density``
+    SPARKLE only: fraction of the selection lit per step. Defaults to 0.1.
+``seed``
+    SPARKLE only: seed of the random generator. Defaults to a value derived
+    from the effect's ID so playback is deterministic.
+``colors``
+    COLOR_CYCLE only: the colours to blend through, as ``[r, g, b]`` in
+    [0, 255]. Defaults to the hue circle.
+``saturation`` / ``brightness``
+    COLOR_CYCLE only: saturation and brightness of the hue circle in
+    [0, 1]. Default to 1.
+``pixel_map``
+    PIXEL_MAP only, instead of ``fixtures``: the ID of the :class:`PixelMap`
+    to play on. One cycle is the whole image sequence or pattern.
+``sequence``
+    PIXEL_MAP only: a directory of PPM images below
+    :data:`Settings.MEDIA_DIR`. Without it a pattern is generated.
+``fps``
+    PIXEL_MAP only: frames per second of a sequence, used unless ``speed``
+    is given.
+``pattern`` / ``axis`` / ``color`` / ``repeat``
+    PIXEL_MAP only: the generated pattern (``rainbow`` or ``wave``), the
+    axis it varies along (``x`` or ``y``), the colour of ``wave`` and the
+    number of cycles across the map.
+"""
+
+import colorsys
+import logging
+import math
+import os
+import random
+import uuid
+from functools import lru_cache
+
+from ..core import settings
+from ..models.dmx.effects import FxTypes
+from ..models.fixtures import AttributeType
+from .audio import AudioLevels
+from .buffers import blank, from_int, masked_merge, to_int
+from .color import RGB, ColorConverter
+from .patch import Patch, PatchedFixture
+from .pixelmap import Media, Pattern, PixelLayout, Sampler, load_sequence
+from .selection import FixtureIndex
+from .tempo import DEFAULT_BPM
+
+logger = logging.getLogger("hyperion.engine.effects")
+
+PHASE_STEPS = 256
+
+
+@lru_cache(maxsize=256)
+def _phase_tables(waveform: bytes) -> tuple[bytes, ...]:
+    """
+    Build one translation table per phase step for a waveform.
+
+    Table ``s`` maps a channel's phase offset ``k`` to
+    ``waveform[(k + s) % PHASE_STEPS]``.
+    """
+    doubled = waveform + waveform
+    return tuple(doubled[step : step + PHASE_STEPS] for step in range(PHASE_STEPS))
+
+
+def _scale(shape: list[float], low: int, high: int) -> bytes:
+    span = high - low
+    return bytes(min(max(round(low + span * v), 0), 255) for v in shape)
+
+
+class EffectKernel:
+    """
+    Base class of all compiled effects.
+
+    :param targets: ``(universe, address)`` of every selected channel, in
+        selection order.
+    :param parameters: The resolved effect parameters.
+    """
+
+    def __init__(self, targets: list[tuple[int, int]], parameters: dict):
+        self.parameters = parameters
+        self.speed = float(parameters.get("speed", 1.0))
+        beats = parameters.get("beats")
+        self.beats = max(float(beats), 1 / 64) if beats is not None else None
+        self.onset = bool(parameters.get("onset", False))
+        self.low = min(max(int(parameters.get("low", 0)), 0), 255)
+        self.high = min(max(int(parameters.get("high", 255)), 0), 255)
+        self.masks: dict[int, bytearray] = {}
+        self.phases: dict[int, bytearray] = {}
+
+        spread = float(parameters.get("phase_spread", 360.0)) / 360.0
+        count = max(len(targets), 1)
+        for index, (universe, address) in enumerate(targets):
+            if universe not in self.masks:
+                self.masks[universe] = blank()
+                self.phases[universe] = blank()
+            offset = round(index * spread * PHASE_STEPS / count) % PHASE_STEPS
+            self.masks[universe][address] = 0xFF
+            self.phases[universe][address] = offset
+
+    @property
+    def cycle_steps(self) -> int:
+        """
+        Steps per cycle; ``beats`` and ``onset`` count in steps.
+
+        :rtype: int
+        """
+        return 1
+
+    def position(
+        self, t: float, beat: float | None, audio: AudioLevels | None = None
+    ) -> float:
+        """
+        How many cycles the effect has run.
+
+        :param t: Seconds since the effect started.
+        :param beat: The show's beat position, or ``None`` to count beats at
+            :data:`DEFAULT_BPM` from the start of the effect.
+        :param audio: The latest audio analysis for onset-driven effects.
+        :rtype: float
+        """
+        if self.onset:
+            onsets = audio.onsets if audio is not None else 0
+            return onsets / self.cycle_steps
+        if self.beats is None:
+            return t * self.speed
+        if beat is None:
+            beat = t * DEFAULT_BPM / 60.0
+        return beat / (self.beats * self.cycle_steps)
+
+    def phase(
+        self, t: float, beat: float | None = None, audio: AudioLevels | None = None
+    ) -> float:
+        """
+        The effect's position within its cycle.
+
+        :param t: Seconds since the effect started.
+        :param beat: The show's beat position for beat-locked effects.
+        :param audio: The latest audio analysis for audio-driven effects.
+        :return: The phase in [0, 1).
+        :rtype: float
+        """
+        return self.position(t, beat, audio) % 1.0
+
+    def row(self, universe: int, phase: float) -> bytes:
+        """
+        Evaluate all selected channels of a universe.
+
+        :param universe: The universe index.
+        :param phase: The phase returned by :meth:`phase`.
+        :return: The effect values; only masked channels are meaningful.
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def render(
+        self,
+        t: float,
+        frame: dict[int, bytes],
+        beat: float | None = None,
+        audio: AudioLevels | None = None,
+    ) -> None:
+        """
+        Merge the effect's output for one tick into a frame.
+
+        :param t: Seconds since the effect started.
+        :param frame: The universe buffers to write into.
+        :param beat: The show's beat position for beat-locked effects.
+        :param audio: The latest audio analysis for audio-driven effects.
+        """
+        phase = self.phase(t, beat, audio)
+        for universe, mask in self.masks.items():
+            frame[universe] = masked_merge(
+                frame.get(universe, blank()), self.row(universe, phase), mask
+            )
+
+    def render_universe(
+        self,
+        t: float,
+        universe: int,
+        buffer: bytes,
+        beat: float | None = None,
+        audio: AudioLevels | None = None,
+    ) -> bytes:
+        """
+        Merge the effect's output for one tick into a single universe.
+
+        Only reads the kernel, so different universes may be rendered from
+        different threads at the same time.
+
+        :param t: Seconds since the effect started.
+        :param universe: The universe index; it must be one of :attr:`masks`.
+        :param buffer: The universe's values before the effect.
+        :param beat: The show's beat position for beat-locked effects.
+        :param audio: The latest audio analysis for audio-driven effects.
+        :return: The merged values.
+        :rtype: bytes
+        """
+        return masked_merge(
+            buffer,
+            self.row(universe, self.phase(t, beat, audio)),
+            self.masks[universe],
+        )
+
+
+class WaveformKernel(EffectKernel):
+    """
+    Kernel driven by a periodic waveform sampled at :data:`PHASE_STEPS`.
+    """
+
+    shape: list[float] = [0.0] * PHASE_STEPS
+
+    def __init__(self, targets: list[tuple[int, int]], parameters: dict):
+        super().__init__(targets, parameters)
+        self.tables = _phase_tables(_scale(self.waveform(), self.low, self.high))
+
+    def waveform(self) -> list[float]:
+        """
+        The normalised waveform of one cycle.
+
+        :return: :data:`PHASE_STEPS` values in [0, 1].
+        :rtype: list[float]
+        """
+        return self.shape
+
+    def step(self, phase: float) -> int:
+        """
+        Quantise a phase to a table index.
+
+        :param phase: The phase in [0, 1).
+        :rtype: int
+        """
+        return int(phase * PHASE_STEPS) % PHASE_STEPS
+
+    def row(self, universe: int, phase: float) -> bytes:
+        return self.phases[universe].translate(self.tables[self.step(phase)])
+
+
+class SineKernel(WaveformKernel):
+    """
+    Smooth oscillation between ``low`` and ``high``.
+    """
+
+    shape = [
+        0.5 + 0.5 * math.sin(2 * math.pi * step / PHASE_STEPS)
+        for step in range(PHASE_STEPS)
+    ]
+
+
+class ChaserKernel(WaveformKernel):
+    """
+    Steps a block of ``width`` lit fixtures through the selection.
+    """
+
+    def __init__(self, targets: list[tuple[int, int]], parameters: dict):
+        self.steps = max(len(targets), 1)
+        self.width = max(int(parameters.get("width", 1)), 1)
+        super().__init__(targets, parameters)
+
+    @property
+    def cycle_steps(self) -> int:
+        return self.steps
+
+    def waveform(self) -> list[float]:
+        lit = self.width * PHASE_STEPS / self.steps
+        return [1.0 if step < lit else 0.0 for step in range(PHASE_STEPS)]
+
+    def step(self, phase: float) -> int:
+        # Snap to whole chase steps so fixtures switch instead of drifting.
+        # Stepping backwards in phase moves the lit block forwards through
+        # the selection.
+        chase_step = int(phase * self.steps) % self.steps
+        return -round(chase_step * PHASE_STEPS / self.steps) % PHASE_STEPS
+
+
+class SparkleKernel(EffectKernel):
+    """
+    Lights a random subset of the selection at every step.
+
+    The subset of a step only depends on the seed and the step number, so
+    two renders of the same show produce identical frames.
+    """
+
+    def __init__(
+        self, targets: list[tuple[int, int]], parameters: dict, effect_id: uuid.UUID
+    ):
+        super().__init__(targets, parameters)
+        self.targets = targets
+        self.seed = int(parameters.get("seed", effect_id.int & 0xFFFFFFFF))
+        density = min(max(float(parameters.get("density", 0.1)), 0.0), 1.0)
+        self.count = round(density * len(targets))
+        self._built: tuple[int, dict[int, bytes]] = (-1, {})
+
+    def phase(
+        self, t: float, beat: float | None = None, audio: AudioLevels | None = None
+    ) -> float:
+        # Sparkle has no cycle; the "phase" is the absolute step number.
+        return math.floor(self.position(t, beat, audio))
+
+    def row(self, universe: int, phase: float) -> bytes:
+        step = int(phase)
+        built = self._built
+        if built[0] != step:
+            built = self._build(step)
+        return built[1][universe]
+
+    def _build(self, step: int) -> tuple[int, dict[int, bytes]]:
+        rows = {universe: bytearray([self.low]) * 512 for universe in self.masks}
+        rng = random.Random(self.seed * 1_000_003 + step)
+        for universe, address in rng.sample(self.targets, self.count):
+            rows[universe][address] = self.high
+        # Step and rows are swapped in together, so concurrent readers never
+        # see the rows of another step.
+        self._built = (step, {universe: bytes(row) for universe, row in rows.items()})
+        return self._built
+
+
+@lru_cache(maxsize=256)
+def _level_table(value: int) -> bytes:
+    # Maps the 0xFF of a selection mask to the level and 0 to itself.
+    return bytes(value if byte == 0xFF else byte for byte in range(256))
+
+
+class AudioKernel(EffectKernel):
+    """
+    Follows the loudness of the audio input or of one of its bands.
+
+    All selected channels share one value, so a tick costs one translate of
+    the selection mask per universe.
+    """
+
+    def __init__(self, targets: list[tuple[int, int]], parameters: dict):
+        super().__init__(targets, parameters)
+        band = parameters.get("band")
+        self.band = int(band) if band is not None else None
+
+    def phase(
+        self, t: float, beat: float | None = None, audio: AudioLevels | None = None
+    ) -> float:
+        # The "phase" is the level in [0, 255]; silence without an input.
+        return audio.band(self.band) if audio is not None else 0
+
+    def row(self, universe: int, phase: float) -> bytes:
+        value = self.low + (self.high - self.low) * int(phase) // 255
+        return self.masks[universe].translate(_level_table(value))
+
+
+class PixelMapKernel(EffectKernel):
+    """
+    Plays a medium on a pixel map.
+
+    The layout's channels are contiguous in every universe, so the sampled
+    run replaces that slice of the buffer as is, without a masked merge.
+    """
+
+    def __init__(self, layout: PixelLayout, media: Media, parameters: dict):
+        super().__init__([], parameters)
+        self.media = media
+        if "speed" not in parameters and "fps" in parameters:
+            self.speed = float(parameters["fps"]) / media.steps
+        self.sampler = Sampler(layout, media.width, media.height)
+        self.masks = self.sampler.masks()
+
+    def frame(self, phase: float) -> bytes:
+        """
+        The media frame shown at a phase.
+
+        :param phase: The phase in [0, 1).
+        :rtype: bytes
+        """
+        steps = self.media.steps
+        return self.media.frame(int(phase * steps) % steps)
+
+    def row(self, universe: int, phase: float) -> bytes:
+        return self.sampler.row(self.frame(phase), universe)
+
+    def render(
+        self,
+        t: float,
+        frame: dict[int, bytes],
+        beat: float | None = None,
+        audio: AudioLevels | None = None,
+    ) -> None:
+        media_frame = self.frame(self.phase(t, beat, audio))
+        for universe in self.masks:
+            frame[universe] = self._splice(
+                frame.get(universe, bytes(blank())), media_frame, universe
+            )
+
+    def render_universe(
+        self,
+        t: float,
+        universe: int,
+        buffer: bytes,
+        beat: float | None = None,
+        audio: AudioLevels | None = None,
+    ) -> bytes:
+        return self._splice(buffer, self.frame(self.phase(t, beat, audio)), universe)
+
+    def _splice(self, buffer: bytes, media_frame: bytes, universe: int) -> bytes:
+        first, values = self.sampler.sample(media_frame, universe)
+        return b"".join((buffer[:first], values, buffer[first + len(values) :]))
+
+
+@lru_cache(maxsize=64)
+def _color_cycle(
+    colors: tuple[tuple[int, int, int], ...], saturation: float, brightness: float
+) -> tuple[RGB, ...]:
+    if not colors:
+        return tuple(
+            colorsys.hsv_to_rgb(step / PHASE_STEPS, saturation, brightness)
+            for step in range(PHASE_STEPS)
+        )
+    cycle = []
+    for step in range(PHASE_STEPS):
+        position = step * len(colors) / PHASE_STEPS
+        index = int(position)
+        t = position - index
+        a, b = colors[index], colors[(index + 1) % len(colors)]
+        cycle.append(tuple((x + (y - x) * t) / 255.0 for x, y in zip(a, b)))
+    return tuple(cycle)
+
+
+class ColorCycleKernel(EffectKernel):
+    """
+    Blends the selection through a cycle of colours.
+
+    The cycle is converted to channel values once per fixture type, giving
+    a waveform per colour channel. Channels of the same type and attribute
+    form a group with its own phase buffer, so a tick costs one translate
+    per group and universe, however many fixtures of mixed types are
+    selected.
+    """
+
+    def __init__(
+        self,
+        targets: list[tuple[PatchedFixture, ColorConverter]],
+        parameters: dict,
+    ):
+        super().__init__([], parameters)
+        cycle = _color_cycle(
+            tuple(
+                tuple(int(c) for c in color) for color in parameters.get("colors", [])
+            ),
+            min(max(float(parameters.get("saturation", 1.0)), 0.0), 1.0),
+            min(max(float(parameters.get("brightness", 1.0)), 0.0), 1.0),
+        )
+        spread = float(parameters.get("phase_spread", 360.0)) / 360.0
+        groups: dict[int, dict[tuple, tuple[bytearray, bytearray]]] = {}
+        for index, (fixture, converter) in enumerate(targets):
+            offset = round(index * spread * PHASE_STEPS / len(targets)) % PHASE_STEPS
+            for attribute in converter.tables(cycle):
+                channel = fixture.channels[attribute]
+                phases, mask = groups.setdefault(fixture.universe, {}).setdefault(
+                    (converter, attribute), (blank(), blank())
+                )
+                phases[channel.address] = offset
+                mask[channel.address] = 0xFF
+        self.groups: dict[int, list[tuple[bytes, int, tuple[bytes, ...]]]] = {}
+        for universe, universe_groups in groups.items():
+            union = 0
+            self.groups[universe] = []
+            for (converter, attribute), (phases, mask) in universe_groups.items():
+                tables = _phase_tables(converter.tables(cycle)[attribute])
+                self.groups[universe].append((bytes(phases), to_int(mask), tables))
+                union |= to_int(mask)
+            self.masks[universe] = bytearray(from_int(union))
+
+    def row(self, universe: int, phase: float) -> bytes:
+        step = int(phase * PHASE_STEPS) % PHASE_STEPS
+        value = 0
+        for phases, mask, tables in self.groups[universe]:
+            value |= to_int(phases.translate(tables[step])) & mask
+        return from_int(value)
+
+
+def _selection(
+    parameters: dict, patch: Patch, index: FixtureIndex | None = None
+) -> list[uuid.UUID]:
+    if "fixtures" not in parameters:
+        if parameters.get("group"):
+            return patch.group(uuid.UUID(str(parameters["group"])))
+        if parameters.get("select"):
+            index = index or FixtureIndex.from_patch(patch)
+            selected = index.fixtures(index.query(parameters["select"]))
+            return [fixture.id for fixture in selected]
+    return [uuid.UUID(str(fixture_id)) for fixture_id in parameters.get("fixtures", [])]
+
+
+def _color_cycle_kernel(
+    parameters: dict, patch: Patch, index: FixtureIndex | None = None
+) -> ColorCycleKernel | None:
+    targets = []
+    for fixture_id in _selection(parameters, patch, index):
+        converter = patch.converter(fixture_id)
+        if converter is not None and converter.attributes:
+            targets.append((patch.fixtures[fixture_id], converter))
+    if not targets:
+        return None
+    return ColorCycleKernel(targets, parameters)
+
+
+def _pixel_map_kernel(parameters: dict, patch: Patch) -> PixelMapKernel | None:
+    layout = patch.pixel_maps.get(uuid.UUID(str(parameters.get("pixel_map"))))
+    if layout is None:
+        return None
+    sequence = parameters.get("sequence")
+    try:
+        if sequence is not None:
+            if os.path.basename(sequence) != sequence or sequence in ("", ".", ".."):
+                raise ValueError(f"Invalid sequence name {sequence}.")
+            media = load_sequence(os.path.join(settings.MEDIA_DIR, sequence))
+        else:
+            media = Pattern(
+                layout.width,
+                layout.height,
+                parameters.get("pattern", "rainbow"),
+                parameters.get("axis", "x"),
+                tuple(parameters.get("color", (255, 255, 255))),
+                float(parameters.get("repeat", 1.0)),
+            )
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping pixel map effect: {e}")
+        return None
+    return PixelMapKernel(layout, media, parameters)
+
+
+def _compile_kernel(
+    effect_id: uuid.UUID,
+    fx_type: FxTypes,
+    parameters: dict,
+    patch: Patch,
+    index: FixtureIndex | None,
+) -> EffectKernel | None:
+    if fx_type == FxTypes.PIXEL_MAP:
+        return _pixel_map_kernel(parameters, patch)
+    if fx_type == FxTypes.COLOR_CYCLE:
+        return _color_cycle_kernel(parameters, patch, index)
+    attribute = AttributeType(parameters.get("attribute", AttributeType.DIMMER))
+    targets = []
+    for fixture_id in _selection(parameters, patch, index):
+        position = patch.resolve(fixture_id, attribute)
+        if position is not None:
+            targets.append(position)
+    if not targets:
+        return None
+
+    match fx_type:
+        case FxTypes.SINE:
+            return SineKernel(targets, parameters)
+        case FxTypes.CHASER:
+            return ChaserKernel(targets, parameters)
+        case FxTypes.SPARKLE:
+            return SparkleKernel(targets, parameters, effect_id)
+        case FxTypes.AUDIO:
+            return AudioKernel(targets, parameters)
+    return None
+
+
+def compile_effect(
+    effect_id: uuid.UUID,
+    fx_type: FxTypes,
+    parameters: dict,
+    patch: Patch,
+    index: FixtureIndex | None = None,
+) -> EffectKernel | None:
+    """
+    Compile an effect against a patch.
+
+    Parameters are user-editable JSON. An effect whose parameters do not
+    convert (e.g. a malformed fixture ID or a non-numeric speed) is logged
+    and skipped, so it never keeps the rest of its cue from loading.
+
+    :param effect_id: Primary key of the :class:`CueEffect`.
+    :param fx_type: The effect algorithm.
+    :param parameters: Template defaults merged with the cue's overrides.
+    :param patch: The patch of the show.
+    :param index: The patch's selection index for ``select`` parameters.
+        Built from the patch when needed and not given.
+    :return: The kernel or ``None`` if the selection resolves to no channel
+        or the parameters are invalid.
+    :rtype: EffectKernel | None
+    """
+    try:
+        return _compile_kernel(effect_id, fx_type, parameters, patch, index)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Skipping effect {effect_id} with invalid parameters: {e}")
+        return None
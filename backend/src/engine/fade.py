@@ -0,0 +1,213 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from ..models.dmx.cues import EasingProfile
+from .audio import AudioLevels
+from .baker import BakedCue
+from .buffers import (
+    blank,
+    crossfade,
+    from_int,
+    masked_merge,
+    split_crossfade,
+    to_int,
+)
+from .effects import EffectKernel
+from .parallel import UniverseRenderer
+from .tempo import Tempo
+
+
+def ease(profile: EasingProfile, t: float) -> float:
+    """
+    Apply an easing profile to a normalised time value.
+
+    :param profile: The easing profile of the cue.
+    :param t: Normalised time in [0, 1].
+    :return: The eased progress in [0, 1].
+    :rtype: float
+    """
+    match profile:
+        case EasingProfile.S_CURVE:
+            return t * t * (3.0 - 2.0 * t)
+        case EasingProfile.EASE_IN:
+            return t * t
+        case EasingProfile.EASE_OUT:
+            return 1.0 - (1.0 - t) * (1.0 - t)
+        case _:
+            return t
+
+
+class CueFade:
+    """
+    The crossfade from a frozen output into a cue, followed by the cue's
+    effects.
+
+    A fade only depends on its source frame, its cue and the time since it
+    started. Live playback and offline timeline rendering share it, so both
+    produce identical frames.
+
+    Universes with split timing are faded group by group: every channel
+    group gets its own progress from its delay and fade, all with the cue's
+    easing.
+    """
+
+    def __init__(
+        self,
+        cue: BakedCue,
+        source: dict[int, bytes],
+        started_at: float,
+        source_masks: dict[int, bytes] | None = None,
+    ):
+        """
+        Initialise the fade.
+
+        :param cue: The cue faded into.
+        :param source: The output at the moment of the GO.
+        :param started_at: The time of the GO in seconds.
+        :param source_masks: The channels the playback owned at the GO; they
+            stay owned while the fade holds their values.
+        """
+        source = dict(source)
+        target = dict(source)
+        for universe, state in (cue.tracked or cue.universes).items():
+            target[universe] = masked_merge(
+                source.get(universe, blank()), state.values, state.mask
+            )
+        for universe in target.keys() - source.keys():
+            source[universe] = bytes(blank())
+        # Kernels grouped by universe, in cue order, so a universe can be
+        # rendered on its own.
+        kernels: dict[int, list[EffectKernel]] = {}
+        for effect in cue.effects:
+            if effect.kernel is not None:
+                for universe in effect.kernel.masks:
+                    kernels.setdefault(universe, []).append(effect.kernel)
+        # The channels this fade drives: everything owned before the GO,
+        # everything the cue tracks and everything its effects write.
+        owned = {u: to_int(mask) for u, mask in (source_masks or {}).items()}
+        for universe, state in (cue.tracked or cue.universes).items():
+            owned[universe] = owned.get(universe, 0) | to_int(state.mask)
+        for universe, universe_kernels in kernels.items():
+            for kernel in universe_kernels:
+                owned[universe] = owned.get(universe, 0) | to_int(
+                    kernel.masks[universe]
+                )
+        self.cue = cue
+        self.source = source
+        self.target = target
+        self.kernels = kernels
+        self.masks = {universe: from_int(mask) for universe, mask in owned.items()}
+        self.source_masks = source_masks or {}
+        self.started_at = started_at
+
+    @property
+    def universes(self) -> set[int]:
+        """
+        All universes written by the fade or the cue's effects.
+
+        :rtype: set[int]
+        """
+        return self.target.keys() | self.kernels.keys()
+
+    def progress(
+        self, now: float, delay: float | None = None, fade: float | None = None
+    ) -> float:
+        """
+        The eased progress of the crossfade.
+
+        :param now: The time in seconds, on the same clock as ``started_at``.
+        :param delay: The delay of a channel group; defaults to the cue's.
+        :param fade: The fade of a channel group; defaults to the cue's.
+        :return: The progress in [0, 1].
+        :rtype: float
+        """
+        cue = self.cue
+        delay = cue.delay if delay is None else delay
+        fade = cue.fade if fade is None else fade
+        elapsed = now - self.started_at - delay
+        if fade <= 0:
+            return 1.0 if elapsed >= 0 else 0.0
+        t = min(max(elapsed / fade, 0.0), 1.0)
+        return ease(cue.easing, t)
+
+    def render_universe(
+        self,
+        now: float,
+        universe: int,
+        progress: float,
+        beat: float | None = None,
+        audio: AudioLevels | None = None,
+    ) -> bytes:
+        """
+        Render a single universe of the fade.
+
+        :param now: The time in seconds, on the same clock as ``started_at``.
+        :param universe: The universe index.
+        :param progress: The value of :meth:`progress` for ``now``.
+        :param beat: The show's beat position at ``now``.
+        :param audio: The latest audio analysis.
+        :return: The universe buffer.
+        :rtype: bytes
+        """
+        target = self.target.get(universe)
+        timings = self.cue.timings.get(universe)
+        if target is None:
+            buffer = bytes(blank())
+        elif timings is None:
+            buffer = crossfade(self.source[universe], target, progress)
+        else:
+            buffer = split_crossfade(
+                self.source[universe],
+                target,
+                [
+                    (self.progress(now, timing.delay, timing.fade), timing.lanes)
+                    for timing in timings
+                ],
+            )
+        elapsed = now - self.started_at
+        for kernel in self.kernels.get(universe, ()):
+            buffer = kernel.render_universe(elapsed, universe, buffer, beat, audio)
+        return buffer
+
+    def render(
+        self,
+        now: float,
+        renderer: UniverseRenderer | None = None,
+        tempo: Tempo | None = None,
+        audio: AudioLevels | None = None,
+    ) -> dict[int, bytes]:
+        """
+        Render the fade at a point in time.
+
+        :param now: The time in seconds, on the same clock as ``started_at``.
+        :param renderer: The renderer to spread the universes over. ``None``
+            renders them in the calling thread.
+        :param tempo: The show tempo beat-locked effects follow. ``None``
+            runs them at the default tempo from the start of the cue.
+        :param audio: The latest audio analysis. ``None`` keeps audio-driven
+            effects silent.
+        :return: The universe buffers.
+        :rtype: dict[int, bytes]
+        """
+        progress = self.progress(now)
+        beat = tempo.beats(now) if tempo is not None else None
+
+        def render(universe: int) -> bytes:
+            return self.render_universe(now, universe, progress, beat, audio)
+
+        if renderer is not None:
+            return renderer.map(render, self.universes)
+        return {universe: render(universe) for universe in self.universes}
@@ -0,0 +1,114 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Home ("locate") and highlight values of a show.
+
+Both are compiled once per patch into one buffer per universe, together
+with a mask of every fixture's channels. Locating or highlighting a
+selection then only ORs the masks of the selected fixtures and cuts the
+selected channels out of the precomputed buffers, so even large selections
+land in the programmer within the next tick.
+"""
+
+import uuid
+from collections.abc import Iterable
+
+from .buffers import UNIVERSE_SIZE, from_int
+
+# (values, mask, addresses) of one universe of a selection.
+Layer = tuple[bytes, bytes, tuple[int, ...]]
+
+
+class FixtureDefaults:
+    """
+    The home and highlight buffers of a patch.
+    """
+
+    def __init__(self, channels: Iterable[tuple[uuid.UUID, int, int, int, int]] = ()):
+        """
+        Compile the buffers.
+
+        :param channels: (fixture, universe, address, home, highlight) of
+            every patched channel.
+        """
+        home: dict[int, int] = {}
+        highlight: dict[int, int] = {}
+        fixtures: dict[uuid.UUID, tuple[int, int, list[int]]] = {}
+        for fixture_id, universe, address, home_value, highlight_value in channels:
+            shift = 8 * (UNIVERSE_SIZE - 1 - address)
+            home[universe] = home.get(universe, 0) | (home_value & 0xFF) << shift
+            highlight[universe] = (
+                highlight.get(universe, 0) | (highlight_value & 0xFF) << shift
+            )
+            _, mask, addresses = fixtures.get(fixture_id, (universe, 0, []))
+            addresses.append(address)
+            fixtures[fixture_id] = (universe, mask | 0xFF << shift, addresses)
+        self._home = home
+        self._highlight = highlight
+        self._fixtures = {
+            fixture_id: (universe, mask, tuple(addresses))
+            for fixture_id, (universe, mask, addresses) in fixtures.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def _select(self, fixture_ids: Iterable[uuid.UUID]) -> dict[int, tuple[int, list]]:
+        selection: dict[int, tuple[int, list]] = {}
+        for fixture_id in fixture_ids:
+            entry = self._fixtures.get(fixture_id)
+            if entry is None:
+                continue
+            universe, mask, addresses = entry
+            union, selected = selection.get(universe, (0, []))
+            selected.extend(addresses)
+            selection[universe] = (union | mask, selected)
+        return selection
+
+    def _layers(
+        self, buffers: dict[int, int], fixture_ids: Iterable[uuid.UUID]
+    ) -> dict[int, Layer]:
+        return {
+            universe: (
+                from_int(buffers[universe] & mask),
+                from_int(mask),
+                tuple(addresses),
+            )
+            for universe, (mask, addresses) in self._select(fixture_ids).items()
+        }
+
+    def home(self, fixture_ids: Iterable[uuid.UUID]) -> dict[int, Layer]:
+        """
+        The home values of a selection.
+
+        Fixtures that are not patched are skipped.
+
+        :param fixture_ids: The selected fixtures.
+        :return: (values, mask, addresses) per universe.
+        :rtype: dict[int, tuple[bytes, bytes, tuple[int, ...]]]
+        """
+        return self._layers(self._home, fixture_ids)
+
+    def highlight(self, fixture_ids: Iterable[uuid.UUID]) -> dict[int, Layer]:
+        """
+        The highlight values of a selection.
+
+        :param fixture_ids: The selected fixtures.
+        :return: (values, mask, addresses) per universe.
+        :rtype: dict[int, tuple[bytes, bytes, tuple[int, ...]]]
+        """
+        return self._layers(self._highlight, fixture_ids)
@@ -0,0 +1,115 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+DMX input received by the nodes, e.g. from a wing console or a house light
+panel.
+
+Every input is a named source that owns the channels it sends, from
+channel 1 up to the frame's length, at the priority the node assigned. The
+sources take part in the playbacks' priority merge like another cue stack.
+"""
+
+import base64
+
+from .buffers import MAX_PRIORITY, UNIVERSE_SIZE
+
+Layer = tuple[int, bytes, bytes]
+
+
+class InputSources:
+    """
+    The latest frame of every input source, as merge layers.
+
+    Frames only arrive when an input changed, so the layers are built once
+    per frame and reused by every tick until the next one.
+    """
+
+    def __init__(self):
+        self._layers: dict[int, dict[str, Layer]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(sources) for sources in self._layers.values())
+
+    @property
+    def sources(self) -> list[str]:
+        """
+        The names of the sources currently merged.
+
+        :rtype: list[str]
+        """
+        return sorted({name for sources in self._layers.values() for name in sources})
+
+    def set(self, source: str, universe: int, priority: int, values: bytes) -> None:
+        """
+        Replace a source's frame of one universe.
+
+        :param source: The source's name.
+        :param universe: The universe ID.
+        :param priority: The merge priority; clamped to
+            [0, :data:`MAX_PRIORITY`].
+        :param values: The channel values from channel 1 on; longer frames
+            are cut to a universe.
+        """
+        values = values[:UNIVERSE_SIZE]
+        mask = b"\xff" * len(values) + bytes(UNIVERSE_SIZE - len(values))
+        layer = (
+            min(max(priority, 0), MAX_PRIORITY),
+            values.ljust(UNIVERSE_SIZE, b"\x00"),
+            mask,
+        )
+        self._layers.setdefault(universe, {})[source] = layer
+
+    def release(self, source: str) -> None:
+        """
+        Remove a source from the merge.
+
+        :param source: The source's name.
+        """
+        for universe in list(self._layers):
+            sources = self._layers[universe]
+            sources.pop(source, None)
+            if not sources:
+                del self._layers[universe]
+
+    def apply_event(self, event: dict) -> None:
+        """
+        Apply an input event published by a node's connection.
+
+        :param event: ``{"source", "universe", "priority", "values"}`` with
+            base64 encoded values, or ``{"source", "release": true}``.
+        """
+        if event.get("release"):
+            self.release(event["source"])
+            return
+        self.set(
+            event["source"],
+            int(event["universe"]),
+            int(event["priority"]),
+            base64.b64decode(event["values"]),
+        )
+
+    def layers(self) -> dict[int, list[Layer]]:
+        """
+        The merge layers of all sources.
+
+        :return: ``(priority, values, mask)`` layers, keyed by universe.
+        :rtype: dict[int, list[tuple[int, bytes, bytes]]]
+        """
+        return {
+            universe: list(sources.values())
+            for universe, sources in self._layers.items()
+        }
@@ -0,0 +1,161 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Playback engines in subinterpreters (Python 3.14 ``concurrent.interpreters``).
+
+Every subinterpreter has its own modules, GIL and event loop, so a show
+whose effects stall its loop, or whose engine crashes, leaves the other
+shows untouched. It is cheaper than a process per show: the interpreter
+shares the API process's memory for code and the runtime.
+
+Commands and replies travel through interpreter queues; frames go through
+the engine's :class:`SharedOutput` block like for a process.
+
+The engine imports extension modules that refuse to load in isolated
+subinterpreters (pydantic-core, orjson and SQLAlchemy's compiled modules
+at the time of writing). :func:`available` therefore tries the imports once
+in a throwaway subinterpreter, and the pool isolates shows in processes
+until every dependency supports subinterpreters.
+"""
+
+import asyncio
+import functools
+import logging
+import sys
+import threading
+
+from .process import SHUTDOWN, EngineHandle, configure_logging, serve
+from .shared_output import SharedOutput
+
+try:
+    from concurrent import interpreters
+except ImportError:  # Python < 3.14
+    interpreters = None
+
+logger = logging.getLogger("hyperion.engine.interpreter")
+
+CLOSED = "closed"
+
+
+@functools.cache
+def available() -> bool:
+    """
+    Whether playback engines can run in subinterpreters here.
+
+    Needs Python 3.14 and every extension module the engine imports to
+    load in a subinterpreter. The imports are tried once in a throwaway
+    subinterpreter; the result is cached.
+
+    :rtype: bool
+    """
+    if interpreters is None:
+        return False
+    probe = interpreters.create()
+    try:
+        probe.exec(f"import sys; sys.path[:] = {sys.path!r}")
+        probe.exec(f"import {__package__}.process, {__package__}.playback")
+    except interpreters.ExecutionFailed as e:
+        logger.warning(f"The playback engine cannot run in a subinterpreter: {e}")
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def _interpreter_main(output_name: str, commands, replies, rate: float) -> None:
+    def receive():
+        message = commands.get()
+        if message == CLOSED:
+            raise EOFError
+        return message
+
+    configure_logging()
+    asyncio.run(serve(output_name, receive, replies.put, rate))
+
+
+class EngineInterpreter(EngineHandle):
+    """
+    An engine running in its own subinterpreter, commanded over queues.
+    """
+
+    def __init__(self, rate: float = 40.0):
+        super().__init__(rate)
+        self._interpreter = None
+        self._commands = None
+        self._replies = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Create the subinterpreter and start the engine in a thread of it.
+
+        :raises RuntimeError: If the engine cannot run in a subinterpreter.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not available():
+            raise RuntimeError("The engine cannot run in a subinterpreter.")
+        self.output = SharedOutput.create()
+        self._commands = interpreters.create_queue()
+        self._replies = interpreters.create_queue()
+        self._interpreter = interpreters.create()
+        # The subinterpreter must find the application package like we do.
+        self._interpreter.exec(f"import sys; sys.path[:] = {sys.path!r}")
+        self._thread = threading.Thread(
+            target=self._run, name="hyperion-engine-interpreter", daemon=True
+        )
+        self._thread.start()
+        self._receiver = asyncio.create_task(self._receive())
+        logger.info(f"Started engine in subinterpreter {self._interpreter.id}")
+
+    def _run(self) -> None:
+        try:
+            self._interpreter.call(
+                _interpreter_main,
+                self.output.name,
+                self._commands,
+                self._replies,
+                self.rate,
+            )
+        except Exception as e:
+            logger.error(f"Engine subinterpreter failed: {e}")
+        finally:
+            self._replies.put(CLOSED)
+
+    def _send(self, message) -> None:
+        self._commands.put(message)
+
+    def _receive_blocking(self):
+        message = self._replies.get()
+        if message == CLOSED:
+            raise EOFError
+        return message
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._commands.put(SHUTDOWN)
+        await asyncio.to_thread(self._thread.join, timeout)
+        if self._thread.is_alive():
+            # A subinterpreter cannot be killed; leave it to exit with us.
+            logger.warning("Engine subinterpreter did not stop in time")
+            self._replies.put(CLOSED)
+        else:
+            self._interpreter.close()
+        await self._finish()
+        self._thread = None
+        self._interpreter = None
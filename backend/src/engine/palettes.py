@@ -0,0 +1,106 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Engine side palettes.
+
+Palettes are resolved into ``(fixture, attribute, value)`` triples when a
+scene is baked, so playback never sees them. The baker keeps the current
+version of every palette; replacing one only recompiles the cues whose
+scenes reference it.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+
+from ..models.dmx.palettes import Palette
+from ..models.dmx.scenes import ColorSpace
+from ..models.fixtures import AttributeGroup, AttributeType
+from .patch import Patch
+
+
+@dataclass(slots=True, frozen=True)
+class BakedPalette:
+    """
+    Detached copy of a :class:`Palette`.
+
+    :param id: The palette's primary key.
+    :param group: The attribute group the palette controls.
+    :param color: ``(space, a, b, c)`` of the abstract colour, if any.
+    :param shared: The values applied to every fixture.
+    :param fixtures: The values of single fixtures.
+    """
+
+    id: uuid.UUID
+    group: AttributeGroup
+    color: tuple[ColorSpace, float, float, float] | None = None
+    shared: tuple[tuple[AttributeType, int], ...] = ()
+    fixtures: dict[uuid.UUID, tuple[tuple[AttributeType, int], ...]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_model(cls, palette: Palette) -> "BakedPalette":
+        """
+        Detach a palette with its values loaded.
+
+        :param palette: The palette.
+        :rtype: BakedPalette
+        """
+        attributes = palette.group.attributes
+        shared = []
+        fixtures: dict[uuid.UUID, list[tuple[AttributeType, int]]] = {}
+        for value in palette.values:
+            if value.attribute not in attributes:
+                continue
+            entry = (value.attribute, value.value)
+            if value.fixture_id is None:
+                shared.append(entry)
+            else:
+                fixtures.setdefault(value.fixture_id, []).append(entry)
+        color = None
+        if palette.space is not None and palette.group == AttributeGroup.COLOR:
+            color = (
+                palette.space,
+                palette.a or 0.0,
+                palette.b or 0.0,
+                palette.c or 0.0,
+            )
+        return cls(
+            id=palette.id,
+            group=palette.group,
+            color=color,
+            shared=tuple(shared),
+            fixtures={key: tuple(values) for key, values in fixtures.items()},
+        )
+
+    def values(
+        self, fixture_id: uuid.UUID, patch: Patch
+    ) -> list[tuple[uuid.UUID, AttributeType, int]]:
+        """
+        The palette's values for one fixture.
+
+        The converted colour comes first, then the shared values, then the
+        fixture's own values, so later entries win when baked.
+
+        :param fixture_id: The fixture's primary key.
+        :param patch: The patch, for converting the colour.
+        :rtype: list[tuple[uuid.UUID, AttributeType, int]]
+        """
+        values = patch.color_values([(fixture_id, *self.color)]) if self.color else []
+        values.extend((fixture_id, a, v) for a, v in self.shared)
+        values.extend((fixture_id, a, v) for a, v in self.fixtures.get(fixture_id, ()))
+        return values
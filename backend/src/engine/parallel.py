@@ -0,0 +1,111 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Parallel rendering of universes on free-threaded Python builds.
+
+Universes are independent once a cue is baked, so a tick can be split into
+contiguous groups of universes, one per thread. Every thread renders its
+group into a private list and the calling thread concatenates the lists;
+no thread writes to shared state, so the hot path needs no locks.
+
+On builds with the GIL the threads would only take turns, so the renderer
+falls back to rendering in the calling thread.
+"""
+
+import os
+import sys
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+
+def free_threaded() -> bool:
+    """
+    Whether the interpreter runs without the GIL.
+
+    :rtype: bool
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class UniverseRenderer:
+    """
+    Spreads the universes of a tick over a thread pool.
+    """
+
+    def __init__(self, workers: int | None = None, force: bool = False):
+        """
+        Initialise the renderer.
+
+        :param workers: Number of threads. ``None`` or ``0`` uses the CPU
+            count.
+        :param force: Use threads even if the GIL is enabled. Only useful to
+            measure the difference.
+        """
+        if not (force or free_threaded()):
+            workers = 1
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = (
+            ThreadPoolExecutor(self.workers, thread_name_prefix="hyperion-render")
+            if self.workers > 1
+            else None
+        )
+
+    @property
+    def parallel(self) -> bool:
+        """
+        Whether universes are rendered on more than one thread.
+
+        :rtype: bool
+        """
+        return self._pool is not None
+
+    def map(
+        self, render: Callable[[int], bytes], universes: Iterable[int]
+    ) -> dict[int, bytes]:
+        """
+        Render universes, in parallel if possible.
+
+        :param render: Renders one universe. It is called from several threads
+            at once and must not mutate shared state.
+        :param universes: The universes to render.
+        :return: The universe buffers.
+        :rtype: dict[int, bytes]
+        """
+        universes = list(universes)
+        if self._pool is None or len(universes) < 2:
+            return {universe: render(universe) for universe in universes}
+
+        def render_group(group: list[int]) -> list[bytes]:
+            return [render(universe) for universe in group]
+
+        size = -(-len(universes) // self.workers)
+        groups = [
+            universes[start : start + size] for start in range(0, len(universes), size)
+        ]
+        frame = {}
+        for group, buffers in zip(groups, self._pool.map(render_group, groups)):
+            frame.update(zip(group, buffers))
+        return frame
+
+    def close(self) -> None:
+        """
+        Shut the thread pool down.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
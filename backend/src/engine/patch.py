@@ -0,0 +1,332 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Sequence
+
+from ..models.dmx.scenes import ColorSpace
+from ..models.fixtures import AttributeType, Fixture, FixtureGroup, PixelMap
+from .buffers import blank
+from .color import RGB, ColorConverter, to_rgb, wheel_slots
+from .curves import LINEAR, CurveStage, curve_table
+from .highlight import FixtureDefaults
+from .pixelmap import PixelLayout
+
+
+@dataclass(slots=True, frozen=True)
+class PatchedChannel:
+    """
+    A single fixture channel resolved to its absolute position.
+
+    :param attribute: The attribute controlled by the channel.
+    :param address: Zero based index into the universe buffer.
+    :param default_value: The channel's home value.
+    :param highlight_value: The value used while highlighting.
+    :param invert_default: Whether the default logic is inverted, i.e. the
+        default and highlight values count down from 255 (a shutter that is
+        open at 0).
+    :param curve: The lookup table of the channel's response curve.
+    """
+
+    attribute: AttributeType
+    address: int
+    default_value: int = 0
+    highlight_value: int = 255
+    invert_default: bool = False
+    curve: bytes = LINEAR
+
+    @property
+    def home(self) -> int:
+        """
+        The DMX value the channel is located to.
+
+        :rtype: int
+        """
+        return 255 - self.default_value if self.invert_default else self.default_value
+
+    @property
+    def highlight(self) -> int:
+        """
+        The DMX value the channel shows while highlighted.
+
+        :rtype: int
+        """
+        value = self.highlight_value
+        return 255 - value if self.invert_default else value
+
+
+@dataclass(slots=True)
+class PatchedFixture:
+    """
+    Detached, engine side copy of a patched :class:`Fixture`.
+
+    The engine never touches ORM instances after loading, so playback keeps
+    working even if the database session that loaded the patch is gone.
+
+    :param id: The fixture's primary key.
+    :param fid: The user facing fixture ID.
+    :param name: Friendly name of the fixture.
+    :param universe: The DMX universe index.
+    :param fixture_type_id: Primary key of the fixture's blueprint.
+    :param channels: The fixture's channels keyed by attribute.
+    :param color_wheel: ``(dmx_value, rgb)`` of every colour wheel slot.
+    :param manufacturer_id: Primary key of the type's manufacturer.
+    """
+
+    id: uuid.UUID
+    fid: int
+    name: str
+    universe: int
+    fixture_type_id: uuid.UUID
+    channels: dict[AttributeType, PatchedChannel] = field(default_factory=dict)
+    color_wheel: tuple[tuple[int, RGB], ...] = ()
+    manufacturer_id: uuid.UUID | None = None
+
+
+class Patch:
+    """
+    Address lookup for every fixture of a show.
+
+    Resolves ``(fixture, attribute)`` pairs to ``(universe, address)`` pairs
+    without touching the database.
+    """
+
+    def __init__(
+        self,
+        fixtures: Iterable[PatchedFixture] = (),
+        pixel_maps: Iterable[PixelLayout] = (),
+        groups: Mapping[uuid.UUID, Sequence[uuid.UUID]] | None = None,
+    ):
+        """
+        Initialise the patch.
+
+        :param fixtures: The fixtures of the show.
+        :param pixel_maps: The pixel maps of the show.
+        :param groups: The fixture IDs of every group in selection order.
+        """
+        self.fixtures: dict[uuid.UUID, PatchedFixture] = {f.id: f for f in fixtures}
+        self.pixel_maps: dict[uuid.UUID, PixelLayout] = {p.id: p for p in pixel_maps}
+        self.groups: dict[uuid.UUID, tuple[uuid.UUID, ...]] = {
+            group_id: tuple(members) for group_id, members in (groups or {}).items()
+        }
+        self._converters: dict[uuid.UUID, ColorConverter] = {}
+
+    @classmethod
+    def from_models(
+        cls,
+        fixtures: Iterable[Fixture],
+        pixel_maps: Iterable[PixelMap] = (),
+        groups: Iterable[FixtureGroup] = (),
+    ) -> "Patch":
+        """
+        Build a patch from ORM fixtures with their fixture types loaded.
+
+        :param fixtures: Fixtures including ``fixture_type.channels``.
+        :param pixel_maps: The show's pixel maps.
+        :param groups: The show's fixture groups including their members.
+        :return: The detached patch.
+        :rtype: Patch
+        """
+        return cls(
+            (cls.detach(fixture) for fixture in fixtures if fixture.is_active),
+            (PixelLayout.from_model(pixel_map) for pixel_map in pixel_maps),
+            {
+                group.id: [member.fixture_id for member in group.members]
+                for group in groups
+            },
+        )
+
+    @staticmethod
+    def detach(fixture: Fixture) -> PatchedFixture:
+        """
+        Resolve one ORM fixture into a :class:`PatchedFixture`.
+
+        :param fixture: Fixture including ``fixture_type.channels``.
+        :return: The detached fixture.
+        :rtype: PatchedFixture
+        """
+        channels = {
+            channel.attribute: PatchedChannel(
+                attribute=channel.attribute,
+                address=fixture.start_address + channel.dmx_offset - 2,
+                default_value=channel.default_value or 0,
+                highlight_value=(
+                    255 if channel.highlight_value is None else channel.highlight_value
+                ),
+                invert_default=bool(channel.invert_default),
+                curve=curve_table(channel.curve, channel.curve_points),
+            )
+            for channel in fixture.fixture_type.channels
+        }
+        return PatchedFixture(
+            id=fixture.id,
+            fid=fixture.fid,
+            name=fixture.name,
+            universe=fixture.universe,
+            fixture_type_id=fixture.fixture_type_id,
+            channels=channels,
+            color_wheel=wheel_slots(fixture.fixture_type.color_wheel),
+            manufacturer_id=fixture.fixture_type.manufacturer_id,
+        )
+
+    def add(self, fixture: PatchedFixture) -> None:
+        """
+        Patch a fixture, replacing an older version of it.
+
+        :param fixture: The detached fixture.
+        """
+        self.fixtures[fixture.id] = fixture
+
+    def remove(self, fixture_id: uuid.UUID) -> None:
+        """
+        Unpatch a fixture.
+
+        :param fixture_id: The fixture's primary key.
+        """
+        self.fixtures.pop(fixture_id, None)
+
+    def group(self, group_id: uuid.UUID) -> list[uuid.UUID]:
+        """
+        The patched members of a group in selection order.
+
+        :param group_id: The group's primary key.
+        :rtype: list[uuid.UUID]
+        """
+        return [f for f in self.groups.get(group_id, ()) if f in self.fixtures]
+
+    @property
+    def universes(self) -> set[int]:
+        """
+        All universes with at least one patched fixture.
+
+        :rtype: set[int]
+        """
+        return {fixture.universe for fixture in self.fixtures.values()}
+
+    def resolve(
+        self, fixture_id: uuid.UUID, attribute: AttributeType
+    ) -> tuple[int, int] | None:
+        """
+        Resolve a fixture attribute to its DMX position.
+
+        :param fixture_id: The fixture's primary key.
+        :param attribute: The attribute to look up.
+        :return: ``(universe, address)`` or ``None`` if the fixture is not
+            patched or has no such attribute.
+        :rtype: tuple[int, int] | None
+        """
+        fixture = self.fixtures.get(fixture_id)
+        if fixture is None:
+            return None
+        channel = fixture.channels.get(attribute)
+        if channel is None:
+            return None
+        return fixture.universe, channel.address
+
+    def converter(self, fixture_id: uuid.UUID) -> ColorConverter | None:
+        """
+        The colour converter of a fixture's type.
+
+        Converters are compiled once per fixture type and shared by all
+        fixtures of that type.
+
+        :param fixture_id: The fixture's primary key.
+        :return: The converter or ``None`` if the fixture is not patched.
+        :rtype: ColorConverter | None
+        """
+        fixture = self.fixtures.get(fixture_id)
+        if fixture is None:
+            return None
+        converter = self._converters.get(fixture.fixture_type_id)
+        if converter is None:
+            converter = self._converters[fixture.fixture_type_id] = ColorConverter(
+                fixture.channels, fixture.color_wheel
+            )
+        return converter
+
+    def color_values(
+        self, colors: Iterable[tuple[uuid.UUID, ColorSpace, float, float, float]]
+    ) -> list[tuple[uuid.UUID, AttributeType, int]]:
+        """
+        Convert abstract fixture colours to channel values.
+
+        Colours of fixtures that are not patched are skipped.
+
+        :param colors: ``(fixture, space, a, b, c)`` per fixture.
+        :return: ``(fixture, attribute, value)`` for every colour channel.
+        :rtype: list[tuple[uuid.UUID, AttributeType, int]]
+        """
+        values = []
+        for fixture_id, space, a, b, c in colors:
+            converter = self.converter(fixture_id)
+            if converter is None:
+                continue
+            rgb = to_rgb(space, a, b, c)
+            values.extend(
+                (fixture_id, attribute, value)
+                for attribute, value in converter.convert(rgb).items()
+            )
+        return values
+
+    def curves(self) -> CurveStage:
+        """
+        Compile the response curves of all patched channels.
+
+        :rtype: CurveStage
+        """
+        return CurveStage(
+            (fixture.universe, channel.address, channel.curve)
+            for fixture in self.fixtures.values()
+            for channel in fixture.channels.values()
+        )
+
+    def defaults(self) -> FixtureDefaults:
+        """
+        Compile the home and highlight buffers of all patched channels.
+
+        :rtype: FixtureDefaults
+        """
+        return FixtureDefaults(
+            (
+                fixture.id,
+                fixture.universe,
+                channel.address,
+                channel.home,
+                channel.highlight,
+            )
+            for fixture in self.fixtures.values()
+            for channel in fixture.channels.values()
+        )
+
+    def masks(self, attributes: Iterable[AttributeType]) -> dict[int, bytes]:
+        """
+        Masks of every channel carrying one of the given attributes.
+
+        :param attributes: The attributes to select.
+        :return: One mask per universe that has such a channel.
+        :rtype: dict[int, bytes]
+        """
+        attributes = set(attributes)
+        masks: dict[int, bytearray] = {}
+        for fixture in self.fixtures.values():
+            for attribute, channel in fixture.channels.items():
+                if attribute in attributes:
+                    mask = masks.get(fixture.universe)
+                    if mask is None:
+                        mask = masks[fixture.universe] = blank()
+                    mask[channel.address] = 0xFF
+        return {universe: bytes(mask) for universe, mask in masks.items()}
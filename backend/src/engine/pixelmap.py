@@ -0,0 +1,376 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Pixel mapping of media onto LED installations.
+
+A :class:`PixelLayout` is the engine side copy of a :class:`PixelMap`: a
+grid of RGB cells wired through consecutive universes. Media are RGB
+frames in row-major order, either loaded from an image sequence or
+generated from a pattern.
+
+Sampling a frame onto the layout never loops over pixels in Python. When
+the layout and a source size meet, a :class:`Sampler` resolves every DMX
+channel to the byte of the source frame it shows (nearest neighbour,
+honouring wiring and colour order) and stores one ``itemgetter`` per
+universe. A tick is then one C-level gather per universe, whose result
+is the universe's run of channels as is.
+"""
+
+import math
+import os
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+
+from ..models.fixtures import PixelMap, PixelWiring
+from .buffers import UNIVERSE_SIZE, blank
+
+PATTERN_STEPS = 256
+
+
+@dataclass(slots=True, frozen=True)
+class PixelLayout:
+    """
+    Detached, engine side copy of a :class:`PixelMap`.
+
+    :param id: The pixel map's primary key.
+    :param width: Cells per row.
+    :param height: Rows.
+    :param universe: The universe of the first pixel.
+    :param address: Zero based address of the first pixel.
+    :param color_order: The order of the colour channels on the wire.
+    :param wiring: How the cells are chained.
+    """
+
+    id: uuid.UUID
+    width: int
+    height: int
+    universe: int
+    address: int
+    color_order: str = "RGB"
+    wiring: PixelWiring = PixelWiring.ROWS
+
+    @classmethod
+    def from_model(cls, pixel_map: PixelMap) -> "PixelLayout":
+        """
+        Detach an ORM pixel map.
+
+        :param pixel_map: The pixel map.
+        :rtype: PixelLayout
+        """
+        return cls(
+            id=pixel_map.id,
+            width=pixel_map.width,
+            height=pixel_map.height,
+            universe=pixel_map.universe,
+            address=pixel_map.start_address - 1,
+            color_order=pixel_map.color_order,
+            wiring=pixel_map.wiring,
+        )
+
+    def cell(self, pixel: int) -> tuple[int, int]:
+        """
+        The grid position of a pixel on the wire.
+
+        :param pixel: The pixel's index along the chain.
+        :return: ``(x, y)``.
+        :rtype: tuple[int, int]
+        """
+        if self.wiring == PixelWiring.COLUMNS:
+            return pixel // self.height, pixel % self.height
+        y, x = divmod(pixel, self.width)
+        if self.wiring == PixelWiring.SNAKE and y % 2:
+            x = self.width - 1 - x
+        return x, y
+
+    def channels(self) -> list[tuple[int, int, int, int]]:
+        """
+        Every channel of the layout in wiring order.
+
+        A pixel never straddles two universes; it moves to the start of
+        the next one instead.
+
+        :return: ``(universe, address, cell, colour)`` with the cell index
+            ``y * width + x`` and the colour 0, 1, 2 for red, green, blue.
+        :rtype: list[tuple[int, int, int, int]]
+        """
+        order = ["RGB".index(color) for color in self.color_order]
+        universe, address = self.universe, self.address
+        channels = []
+        for pixel in range(self.width * self.height):
+            if address + len(order) > UNIVERSE_SIZE:
+                universe, address = universe + 1, 0
+            x, y = self.cell(pixel)
+            for color in order:
+                channels.append((universe, address, y * self.width + x, color))
+                address += 1
+        return channels
+
+
+class Sampler:
+    """
+    Resamples frames of one source size onto a layout.
+    """
+
+    def __init__(self, layout: PixelLayout, width: int, height: int):
+        """
+        Resolve every channel of the layout to a byte of the source frame.
+
+        :param layout: The pixel layout.
+        :param width: Width of the source frames.
+        :param height: Height of the source frames.
+        """
+        # Nearest neighbour: the source pixel under the centre of the cell.
+        xs = [(2 * x + 1) * width // (2 * layout.width) for x in range(layout.width)]
+        ys = [(2 * y + 1) * height // (2 * layout.height) for y in range(layout.height)]
+        runs: dict[int, tuple[int, list[int]]] = {}
+        for universe, address, cell, color in layout.channels():
+            y, x = divmod(cell, layout.width)
+            first, indices = runs.setdefault(universe, (address, []))
+            indices.append((ys[y] * width + xs[x]) * 3 + color)
+        self.runs: dict[int, tuple[int, int, itemgetter]] = {
+            universe: (first, first + len(indices), itemgetter(*indices))
+            for universe, (first, indices) in runs.items()
+        }
+
+    def sample(self, frame: bytes, universe: int) -> tuple[int, bytes]:
+        """
+        Sample a frame for one universe.
+
+        :param frame: An RGB frame of the source size.
+        :param universe: One of the universes in :attr:`runs`.
+        :return: The first address and the values of the universe's run of
+            channels.
+        :rtype: tuple[int, bytes]
+        """
+        first, _, gather = self.runs[universe]
+        return first, bytes(gather(frame))
+
+    def row(self, frame: bytes, universe: int) -> bytes:
+        """
+        Sample a frame into a whole universe buffer.
+
+        :param frame: An RGB frame of the source size.
+        :param universe: One of the universes in :attr:`runs`.
+        :return: 512 values; channels outside the layout are 0.
+        :rtype: bytes
+        """
+        first, last, gather = self.runs[universe]
+        return b"".join(
+            (bytes(first), bytes(gather(frame)), bytes(UNIVERSE_SIZE - last))
+        )
+
+    def masks(self) -> dict[int, bytearray]:
+        """
+        The channels of the layout per universe.
+
+        :rtype: dict[int, bytearray]
+        """
+        masks = {}
+        for universe, (first, last, _) in self.runs.items():
+            mask = masks[universe] = blank()
+            mask[first:last] = b"\xff" * (last - first)
+        return masks
+
+
+class Media:
+    """
+    Base class of pixel map media.
+
+    :attr:`steps` frames make up one cycle of the medium.
+    """
+
+    width: int
+    height: int
+    steps: int
+
+    def frame(self, step: int) -> bytes:
+        """
+        One frame of the cycle.
+
+        :param step: The frame index in [0, :attr:`steps`).
+        :return: ``width * height`` RGB triples in row-major order.
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=1)
+def _hues() -> tuple[bytes, ...]:
+    hues = []
+    for step in range(PATTERN_STEPS):
+        h = step * 6 / PATTERN_STEPS
+        rgb = [max(0.0, min(1.0, abs((h + shift) % 6 - 3) - 1)) for shift in (0, 4, 2)]
+        hues.append(bytes(round(255 * value) for value in rgb))
+    return tuple(hues)
+
+
+class Pattern(Media):
+    """
+    A generated pattern that varies along one axis.
+
+    Only one line of colours is computed per frame; the frame repeats it,
+    so generating costs one step per cell of the line.
+
+    ``rainbow`` scrolls the hue circle across the line, ``wave`` moves a
+    sine wave of ``color`` along it.
+    """
+
+    PATTERNS = frozenset({"rainbow", "wave"})
+    steps = PATTERN_STEPS
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        name: str = "rainbow",
+        axis: str = "x",
+        color: tuple[int, int, int] = (255, 255, 255),
+        repeat: float = 1.0,
+    ):
+        """
+        Initialise the pattern.
+
+        :param width: Frame width.
+        :param height: Frame height.
+        :param name: ``rainbow`` or ``wave``.
+        :param axis: ``x`` to vary along rows, ``y`` along columns.
+        :param color: The colour of ``wave``.
+        :param repeat: Cycles of the pattern across the line.
+        :raises ValueError: On an unknown pattern or axis.
+        """
+        if name not in self.PATTERNS:
+            raise ValueError(f"Unknown pattern {name}.")
+        if axis not in ("x", "y"):
+            raise ValueError("The axis must be 'x' or 'y'.")
+        self.width = width
+        self.height = height
+        self.axis = axis
+        length = width if axis == "x" else height
+        # Offset of every cell of the line in pattern steps.
+        self.offsets = [
+            round(i * repeat * PATTERN_STEPS / length) for i in range(length)
+        ]
+        if name == "rainbow":
+            self.colors = _hues()
+        else:
+            self.colors = tuple(
+                bytes(
+                    round(c * (0.5 - 0.5 * math.cos(2 * math.pi * s / PATTERN_STEPS)))
+                    for c in color
+                )
+                for s in range(PATTERN_STEPS)
+            )
+        self._built: tuple[int, bytes] = (-1, b"")
+
+    def frame(self, step: int) -> bytes:
+        built = self._built
+        if built[0] == step:
+            return built[1]
+        colors = self.colors
+        # Moving the step backwards moves the pattern forwards.
+        line = [colors[(offset - step) % PATTERN_STEPS] for offset in self.offsets]
+        if self.axis == "x":
+            frame = b"".join(line) * self.height
+        else:
+            frame = b"".join(color * self.width for color in line)
+        self._built = (step, frame)
+        return frame
+
+
+class ImageSequence(Media):
+    """
+    Frames loaded from a directory of binary PPM (``P6``) images.
+
+    The images are read once, in file name order, and must all have the
+    same size.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Load an image sequence.
+
+        :param directory: The directory holding the ``.ppm`` files.
+        :raises ValueError: If there are no images or their sizes differ.
+        """
+        names = sorted(
+            name for name in os.listdir(directory) if name.lower().endswith(".ppm")
+        )
+        if not names:
+            raise ValueError(f"{directory} holds no PPM images.")
+        self.frames: list[bytes] = []
+        size = None
+        for name in names:
+            with open(os.path.join(directory, name), "rb") as file:
+                width, height, pixels = read_ppm(file.read())
+            if size is not None and size != (width, height):
+                raise ValueError(f"{name} differs in size from the sequence.")
+            size = (width, height)
+            self.frames.append(pixels)
+        self.width, self.height = size
+        self.steps = len(self.frames)
+
+    def frame(self, step: int) -> bytes:
+        return self.frames[step]
+
+
+@lru_cache(maxsize=8)
+def load_sequence(directory: str) -> ImageSequence:
+    """
+    Load an image sequence once and share it between effects.
+
+    :param directory: The directory holding the ``.ppm`` files.
+    :rtype: ImageSequence
+    """
+    return ImageSequence(directory)
+
+
+def read_ppm(data: bytes) -> tuple[int, int, bytes]:
+    """
+    Decode a binary PPM image with 8 bits per channel.
+
+    :param data: The file's content.
+    :raises ValueError: If the data is not such an image.
+    :return: Width, height and the RGB pixels in row-major order.
+    :rtype: tuple[int, int, bytes]
+    """
+    fields: list[bytes] = []
+    position = 0
+    while len(fields) < 4:
+        while position < len(data) and data[position : position + 1].isspace():
+            position += 1
+        if data[position : position + 1] == b"#":
+            position = data.index(b"\n", position)
+            continue
+        end = position
+        while end < len(data) and not data[end : end + 1].isspace():
+            end += 1
+        if end == position:
+            raise ValueError("Truncated PPM header.")
+        fields.append(data[position:end])
+        position = end
+    magic, width, height, maxval = fields[0], *map(int, fields[1:])
+    if magic != b"P6" or maxval != 255:
+        raise ValueError(
+            "Only binary PPM images with 8 bits per channel are supported."
+        )
+    # Exactly one whitespace byte separates the header from the pixels.
+    pixels = data[position + 1 : position + 1 + width * height * 3]
+    if len(pixels) != width * height * 3:
+        raise ValueError("Truncated PPM pixel data.")
+    return width, height, pixels
@@ -0,0 +1,1190 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+import uuid
+
+import orjson
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..core import settings
+from ..core.database import async_session_factory
+from ..core.redis_db import redis_manager
+from ..models.dmx.cues import MAIN_STACK, TriggerType
+from ..models.fixtures import AttributeType
+from ..services.dmx_processor import DMX_INPUT
+from ..services.playback import PlaybackService
+from ..services.programmer import PROGRAMMER_EVENTS, ProgrammerService
+from ..services.show_events import SHOW_EVENTS
+from .audio import AudioAnalyzer, AudioLevels
+from .baker import BakedCue, Baker, TrackingResolver
+from .buffers import MAX_PRIORITY, masked_merge, priority_merge, scale
+from .clock import Clock, MonotonicClock
+from .cue_cache import CueCache
+from .curves import CurveStage
+from .fade import CueFade
+from .highlight import FixtureDefaults
+from .inputs import InputSources
+from .parallel import UniverseRenderer
+from .patch import Patch
+from .programmer import ProgrammerOverlay
+from .recorder import Recorder, Recording, RecordingInfo
+from .selection import FixtureIndex
+from .shared_output import SharedOutput
+from .tempo import Tempo, TempoClock
+from .timeline import Timeline, TimelineInfo, render_timeline
+from .timer_wheel import Timer, TimerWheel
+
+logger = logging.getLogger("hyperion.engine.playback")
+
+
+class LatencyStats:
+    """
+    Collects GO-to-first-frame latencies in milliseconds.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+
+    def record(self, latency_ns: int) -> None:
+        """
+        Record one measured latency.
+
+        :param latency_ns: The latency in nanoseconds.
+        """
+        latency = latency_ns / 1_000_000
+        self.count += 1
+        self.last = latency
+        self.max = max(self.max, latency)
+        self.total += latency
+
+    def as_dict(self) -> dict:
+        """
+        Summarise the recorded latencies.
+
+        :return: ``count``, ``last_ms``, ``max_ms`` and ``mean_ms``.
+        :rtype: dict
+        """
+        return {
+            "count": self.count,
+            "last_ms": self.last,
+            "max_ms": self.max,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+        }
+
+
+class Playback:
+    """
+    A cue stack: plays the cues of a show in order and renders crossfades.
+
+    The target of a crossfade is the cue's tracked state, so jumping to a
+    cue looks the same as running up to it. Channels no cue up to the target
+    has touched keep the value they had when the GO happened.
+
+    A playback only owns the channels its cues have touched. Its fader
+    ``level`` scales its intensity channels and its ``priority`` decides
+    which playback wins a channel when several own it.
+    """
+
+    def __init__(
+        self,
+        cache: CueCache,
+        renderer: UniverseRenderer | None = None,
+        name: str = MAIN_STACK,
+        level: float = 1.0,
+        priority: int = 0,
+    ):
+        """
+        Initialise the playback.
+
+        :param cache: The n / n+1 cache providing the baked cues.
+        :param renderer: Spreads the universes of a tick over threads.
+        :param name: The cue stack played.
+        :param level: The fader level in [0, 1].
+        :param priority: The merge priority in [0, :data:`MAX_PRIORITY`].
+        """
+        self.cache = cache
+        self.renderer = renderer
+        self.name = name
+        self.level = level
+        self.priority = priority
+        self.latency = LatencyStats()
+        self._output: dict[int, bytes] = {}
+        self._fade: CueFade | None = None
+        self._go_ns: int | None = None
+
+    @property
+    def current(self) -> BakedCue | None:
+        """
+        The cue that is currently playing or fading in.
+
+        :rtype: BakedCue | None
+        """
+        return None if self._fade is None else self._fade.cue
+
+    @property
+    def masks(self) -> dict[int, bytes]:
+        """
+        The channels the playback owns, per universe.
+
+        :rtype: dict[int, bytes]
+        """
+        return {} if self._fade is None else self._fade.masks
+
+    def set_fader(self, level: float | None = None, priority: int | None = None):
+        """
+        Move the fader or change the priority.
+
+        :param level: The new level, clamped to [0, 1].
+        :param priority: The new priority, clamped to
+            [0, :data:`MAX_PRIORITY`].
+        """
+        if level is not None:
+            self.level = min(max(float(level), 0.0), 1.0)
+        if priority is not None:
+            self.priority = min(max(int(priority), 0), MAX_PRIORITY)
+
+    async def go(self, now: float) -> BakedCue | None:
+        """
+        Start the crossfade into the next cue.
+
+        :param now: The engine time of the GO in seconds.
+        :return: The cue that is now playing or ``None`` at the end of the list.
+        :rtype: BakedCue | None
+        """
+        go_ns = time.perf_counter_ns()
+        cue = await self.cache.advance()
+        if cue is not None:
+            self._start(cue, now, go_ns)
+        return cue
+
+    async def goto(self, number: int, now: float) -> BakedCue | None:
+        """
+        Start the crossfade into an arbitrary cue.
+
+        :param number: The cue number.
+        :param now: The engine time of the GO in seconds.
+        :return: The cue that is now playing or ``None`` if it does not exist.
+        :rtype: BakedCue | None
+        """
+        go_ns = time.perf_counter_ns()
+        cue = await self.cache.goto(number)
+        if cue is not None:
+            self._start(cue, now, go_ns)
+        return cue
+
+    def _start(self, cue: BakedCue, now: float, go_ns: int) -> None:
+        self._fade = CueFade(cue, self._output, now, self.masks)
+        self._go_ns = go_ns
+
+    def reload(self, cue: BakedCue) -> None:
+        """
+        Swap an edited version of the current cue into the running fade.
+
+        The fade keeps its source and start time, so the next tick renders
+        the edited look as far as the fade has progressed, instead of the
+        edit waiting for the next GO.
+
+        :param cue: The current cue, baked again.
+        """
+        fade = self._fade
+        if fade is not None and fade.cue.number == cue.number:
+            self._fade = CueFade(cue, fade.source, fade.started_at, fade.source_masks)
+
+    def render(
+        self,
+        now: float,
+        tempo: Tempo | None = None,
+        audio: AudioLevels | None = None,
+    ) -> dict[int, bytes]:
+        """
+        Render the playback's output for one tick.
+
+        :param now: The engine time in seconds.
+        :param tempo: The show tempo beat-locked effects follow.
+        :param audio: The latest audio analysis audio-driven effects follow.
+        :return: The universe buffers of this playback.
+        :rtype: dict[int, bytes]
+        """
+        if self._fade is None:
+            return self._output
+
+        self._output = self._fade.render(now, self.renderer, tempo, audio)
+
+        if self._go_ns is not None:
+            self.latency.record(time.perf_counter_ns() - self._go_ns)
+            self._go_ns = None
+        return self._output
+
+
+class PlaybackEngine:
+    """
+    Runs the DMX tick loop and publishes the rendered universes.
+
+    The cue stacks and the DMX inputs of the nodes are merged per channel
+    by priority. Every tick the playback output passes the output stage,
+    where the programmer's live overrides are merged on top. Changed
+    universes are written to the :class:`SharedOutput` block, from which the
+    outputs of other processes read, stamped with the time of their tick on
+    the tick grid.
+
+    While a pre-rendered timeline plays, it replaces the live playback as
+    the source of the output stage. A replayed recording replaces the
+    output stage as a whole, since it was captured behind it.
+
+    While recording, every published frame is handed to a
+    :class:`Recorder`, which writes it outside the event loop.
+
+    Follows are scheduled on a :class:`TimerWheel` counting ticks. A follow
+    fires on the tick its cue's fade and hold end on, before that tick is
+    rendered, and the next fade starts at the exact time of that tick
+    however late the loop woke up.
+
+    With :data:`Settings.AUDIO_SOURCE` set, a live engine analyses that
+    source in a thread of its own; ticks only read its latest levels.
+    """
+
+    def __init__(
+        self,
+        output: SharedOutput | None,
+        rate: float = 40.0,
+        renderer: UniverseRenderer | None = None,
+        clock: Clock | None = None,
+    ):
+        """
+        Initialise the engine.
+
+        :param output: The shared memory block frames are written to.
+            ``None`` keeps the frames in the engine, e.g. in simulations.
+        :param rate: Ticks per second.
+        :param renderer: Spreads the universes of a tick over threads.
+            Defaults to :data:`Settings.RENDER_THREADS` threads, which
+            collapses to a single thread on builds with the GIL.
+        :param clock: The engine's time source. Defaults to the monotonic
+            system clock.
+        """
+        self.rate = rate
+        self.output = output
+        self.clock = clock or MonotonicClock()
+        self.renderer = renderer or UniverseRenderer(settings.RENDER_THREADS)
+        self.show_id: uuid.UUID | None = None
+        self.patch = Patch()
+        self.playbacks: dict[str, Playback] = {}
+        self.programmer = ProgrammerOverlay()
+        self.inputs = InputSources()
+        self.tracking: dict[str, TrackingResolver] = {}
+        self._intensity: dict[int, bytes] = {}
+        self._curves = CurveStage()
+        self._defaults = FixtureDefaults()
+        self.index = FixtureIndex()
+        self.timeline: Timeline | None = None
+        self._timeline_started = 0.0
+        self.recorder: Recorder | None = None
+        self.replay: Recording | None = None
+        self._replay_started = 0.0
+        self._replay_start = 0.0
+        self._replay_speed = 1.0
+        self.timers = TimerWheel()
+        self.tempo = TempoClock()
+        self.audio: AudioAnalyzer | None = None
+        self._follows: dict[str, Timer] = {}
+        self._epoch = self.clock.now()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def playback(self) -> Playback | None:
+        """
+        The playback of the main cue stack.
+
+        :rtype: Playback | None
+        """
+        return self.playbacks.get(MAIN_STACK)
+
+    @staticmethod
+    def _cue_loader(
+        show_id: uuid.UUID, stack: str, baker: Baker, tracking: TrackingResolver
+    ):
+        async def load_cue(number: int) -> BakedCue | None:
+            async with async_session_factory() as db:
+                cue = await PlaybackService(db).get_cue(show_id, number, stack)
+            if cue is None:
+                return None
+            return tracking.track(baker.bake_cue(cue))
+
+        return load_cue
+
+    @staticmethod
+    def _baked_loader(cues: dict[int, BakedCue]):
+        async def load_cue(number: int) -> BakedCue | None:
+            return cues.get(number)
+
+        return load_cue
+
+    async def load_show(self, show_id: uuid.UUID) -> None:
+        """
+        Load a show's patch and prefetch the first cue of every stack.
+
+        Reloading the same show keeps the fader levels and priorities.
+
+        :param show_id: The show's primary key.
+        """
+        async with async_session_factory() as db:
+            service = PlaybackService(db)
+            patch = await service.get_patch(show_id)
+            palettes = await service.get_palettes(show_id)
+            stacks = await service.get_stacks(show_id)
+            deltas = {
+                stack: await service.get_cue_deltas(show_id, stack, patch)
+                for stack in stacks
+            }
+            references = {
+                stack: await service.get_cue_palettes(show_id, stack)
+                for stack in stacks
+            }
+
+        index = FixtureIndex.from_patch(patch)
+        baker = Baker(patch, palettes, index)
+        playbacks = {}
+        tracking = {}
+        for stack, stack_deltas in deltas.items():
+            resolver = TrackingResolver(baker, stack_deltas, references[stack])
+            if resolver.numbers:
+                # Resolve every tracked state up front so jumps never replay cues.
+                resolver.state(resolver.numbers[-1])
+            cache = CueCache(
+                resolver.numbers, self._cue_loader(show_id, stack, baker, resolver)
+            )
+            await cache.prime()
+            playbacks[stack] = Playback(cache, self.renderer, stack)
+            tracking[stack] = resolver
+
+        client = redis_manager.get_client()
+        try:
+            programmer = await ProgrammerService.load_overlay(client, show_id)
+        finally:
+            await client.aclose()
+
+        await self._install(show_id, patch, playbacks, programmer, index)
+        self.tracking = tracking
+
+    async def load_cues(
+        self,
+        patch: Patch,
+        stacks: dict[str, list[BakedCue]],
+        show_id: uuid.UUID | None = None,
+    ) -> None:
+        """
+        Play cues that are already baked, without a database.
+
+        Used by simulations and benchmarks. The cues' tracked states must be
+        resolved already.
+
+        :param patch: The patch the cues were baked against.
+        :param stacks: The cues of every stack.
+        :param show_id: The show the cues belong to, if any.
+        """
+        playbacks = {}
+        for stack, cues in stacks.items():
+            by_number = {cue.number: cue for cue in cues}
+            cache = CueCache(list(by_number), self._baked_loader(by_number))
+            await cache.prime()
+            playbacks[stack] = Playback(cache, self.renderer, stack)
+        await self._install(show_id, patch, playbacks, ProgrammerOverlay())
+        self.tracking = {}
+
+    async def _install(
+        self,
+        show_id: uuid.UUID | None,
+        patch: Patch,
+        playbacks: dict[str, Playback],
+        programmer: ProgrammerOverlay,
+        index: FixtureIndex | None = None,
+    ) -> None:
+        if show_id is not None and show_id == self.show_id:
+            for stack, playback in playbacks.items():
+                previous = self.playbacks.get(stack)
+                if previous is not None:
+                    playback.set_fader(previous.level, previous.priority)
+        for playback in self.playbacks.values():
+            await playback.cache.close()
+        for follow in self._follows.values():
+            follow.cancel()
+        self._follows.clear()
+
+        self.show_id = show_id
+        self.patch = patch
+        self.playbacks = playbacks
+        self.programmer = programmer
+        self._compile_patch()
+        self.index = index or FixtureIndex.from_patch(patch)
+        logger.info(
+            f"Loaded show {show_id} with stacks "
+            + ", ".join(
+                f"{stack} ({len(playback.cache.numbers)} cues)"
+                for stack, playback in playbacks.items()
+            )
+        )
+
+    async def _recompile(self, stack: str, numbers: list[int]) -> int:
+        resolver = self.tracking.get(stack)
+        if resolver is None or self.show_id is None:
+            return 0
+        async with async_session_factory() as db:
+            service = PlaybackService(db)
+            deltas = await service.get_cue_deltas(
+                self.show_id, stack, self.patch, numbers
+            )
+            references = await service.get_cue_palettes(self.show_id, stack, numbers)
+        # Nothing below awaits, so the tick loop sees either the old or the
+        # new state, never a mix.
+        for number in numbers:
+            if number in deltas:
+                resolver.update(number, deltas[number], references.get(number))
+            else:
+                resolver.remove(number)
+        if resolver.numbers:
+            resolver.state(resolver.numbers[-1])
+        playback = self.playbacks[stack]
+        if playback.cache.numbers != resolver.numbers:
+            playback.cache.renumber(list(resolver.numbers))
+        else:
+            playback.cache.refresh()
+        await self._reload_current(stack, min(numbers))
+        return len(numbers)
+
+    async def _reload_current(self, stack: str, first: int | None = None) -> None:
+        # The tracked state of the current cue changes with every edit up to
+        # it, and its moves in black with an edit of the cue after it.
+        playback = self.playbacks.get(stack)
+        if playback is None:
+            return
+        cache = playback.cache
+        if cache.current is None:
+            return
+        if first is not None:
+            following = cache.index + 1
+            last = (
+                cache.numbers[following]
+                if following < len(cache.numbers)
+                else cache.current.number
+            )
+            if first > last:
+                return
+        cue = await cache.reload_current()
+        if cue is not None:
+            playback.reload(cue)
+
+    async def update_scene(self, scene_id: uuid.UUID) -> int:
+        """
+        Recompile the cues playing an edited scene.
+
+        Only those cues are baked again and the tracked states from the
+        first of them on are resolved anew; untouched universes stay shared
+        with the previous states. If the edit reaches the cue that is
+        playing, its fade is rebuilt at once instead of at the next GO.
+
+        :param scene_id: The scene's primary key.
+        :return: The number of recompiled cues.
+        :rtype: int
+        """
+        if self.show_id is None:
+            return 0
+        async with async_session_factory() as db:
+            cues = await PlaybackService(db).get_scene_cues(self.show_id, scene_id)
+        recompiled = 0
+        for stack, numbers in cues.items():
+            recompiled += await self._recompile(stack, numbers)
+        return recompiled
+
+    async def update_cue(self, stack: str, number: int) -> int:
+        """
+        Recompile a created, edited or deleted cue.
+
+        :param stack: The cue's stack.
+        :param number: The cue number.
+        :return: The number of recompiled cues.
+        :rtype: int
+        """
+        return await self._recompile(stack, [number])
+
+    async def apply_change(self, event: dict) -> int:
+        """
+        Apply an invalidation event published by :class:`ShowEvents`.
+
+        :param event: The event.
+        :return: The number of recompiled cues or group members.
+        :rtype: int
+        """
+        match event.get("change"):
+            case "scene":
+                return await self.update_scene(uuid.UUID(event["scene_id"]))
+            case "cue":
+                return await self.update_cue(event["stack"], int(event["number"]))
+            case "fixture":
+                return await self.update_fixture(uuid.UUID(event["fixture_id"]))
+            case "palette":
+                return await self.update_palette(uuid.UUID(event["palette_id"]))
+            case "group":
+                return await self.update_group(uuid.UUID(event["group_id"]))
+        return 0
+
+    async def update_palette(self, palette_id: uuid.UUID) -> int:
+        """
+        Reload an edited palette and recompile the cues that use it.
+
+        Only the deltas of cues whose scenes reference the palette are baked
+        again; the tracked states from the first of them on are resolved
+        anew and prefetched cues are loaded again. If the edit reaches the
+        cue that is playing, its fade is rebuilt at once.
+
+        :param palette_id: The palette's primary key.
+        :return: The number of recompiled cues.
+        :rtype: int
+        """
+        if self.show_id is None:
+            return 0
+        async with async_session_factory() as db:
+            palette = await PlaybackService(db).get_palette(self.show_id, palette_id)
+        edited: dict[str, list[int]] = {}
+        for stack, resolver in self.tracking.items():
+            if palette is None:
+                resolver.baker.palettes.pop(palette_id, None)
+            else:
+                resolver.baker.palettes[palette_id] = palette
+            users = resolver.palette_users(palette_id)
+            if not users:
+                continue
+            for number in users:
+                resolver.invalidate(number)
+            resolver.state(resolver.numbers[-1])
+            self.playbacks[stack].cache.refresh()
+            edited[stack] = users
+        for stack, users in edited.items():
+            await self._reload_current(stack, users[0])
+        return sum(len(users) for users in edited.values())
+
+    def _compile_patch(self) -> None:
+        self._intensity = self.patch.masks([AttributeType.DIMMER])
+        self._curves = self.patch.curves()
+        self._defaults = self.patch.defaults()
+
+    async def update_fixture(self, fixture_id: uuid.UUID) -> int:
+        """
+        Reload a patched, repatched or removed fixture.
+
+        The selection index is updated for this fixture only and the
+        patch-wide output stages are compiled again. Cues setting the
+        fixture are recompiled like after a palette edit, and the playing
+        cues are baked again.
+
+        :param fixture_id: The fixture's primary key.
+        :return: The number of recompiled cues.
+        :rtype: int
+        """
+        if self.show_id is None:
+            return 0
+        async with async_session_factory() as db:
+            fixture = await PlaybackService(db).get_fixture(self.show_id, fixture_id)
+        if fixture is None:
+            self.patch.remove(fixture_id)
+            self.index.remove(fixture_id)
+        else:
+            self.patch.add(fixture)
+            self.index.add(fixture)
+        self._compile_patch()
+        recompiled = 0
+        for stack, resolver in self.tracking.items():
+            resolver.baker.patch_changed()
+            users = resolver.fixture_users(fixture_id)
+            for number in users:
+                resolver.invalidate(number)
+            if users:
+                resolver.state(resolver.numbers[-1])
+                recompiled += len(users)
+            self.playbacks[stack].cache.refresh()
+        # Effects and moves in black of the playing cues may address the
+        # fixture without setting it, so they are baked again regardless.
+        for stack in self.tracking:
+            await self._reload_current(stack)
+        return recompiled
+
+    async def update_group(self, group_id: uuid.UUID) -> int:
+        """
+        Reload an edited or deleted fixture group.
+
+        Prefetched and playing cues are loaded again so their effects pick
+        up the new members.
+
+        :param group_id: The group's primary key.
+        :return: The number of patched members.
+        :rtype: int
+        """
+        if self.show_id is None:
+            return 0
+        async with async_session_factory() as db:
+            members = await PlaybackService(db).get_group(self.show_id, group_id)
+        if members is None:
+            self.patch.groups.pop(group_id, None)
+            self.index.remove_group(group_id)
+        else:
+            self.patch.groups[group_id] = tuple(members)
+            self.index.set_group(group_id, members)
+        for playback in self.playbacks.values():
+            playback.cache.refresh()
+        for stack in list(self.playbacks):
+            await self._reload_current(stack)
+        return len(self.patch.group(group_id))
+
+    async def render_timeline(self, show_id: uuid.UUID) -> TimelineInfo:
+        """
+        Render a show's cue list offline into its timeline file.
+
+        All cues are baked with their tracked states here; the frames are
+        rendered by a process pool outside the event loop.
+
+        :param show_id: The show's primary key.
+        :return: Description of the rendered file.
+        :rtype: TimelineInfo
+        """
+        async with async_session_factory() as db:
+            service = PlaybackService(db)
+            patch = await service.get_patch(show_id)
+            palettes = await service.get_palettes(show_id)
+            deltas = await service.get_cue_deltas(show_id, patch=patch)
+            references = await service.get_cue_palettes(show_id)
+            cues = await service.get_cues(show_id)
+
+        baker = Baker(patch, palettes, FixtureIndex.from_patch(patch))
+        tracking = TrackingResolver(baker, deltas, references)
+        baked = []
+        for cue in cues:
+            baked.append(tracking.track(baker.bake_cue(cue)))
+
+        info = await asyncio.to_thread(
+            render_timeline,
+            timeline_path(show_id),
+            baked,
+            self.rate,
+            None,
+            Tempo(self.tempo.current.bpm),
+        )
+        logger.info(
+            f"Rendered timeline of show {show_id}: {info.tick_count} ticks, "
+            f"{len(info.universes)} universes"
+        )
+        return info
+
+    def play_timeline(self, show_id: uuid.UUID) -> TimelineInfo:
+        """
+        Start streaming a show's rendered timeline from the beginning.
+
+        :param show_id: The show's primary key.
+        :raises FileNotFoundError: If the timeline has not been rendered.
+        :return: Description of the playing file.
+        :rtype: TimelineInfo
+        """
+        timeline = Timeline(timeline_path(show_id))
+        self.stop_timeline()
+        self.timeline = timeline
+        self._timeline_started = self.clock.now()
+        return timeline.info
+
+    def stop_timeline(self) -> None:
+        """
+        Stop streaming the timeline and return to live playback.
+        """
+        if self.timeline is not None:
+            timeline, self.timeline = self.timeline, None
+            timeline.close()
+
+    def start_recording(self) -> str:
+        """
+        Start recording the published frames into a new file.
+
+        :raises RuntimeError: If the engine is already recording.
+        :return: The recording's name.
+        :rtype: str
+        """
+        if self.recorder is not None:
+            raise RuntimeError("Already recording.")
+        show = self.show_id or "engine"
+        name = f"{show}-{time.strftime('%Y%m%dT%H%M%S')}.hyrc"
+        self.recorder = Recorder(recording_path(name), self.rate, self.clock.now())
+        self.recorder.start()
+        logger.info(f"Recording output to {name}")
+        return name
+
+    async def stop_recording(self) -> RecordingInfo:
+        """
+        Stop recording and wait until the file is complete.
+
+        :raises RuntimeError: If the engine is not recording.
+        :return: Description of the finished file.
+        :rtype: RecordingInfo
+        """
+        if self.recorder is None:
+            raise RuntimeError("Not recording.")
+        recorder, self.recorder = self.recorder, None
+        return await asyncio.to_thread(recorder.close)
+
+    async def play_recording(
+        self, name: str, speed: float = 1.0, start: float = 0.0
+    ) -> RecordingInfo:
+        """
+        Replay a recording to the outputs instead of the live frames.
+
+        :param name: The recording's name.
+        :param speed: Playback speed; 1.0 is real time.
+        :param start: Seconds into the recording to start at.
+        :raises FileNotFoundError: If there is no such recording.
+        :raises ValueError: If the file is not a recording or the speed is
+            not positive.
+        :return: Description of the playing file.
+        :rtype: RecordingInfo
+        """
+        if speed <= 0.0:
+            raise ValueError("The replay speed must be positive.")
+        recording = await asyncio.to_thread(Recording, recording_path(name))
+        recording.seek(start)
+        self.stop_replay()
+        self.replay = recording
+        self._replay_started = self.clock.now()
+        self._replay_start = start
+        self._replay_speed = speed
+        return recording.info
+
+    def stop_replay(self) -> None:
+        """
+        Stop replaying and return to live output.
+        """
+        if self.replay is not None:
+            replay, self.replay = self.replay, None
+            replay.close()
+
+    def _replay_position(self, now: float) -> float:
+        return self._replay_start + (now - self._replay_started) * self._replay_speed
+
+    def _tick(self, now: float) -> int:
+        return round((now - self._epoch) * self.rate)
+
+    def _tick_time(self, tick: int) -> float:
+        return self._epoch + tick / self.rate
+
+    def _schedule_follow(
+        self, playback: Playback, cue: BakedCue | None, start: float
+    ) -> None:
+        follow = self._follows.pop(playback.name, None)
+        if follow is not None:
+            follow.cancel()
+        if cue is None or cue.trigger is not TriggerType.FOLLOW:
+            return
+        deadline = self._tick(start + cue.duration + cue.hold)
+        self._follows[playback.name] = self.timers.call_at(
+            deadline, self._follow, playback, deadline
+        )
+
+    async def _follow(self, playback: Playback, tick: int) -> None:
+        if self.playbacks.get(playback.name) is not playback:
+            return
+        self._follows.pop(playback.name, None)
+        start = self._tick_time(tick)
+        self._schedule_follow(playback, await playback.go(start), start)
+
+    def _follow_in(self, stack: str) -> float | None:
+        follow = self._follows.get(stack)
+        if follow is None:
+            return None
+        return max(self._tick_time(follow.deadline) - self.clock.now(), 0.0)
+
+    async def run_timers(self, now: float) -> None:
+        """
+        Run the timers due up to the tick of a time.
+
+        :param now: The engine time in seconds.
+        """
+        for timer in self.timers.advance(self._tick(now)):
+            try:
+                result = timer.callback(*timer.args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Timer {timer.callback.__name__} failed: {e}")
+
+    def _playback(self, stack: str) -> Playback:
+        if not self.playbacks:
+            raise RuntimeError("No show loaded.")
+        playback = self.playbacks.get(stack)
+        if playback is None:
+            raise LookupError(f"Unknown cue stack {stack}.")
+        return playback
+
+    async def go(self, stack: str = MAIN_STACK) -> BakedCue | None:
+        """
+        Trigger a GO on a cue stack of the loaded show.
+
+        :param stack: The cue stack.
+        :raises RuntimeError: If no show is loaded.
+        :raises LookupError: If the show has no such stack.
+        :return: The cue that is now playing.
+        :rtype: BakedCue | None
+        """
+        playback = self._playback(stack)
+        now = self.clock.now()
+        cue = await playback.go(now)
+        self._schedule_follow(playback, cue, now)
+        return cue
+
+    async def goto(self, number: int, stack: str = MAIN_STACK) -> BakedCue | None:
+        """
+        Jump to a cue of a stack of the loaded show.
+
+        :param number: The cue number.
+        :param stack: The cue stack.
+        :raises RuntimeError: If no show is loaded.
+        :raises LookupError: If the show has no such stack.
+        :return: The cue that is now playing.
+        :rtype: BakedCue | None
+        """
+        playback = self._playback(stack)
+        now = self.clock.now()
+        cue = await playback.goto(number, now)
+        if cue is not None:
+            self._schedule_follow(playback, cue, now)
+        return cue
+
+    def set_fader(
+        self,
+        stack: str = MAIN_STACK,
+        level: float | None = None,
+        priority: int | None = None,
+    ) -> None:
+        """
+        Move a stack's fader or change its priority.
+
+        :param stack: The cue stack.
+        :param level: The new level in [0, 1].
+        :param priority: The new priority.
+        :raises RuntimeError: If no show is loaded.
+        :raises LookupError: If the show has no such stack.
+        """
+        self._playback(stack).set_fader(level, priority)
+
+    def tap_tempo(self) -> float:
+        """
+        Tap the show tempo.
+
+        :return: The tempo in BPM.
+        :rtype: float
+        """
+        return self.tempo.tap(self.clock.now()).bpm
+
+    def set_tempo(self, bpm: float) -> float:
+        """
+        Set the show tempo.
+
+        :param bpm: Beats per minute.
+        :return: The tempo in BPM after clamping.
+        :rtype: float
+        """
+        return self.tempo.set_bpm(bpm, self.clock.now()).bpm
+
+    def reset_tempo(self) -> None:
+        """
+        Make the current moment the first beat.
+        """
+        self.tempo.reset(self.clock.now())
+
+    def _merge_playbacks(self, now: float) -> dict[int, bytes]:
+        layers: dict[int, list[tuple[int, bytes, bytes]]] = {}
+        tempo = self.tempo.current
+        audio = self.audio.levels if self.audio is not None else None
+        for playback in self.playbacks.values():
+            if playback.level <= 0.0:
+                continue
+            output = playback.render(now, tempo, audio)
+            masks = playback.masks
+            for universe, values in output.items():
+                mask = masks.get(universe)
+                if mask is None:
+                    continue
+                if playback.level < 1.0:
+                    intensity = self._intensity.get(universe)
+                    if intensity is not None:
+                        values = masked_merge(
+                            values, scale(values, playback.level), intensity
+                        )
+                layers.setdefault(universe, []).append(
+                    (playback.priority, values, mask)
+                )
+        for universe, input_layers in self.inputs.layers().items():
+            layers.setdefault(universe, []).extend(input_layers)
+        return {
+            universe: priority_merge(universe_layers)[0]
+            for universe, universe_layers in layers.items()
+        }
+
+    def render_frame(self, now: float) -> dict[int, bytes]:
+        """
+        Render all universes for one tick.
+
+        The outputs of all cue stacks and the DMX inputs are merged per
+        channel by priority, then the programmer's overrides and the
+        channels' response curves are applied, even while nothing plays.
+
+        :param now: The engine time in seconds.
+        :return: The final universe buffers.
+        :rtype: dict[int, bytes]
+        """
+        if self.replay is not None:
+            return self.replay.frame_at(self._replay_position(now))
+        if self.timeline is not None:
+            frame = self.timeline.frame_at(now - self._timeline_started)
+        elif self.playbacks or len(self.inputs):
+            frame = self._merge_playbacks(now)
+        else:
+            frame = {}
+        self.programmer.apply(frame)
+        self._curves.apply(frame)
+        return frame
+
+    def status(self) -> dict:
+        """
+        Describe the engine's state for monitoring.
+
+        :rtype: dict
+        """
+        playback = self.playback
+        if self.replay is not None:
+            info = self.replay.info
+            return {
+                "show_id": str(self.show_id),
+                "replay": {
+                    "path": info.path,
+                    "started_at": info.started_at,
+                    "position": self._replay_position(self.clock.now()),
+                    "duration": info.duration,
+                    "speed": self._replay_speed,
+                },
+                "recording": self._recording_status(),
+            }
+        if self.timeline is not None:
+            info = self.timeline.info
+            return {
+                "show_id": str(self.show_id),
+                "timeline": {
+                    "path": info.path,
+                    "position": self.clock.now() - self._timeline_started,
+                    "duration": info.duration,
+                },
+                "programmer_channels": len(self.programmer),
+                "recording": self._recording_status(),
+            }
+        if playback is None:
+            return {"show_id": None}
+        current = playback.current
+        upcoming = playback.cache.next
+        return {
+            "show_id": str(self.show_id),
+            "current_cue": current.number if current else None,
+            "next_cue": upcoming.number if upcoming else None,
+            "prefetch_misses": playback.cache.misses,
+            "programmer_channels": len(self.programmer),
+            "highlighted_channels": self.programmer.highlighted,
+            "go_latency": playback.latency.as_dict(),
+            "render_threads": self.renderer.workers,
+            "tempo": {
+                "bpm": self.tempo.current.bpm,
+                "beat": self.tempo.current.beats(self.clock.now()),
+            },
+            "audio": self._audio_status(),
+            "inputs": self.inputs.sources,
+            "recording": self._recording_status(),
+            "stacks": {
+                name: {
+                    "current_cue": stack.current.number if stack.current else None,
+                    "next_cue": stack.cache.next.number if stack.cache.next else None,
+                    "level": stack.level,
+                    "priority": stack.priority,
+                    "follow_in": self._follow_in(name),
+                }
+                for name, stack in self.playbacks.items()
+            },
+        }
+
+    def _recording_status(self) -> dict | None:
+        if self.recorder is None:
+            return None
+        return {"path": self.recorder.path, "frames": self.recorder.frames}
+
+    def _audio_status(self) -> dict | None:
+        if self.audio is None:
+            return None
+        levels = self.audio.levels
+        return {
+            "level": levels.level,
+            "bands": list(levels.bands),
+            "onsets": levels.onsets,
+        }
+
+    async def _listen_programmer(self, client) -> None:
+        pubsub = client.pubsub()
+        await pubsub.subscribe(PROGRAMMER_EVENTS)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                event = orjson.loads(message["data"])
+                if event.get("show_id") == str(self.show_id):
+                    self.programmer.apply_event(event, self._defaults)
+        finally:
+            await pubsub.unsubscribe(PROGRAMMER_EVENTS)
+
+    async def _listen_show_events(self, client) -> None:
+        pubsub = client.pubsub()
+        await pubsub.subscribe(SHOW_EVENTS)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                event = orjson.loads(message["data"])
+                if event.get("show_id") != str(self.show_id):
+                    continue
+                try:
+                    await self.apply_change(event)
+                except (SQLAlchemyError, OSError, KeyError, ValueError) as e:
+                    logger.error(f"Failed to apply show change {event}: {e}")
+        finally:
+            await pubsub.unsubscribe(SHOW_EVENTS)
+
+    async def _listen_inputs(self, client) -> None:
+        pubsub = client.pubsub()
+        await pubsub.subscribe(DMX_INPUT)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    self.inputs.apply_event(orjson.loads(message["data"]))
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Invalid DMX input event: {e}")
+        finally:
+            await pubsub.unsubscribe(DMX_INPUT)
+
+    async def tick(self) -> dict[int, bytes]:
+        """
+        Run the due timers, then render and publish one frame at the
+        clock's current time.
+
+        :return: The rendered universe buffers.
+        :rtype: dict[int, bytes]
+        """
+        now = self.clock.now()
+        await self.run_timers(now)
+        frame = self.render_frame(now)
+        if self.output is not None:
+            self.output.write(frame, self._tick_time(self._tick(now)))
+        if self.recorder is not None:
+            self.recorder.capture(now, frame)
+        return frame
+
+    async def run(self) -> None:
+        """
+        The tick loop. Runs until cancelled.
+        """
+        client = redis_manager.get_client()
+        listeners = [
+            asyncio.create_task(self._listen_programmer(client)),
+            asyncio.create_task(self._listen_show_events(client)),
+            asyncio.create_task(self._listen_inputs(client)),
+        ]
+        period = 1.0 / self.rate
+        next_tick = self.clock.now()
+        try:
+            while True:
+                try:
+                    await self.tick()
+                except ValueError as e:
+                    logger.error(f"Failed to render tick: {e}")
+                next_tick += period
+                delay = next_tick - self.clock.now()
+                if delay < -period:
+                    next_tick = self.clock.now()
+                    delay = 0
+                await self.clock.sleep(max(delay, 0))
+        finally:
+            for listener in listeners:
+                listener.cancel()
+            await asyncio.gather(*listeners, return_exceptions=True)
+            await client.aclose()
+
+    def start(self) -> None:
+        """
+        Start the tick loop and the audio input in the background.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        if settings.AUDIO_SOURCE and self.audio is None:
+            self.audio = AudioAnalyzer(settings.AUDIO_SOURCE, loop=settings.AUDIO_LOOP)
+            self.audio.start()
+
+    async def stop(self) -> None:
+        """
+        Stop the tick loop and the audio input, cancel pending prefetches
+        and finish a running recording.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.audio is not None:
+            self.audio.stop()
+            self.audio = None
+        for playback in self.playbacks.values():
+            await playback.cache.close()
+        self.stop_timeline()
+        self.stop_replay()
+        if self.recorder is not None:
+            await self.stop_recording()
+
+
+def timeline_path(show_id: uuid.UUID) -> str:
+    """
+    The timeline file of a show.
+
+    :param show_id: The show's primary key.
+    :rtype: str
+    """
+    return os.path.join(settings.TIMELINE_DIR, f"{show_id}.hytl")
+
+
+def recording_path(name: str) -> str:
+    """
+    The file of a recording.
+
+    :param name: The recording's name.
+    :raises ValueError: If the name is not a plain file name.
+    :rtype: str
+    """
+    if not name or os.path.basename(name) != name or name.startswith("."):
+        raise ValueError(f"Invalid recording name {name!r}.")
+    return os.path.join(settings.RECORDING_DIR, name)
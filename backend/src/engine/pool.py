@@ -0,0 +1,355 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import uuid
+
+from ..core import settings
+from ..models.dmx.cues import MAIN_STACK
+from .interpreter import EngineInterpreter, available
+from .process import EngineHandle, EngineProcess
+from .recorder import RecordingInfo
+from .shared_output import SharedOutput
+from .timeline import TimelineInfo
+
+logger = logging.getLogger("hyperion.engine.pool")
+
+
+class EnginePool:
+    """
+    One isolated playback engine per loaded show.
+
+    A rehearsal and a live show can run side by side; each gets its own
+    process or subinterpreter (``Settings.SHOW_ISOLATION``) and its own
+    output block. Commands without a show ID go to the most recently loaded
+    show.
+    """
+
+    def __init__(self, rate: float = 40.0, isolation: str | None = None):
+        """
+        Initialise the pool. Engines are started when a show is loaded.
+
+        :param rate: Ticks per second of every engine.
+        :param isolation: ``"process"`` or ``"interpreter"``. Defaults to
+            ``Settings.SHOW_ISOLATION``. Interpreters fall back to processes
+            while the engine's dependencies cannot load in subinterpreters,
+            see :func:`~.interpreter.available`.
+        """
+        self.rate = rate
+        self.isolation = isolation or settings.SHOW_ISOLATION
+        self.engines: dict[uuid.UUID, EngineHandle] = {}
+        self.selected: uuid.UUID | None = None
+
+    def _create(self) -> EngineHandle:
+        if self.isolation == "interpreter":
+            if available():
+                return EngineInterpreter(self.rate)
+            logger.warning(
+                "Engines cannot run in subinterpreters, isolating shows in processes"
+            )
+        return EngineProcess(self.rate)
+
+    def engine(self, show_id: uuid.UUID | None = None) -> EngineHandle:
+        """
+        The engine of a show.
+
+        :param show_id: The show's primary key. ``None`` selects the most
+            recently loaded show.
+        :raises RuntimeError: If the show is not loaded.
+        :rtype: EngineHandle
+        """
+        handle = self.engines.get(show_id or self.selected)
+        if handle is None:
+            raise RuntimeError("No show loaded.")
+        return handle
+
+    def outputs(self) -> dict[uuid.UUID, SharedOutput]:
+        """
+        The output blocks of all running engines.
+
+        :rtype: dict[uuid.UUID, SharedOutput]
+        """
+        return {
+            show_id: handle.output
+            for show_id, handle in self.engines.items()
+            if handle.output is not None
+        }
+
+    async def load_show(self, show_id: uuid.UUID) -> dict:
+        """
+        Load a show into its own engine, starting the engine if needed.
+
+        :param show_id: The show's primary key.
+        :return: The engine status.
+        :rtype: dict
+        """
+        handle = self.engines.get(show_id)
+        if handle is None or not handle.running:
+            handle = self._create()
+            handle.start()
+            self.engines[show_id] = handle
+        try:
+            status = await handle.load_show(show_id)
+        except Exception:
+            await self.unload_show(show_id)
+            raise
+        self.selected = show_id
+        return status
+
+    async def unload_show(self, show_id: uuid.UUID) -> bool:
+        """
+        Stop a show's engine.
+
+        :param show_id: The show's primary key.
+        :return: ``False`` if the show was not loaded.
+        :rtype: bool
+        """
+        handle = self.engines.pop(show_id, None)
+        if handle is None:
+            return False
+        if self.selected == show_id:
+            self.selected = next(reversed(self.engines), None)
+        await handle.stop()
+        return True
+
+    async def go(
+        self, show_id: uuid.UUID | None = None, stack: str = MAIN_STACK
+    ) -> int | None:
+        """
+        Trigger a GO.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :param stack: The cue stack.
+        :raises RuntimeError: If the show is not loaded.
+        :raises LookupError: If the show has no such stack.
+        :return: The number of the cue now playing.
+        :rtype: int | None
+        """
+        return await self.engine(show_id).go(stack)
+
+    async def goto(
+        self,
+        number: int,
+        show_id: uuid.UUID | None = None,
+        stack: str = MAIN_STACK,
+    ) -> int | None:
+        """
+        Jump to a cue.
+
+        :param number: The cue number.
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :param stack: The cue stack.
+        :raises RuntimeError: If the show is not loaded.
+        :raises LookupError: If the show has no such stack.
+        :return: The number of the cue now playing or ``None`` if it does not
+            exist.
+        :rtype: int | None
+        """
+        return await self.engine(show_id).goto(number, stack)
+
+    async def set_fader(
+        self,
+        show_id: uuid.UUID | None = None,
+        stack: str = MAIN_STACK,
+        level: float | None = None,
+        priority: int | None = None,
+    ) -> None:
+        """
+        Move a stack's fader or change its priority.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :param stack: The cue stack.
+        :param level: The new level in [0, 1].
+        :param priority: The new priority.
+        :raises RuntimeError: If the show is not loaded.
+        :raises LookupError: If the show has no such stack.
+        """
+        await self.engine(show_id).set_fader(stack, level, priority)
+
+    async def tap_tempo(self, show_id: uuid.UUID | None = None) -> float:
+        """
+        Tap a show's tempo.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :raises RuntimeError: If the show is not loaded.
+        :return: The tempo in BPM.
+        :rtype: float
+        """
+        return await self.engine(show_id).tap_tempo()
+
+    async def set_tempo(self, bpm: float, show_id: uuid.UUID | None = None) -> float:
+        """
+        Set a show's tempo.
+
+        :param bpm: Beats per minute.
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :raises RuntimeError: If the show is not loaded.
+        :return: The tempo in BPM after clamping.
+        :rtype: float
+        """
+        return await self.engine(show_id).set_tempo(bpm)
+
+    async def reset_tempo(self, show_id: uuid.UUID | None = None) -> None:
+        """
+        Make the current moment the first beat of a show.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :raises RuntimeError: If the show is not loaded.
+        """
+        await self.engine(show_id).reset_tempo()
+
+    async def status(self, show_id: uuid.UUID | None = None) -> dict:
+        """
+        The status of a show's engine.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :rtype: dict
+        """
+        if show_id is None and self.selected is None:
+            return {"show_id": None}
+        return await self.engine(show_id).status()
+
+    async def render_timeline(self, show_id: uuid.UUID) -> TimelineInfo:
+        """
+        Render a show's timeline in its engine, or in the selected one if the
+        show is not loaded.
+
+        :param show_id: The show's primary key.
+        :raises RuntimeError: If no show is loaded.
+        :rtype: TimelineInfo
+        """
+        handle = self.engines.get(show_id) or self.engine()
+        return await handle.render_timeline(show_id)
+
+    async def play_timeline(self, show_id: uuid.UUID) -> TimelineInfo:
+        """
+        Stream a show's rendered timeline from its engine, or from the
+        selected one if the show is not loaded.
+
+        :param show_id: The show's primary key.
+        :raises RuntimeError: If no show is loaded.
+        :rtype: TimelineInfo
+        """
+        handle = self.engines.get(show_id) or self.engine()
+        return await handle.play_timeline(show_id)
+
+    async def stop_timeline(self, show_id: uuid.UUID | None = None) -> None:
+        """
+        Return from timeline streaming to live playback.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        """
+        await self.engine(show_id).stop_timeline()
+
+    async def update_palette(self, show_id: uuid.UUID, palette_id: uuid.UUID) -> int:
+        """
+        Recompile the cues of a loaded show that use an edited palette.
+
+        :param show_id: The show the palette belongs to.
+        :param palette_id: The palette's primary key.
+        :return: The number of recompiled cues; 0 if the show is not loaded.
+        :rtype: int
+        """
+        handle = self.engines.get(show_id)
+        if handle is None:
+            return 0
+        return await handle.update_palette(palette_id)
+
+    async def update_fixture(self, show_id: uuid.UUID, fixture_id: uuid.UUID) -> int:
+        """
+        Update the patch of a loaded show after a fixture changed.
+
+        :param show_id: The show the fixture belongs to.
+        :param fixture_id: The fixture's primary key.
+        :return: The number of recompiled cues; 0 if the show is not loaded.
+        :rtype: int
+        """
+        handle = self.engines.get(show_id)
+        if handle is None:
+            return 0
+        return await handle.update_fixture(fixture_id)
+
+    async def update_group(self, show_id: uuid.UUID, group_id: uuid.UUID) -> int:
+        """
+        Update the selection index of a loaded show after a group changed.
+
+        :param show_id: The show the group belongs to.
+        :param group_id: The group's primary key.
+        :return: The number of patched members; 0 if the show is not loaded.
+        :rtype: int
+        """
+        handle = self.engines.get(show_id)
+        if handle is None:
+            return 0
+        return await handle.update_group(group_id)
+
+    async def start_recording(self, show_id: uuid.UUID | None = None) -> str:
+        """
+        Start recording a show's output.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :raises RuntimeError: If the show is not loaded or already recording.
+        :return: The recording's name.
+        :rtype: str
+        """
+        return await self.engine(show_id).start_recording()
+
+    async def stop_recording(self, show_id: uuid.UUID | None = None) -> RecordingInfo:
+        """
+        Stop recording a show's output.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :raises RuntimeError: If the show is not loaded or not recording.
+        :rtype: RecordingInfo
+        """
+        return await self.engine(show_id).stop_recording()
+
+    async def play_recording(
+        self,
+        name: str,
+        speed: float = 1.0,
+        start: float = 0.0,
+        show_id: uuid.UUID | None = None,
+    ) -> RecordingInfo:
+        """
+        Replay a recording through a show's engine to the nodes.
+
+        :param name: The recording's name.
+        :param speed: Playback speed; 1.0 is real time.
+        :param start: Seconds into the recording to start at.
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        :raises RuntimeError: If the show is not loaded.
+        :rtype: RecordingInfo
+        """
+        return await self.engine(show_id).play_recording(name, speed, start)
+
+    async def stop_replay(self, show_id: uuid.UUID | None = None) -> None:
+        """
+        Return from a replay to live output.
+
+        :param show_id: The show; ``None`` for the most recently loaded one.
+        """
+        await self.engine(show_id).stop_replay()
+
+    async def stop(self) -> None:
+        """
+        Stop every engine.
+        """
+        for show_id in list(self.engines):
+            await self.unload_show(show_id)
+
+
+playback_engine = EnginePool()
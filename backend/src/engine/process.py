@@ -0,0 +1,468 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Runs playback engines isolated from the API.
+
+The API process only sends commands to the engine and reads the rendered
+universes from a :class:`SharedOutput` block. Slow requests, password
+hashing or database queries in the API therefore cannot delay a tick.
+"""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import multiprocessing
+import pickle
+import uuid
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+
+from ..models.dmx.cues import MAIN_STACK
+from .baker import BakedCue
+from .recorder import RecordingInfo
+from .shared_output import SharedOutput
+from .timeline import TimelineInfo
+
+logger = logging.getLogger("hyperion.engine.process")
+
+COMMANDS = frozenset(
+    {
+        "load_show",
+        "go",
+        "goto",
+        "set_fader",
+        "tap_tempo",
+        "set_tempo",
+        "reset_tempo",
+        "status",
+        "render_timeline",
+        "play_timeline",
+        "stop_timeline",
+        "update_palette",
+        "update_fixture",
+        "update_group",
+        "start_recording",
+        "stop_recording",
+        "play_recording",
+        "stop_replay",
+    }
+)
+SHUTDOWN = "shutdown"
+
+
+async def _execute(engine, send, request_id: int, command, args) -> None:
+    try:
+        result = getattr(engine, command)(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        if isinstance(result, BakedCue):
+            result = result.number
+        reply = (request_id, True, result)
+    except Exception as e:
+        reply = (request_id, False, e)
+    try:
+        pickle.dumps(reply)
+    except Exception:
+        reply = (request_id, False, RuntimeError(repr(reply[2])))
+    send(reply)
+
+
+async def serve(
+    output_name: str,
+    receive: Callable[[], object],
+    send: Callable[[object], None],
+    rate: float,
+) -> None:
+    """
+    Run a playback engine and execute the commands sent to it.
+
+    This is the main function of every isolated engine, whatever carries
+    its messages.
+
+    :param output_name: The shared output block to write frames to.
+    :param receive: Blocks until the next command arrives; raises
+        :class:`EOFError` when the other side has gone away.
+    :param send: Sends a reply.
+    :param rate: Ticks per second.
+    """
+    # Imported here so the API process never loads the engine's own state.
+    from ..core.redis_db import redis_manager
+    from .playback import PlaybackEngine
+
+    output = SharedOutput.attach(output_name)
+    engine = PlaybackEngine(output, rate)
+    engine.start()
+    tasks = set()
+    try:
+        while True:
+            try:
+                message = await asyncio.to_thread(receive)
+            except EOFError:
+                break
+            if message == SHUTDOWN:
+                break
+            request_id, command, args = message
+            task = asyncio.create_task(
+                _execute(engine, send, request_id, command, args)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await engine.stop()
+        engine.renderer.close()
+        await redis_manager.close()
+        output.close()
+
+
+def configure_logging() -> None:
+    """
+    Set up logging in a fresh process or interpreter like the API does.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def _engine_main(output_name: str, conn: Connection, rate: float) -> None:
+    configure_logging()
+    asyncio.run(serve(output_name, conn.recv, conn.send, rate))
+
+
+class EngineHandle:
+    """
+    Handle of an isolated playback engine in the API process.
+
+    The methods mirror :class:`~.playback.PlaybackEngine`. Each call is sent
+    to the engine with a request ID; replies are matched by that ID, so a
+    long running command such as rendering a timeline does not hold up a
+    GO. Subclasses decide where the engine runs and how messages travel.
+    """
+
+    def __init__(self, rate: float = 40.0):
+        """
+        Initialise the handle. The engine is started by :meth:`start`.
+
+        :param rate: Ticks per second of the engine.
+        """
+        self.rate = rate
+        self.output: SharedOutput | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._receiver: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the engine accepts commands.
+
+        :rtype: bool
+        """
+        return self._receiver is not None and not self._receiver.done()
+
+    def start(self) -> None:
+        """
+        Allocate the shared output and start the engine.
+        """
+        raise NotImplementedError
+
+    def _send(self, message) -> None:
+        raise NotImplementedError
+
+    def _receive_blocking(self):
+        # Blocks until a reply arrives; raises EOFError once the engine ended.
+        raise NotImplementedError
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                request_id, ok, result = await asyncio.to_thread(self._receive_blocking)
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+        except (EOFError, OSError):
+            logger.info("Engine closed its reply channel")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Playback engine stopped."))
+            self._pending.clear()
+
+    async def call(self, command: str, *args):
+        """
+        Run a method of the engine.
+
+        :param command: The name of the engine method.
+        :param args: Its positional arguments; they must be picklable.
+        :raises RuntimeError: If the engine is not running.
+        :return: The method's result. Baked cues are returned as their number.
+        """
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown engine command {command}.")
+        if not self.running:
+            raise RuntimeError("Playback engine is not running.")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._send((request_id, command, args))
+        return await future
+
+    async def load_show(self, show_id: uuid.UUID) -> dict:
+        """
+        Load a show and return the engine status.
+
+        :param show_id: The show's primary key.
+        :rtype: dict
+        """
+        await self.call("load_show", show_id)
+        return await self.status()
+
+    async def go(self, stack: str = MAIN_STACK) -> int | None:
+        """
+        Trigger a GO.
+
+        :param stack: The cue stack.
+        :return: The number of the cue now playing.
+        :rtype: int | None
+        """
+        return await self.call("go", stack)
+
+    async def goto(self, number: int, stack: str = MAIN_STACK) -> int | None:
+        """
+        Jump to a cue.
+
+        :param number: The cue number.
+        :param stack: The cue stack.
+        :return: The number of the cue now playing or ``None`` if it does not
+            exist.
+        :rtype: int | None
+        """
+        return await self.call("goto", number, stack)
+
+    async def set_fader(
+        self,
+        stack: str = MAIN_STACK,
+        level: float | None = None,
+        priority: int | None = None,
+    ) -> None:
+        """
+        Move a stack's fader or change its priority.
+
+        :param stack: The cue stack.
+        :param level: The new level in [0, 1].
+        :param priority: The new priority.
+        """
+        await self.call("set_fader", stack, level, priority)
+
+    async def tap_tempo(self) -> float:
+        """
+        Tap the show tempo.
+
+        :return: The tempo in BPM.
+        :rtype: float
+        """
+        return await self.call("tap_tempo")
+
+    async def set_tempo(self, bpm: float) -> float:
+        """
+        Set the show tempo.
+
+        :param bpm: Beats per minute.
+        :return: The tempo in BPM after clamping.
+        :rtype: float
+        """
+        return await self.call("set_tempo", bpm)
+
+    async def reset_tempo(self) -> None:
+        """
+        Make the current moment the first beat.
+        """
+        await self.call("reset_tempo")
+
+    async def status(self) -> dict:
+        """
+        The engine status for monitoring.
+
+        :rtype: dict
+        """
+        return await self.call("status")
+
+    async def render_timeline(self, show_id: uuid.UUID) -> TimelineInfo:
+        """
+        Render a show's timeline in the engine process.
+
+        :param show_id: The show's primary key.
+        :rtype: TimelineInfo
+        """
+        return await self.call("render_timeline", show_id)
+
+    async def play_timeline(self, show_id: uuid.UUID) -> TimelineInfo:
+        """
+        Start streaming a show's rendered timeline.
+
+        :param show_id: The show's primary key.
+        :rtype: TimelineInfo
+        """
+        return await self.call("play_timeline", show_id)
+
+    async def stop_timeline(self) -> None:
+        """
+        Return from timeline streaming to live playback.
+        """
+        await self.call("stop_timeline")
+
+    async def update_palette(self, palette_id: uuid.UUID) -> int:
+        """
+        Reload an edited palette and recompile the cues that use it.
+
+        :param palette_id: The palette's primary key.
+        :return: The number of recompiled cues.
+        :rtype: int
+        """
+        return await self.call("update_palette", palette_id)
+
+    async def update_fixture(self, fixture_id: uuid.UUID) -> int:
+        """
+        Reload a patched, repatched or removed fixture.
+
+        :param fixture_id: The fixture's primary key.
+        :return: The number of recompiled cues.
+        :rtype: int
+        """
+        return await self.call("update_fixture", fixture_id)
+
+    async def update_group(self, group_id: uuid.UUID) -> int:
+        """
+        Reload an edited or deleted fixture group.
+
+        :param group_id: The group's primary key.
+        :return: The number of patched members.
+        :rtype: int
+        """
+        return await self.call("update_group", group_id)
+
+    async def start_recording(self) -> str:
+        """
+        Start recording the engine's output.
+
+        :return: The recording's name.
+        :rtype: str
+        """
+        return await self.call("start_recording")
+
+    async def stop_recording(self) -> RecordingInfo:
+        """
+        Stop recording the engine's output.
+
+        :rtype: RecordingInfo
+        """
+        return await self.call("stop_recording")
+
+    async def play_recording(
+        self, name: str, speed: float = 1.0, start: float = 0.0
+    ) -> RecordingInfo:
+        """
+        Replay a recording in the engine process.
+
+        :param name: The recording's name.
+        :param speed: Playback speed; 1.0 is real time.
+        :param start: Seconds into the recording to start at.
+        :rtype: RecordingInfo
+        """
+        return await self.call("play_recording", name, speed, start)
+
+    async def stop_replay(self) -> None:
+        """
+        Return from a replay to live output.
+        """
+        await self.call("stop_replay")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Shut the engine down and free the shared output.
+
+        :param timeout: Seconds to wait for a clean shutdown.
+        """
+        raise NotImplementedError
+
+    async def _finish(self) -> None:
+        if self._receiver is not None:
+            await asyncio.gather(self._receiver, return_exceptions=True)
+        self._receiver = None
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+
+
+class EngineProcess(EngineHandle):
+    """
+    An engine running in its own process, commanded over a pipe.
+    """
+
+    def __init__(self, rate: float = 40.0):
+        super().__init__(rate)
+        self._process: multiprocessing.Process | None = None
+        self._conn: Connection | None = None
+
+    def start(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        context = multiprocessing.get_context("spawn")
+        self.output = SharedOutput.create()
+        self._conn, child = context.Pipe()
+        # Not a daemon: the engine spawns its own workers to render timelines.
+        self._process = context.Process(
+            target=_engine_main,
+            args=(self.output.name, child, self.rate),
+            name="hyperion-engine",
+        )
+        self._process.start()
+        child.close()
+        self._receiver = asyncio.create_task(self._receive())
+        logger.info(f"Started engine process {self._process.pid}")
+
+    def _send(self, message) -> None:
+        self._conn.send(message)
+
+    def _receive_blocking(self):
+        return self._conn.recv()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        if self._process is None:
+            return
+        try:
+            self._conn.send(SHUTDOWN)
+        except OSError:
+            pass
+        await asyncio.to_thread(self._process.join, timeout)
+        if self._process.is_alive():
+            logger.warning("Engine process did not stop in time, terminating")
+            self._process.terminate()
+            await asyncio.to_thread(self._process.join)
+        self._conn.close()
+        await self._finish()
+        self._process = None
+        self._conn = None
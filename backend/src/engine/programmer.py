@@ -14,3 +14,198 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import uuid
+from typing import Iterable, Mapping
+
+from .buffers import UNIVERSE_SIZE, blank, from_int, masked_merge, to_int
+from .highlight import FixtureDefaults, Layer
+
+_EMPTY = bytes(UNIVERSE_SIZE)
+
+
+class ProgrammerOverlay:
+    """
+    Sparse live overrides applied on top of the playback output.
+
+    Only touched ``(universe, address)`` pairs are stored, each together with
+    the owner (the account) that set it. Setting a channel takes it over from
+    its previous owner; clearing only ever releases the caller's channels.
+
+    Every change marks its universes dirty. A dirty universe is recompiled
+    into a value buffer and a mask on the next tick, which costs time
+    proportional to the overlay's channels in that universe only. Applying
+    the overlay is one masked merge per universe that has overrides.
+
+    Locating copies precomputed home values straight into the compiled
+    buffers. Highlighting is a separate layer on top of everything; it is
+    never stored or recorded and is replaced by every new highlight.
+    """
+
+    def __init__(self):
+        self._channels: dict[int, dict[int, tuple[int, str]]] = {}
+        self._compiled: dict[int, tuple[bytes, bytes]] = {}
+        self._dirty: set[int] = set()
+        self._highlight: dict[int, tuple[bytes, bytes]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(channels) for channels in self._channels.values())
+
+    def set_many(self, owner: str, values: Iterable[tuple[int, int, int]]) -> None:
+        """
+        Override channels.
+
+        :param owner: The account setting the values.
+        :param values: ``(universe, address, value)`` triples.
+        """
+        for universe, address, value in values:
+            channels = self._channels.get(universe)
+            if channels is None:
+                channels = self._channels[universe] = {}
+            channels[address] = (min(max(int(value), 0), 255), owner)
+            self._dirty.add(universe)
+
+    def copy_masked(self, owner: str, layers: Mapping[int, Layer]) -> None:
+        """
+        Override channels with a masked copy of precomputed buffers.
+
+        Universes that are not waiting for a recompile are updated with one
+        masked merge instead.
+
+        :param owner: The account setting the values.
+        :param layers: ``(values, mask, addresses)`` per universe, e.g. from
+            :meth:`FixtureDefaults.home`.
+        """
+        for universe, (values, mask, addresses) in layers.items():
+            channels = self._channels.get(universe)
+            if channels is None:
+                channels = self._channels[universe] = {}
+            for address in addresses:
+                channels[address] = (values[address], owner)
+            if universe in self._dirty:
+                continue
+            compiled_values, compiled_mask = self._compiled.get(
+                universe, (_EMPTY, _EMPTY)
+            )
+            self._compiled[universe] = (
+                masked_merge(compiled_values, values, mask),
+                from_int(to_int(compiled_mask) | to_int(mask)),
+            )
+
+    def set_highlight(self, layers: Mapping[int, Layer]) -> None:
+        """
+        Replace the highlighted channels.
+
+        :param layers: ``(values, mask, addresses)`` per universe, e.g. from
+            :meth:`FixtureDefaults.highlight`. Empty turns highlight off.
+        """
+        self._highlight = {
+            universe: (values, mask) for universe, (values, mask, _) in layers.items()
+        }
+
+    @property
+    def highlighted(self) -> int:
+        """
+        The number of highlighted channels.
+
+        :rtype: int
+        """
+        return sum(mask.count(0xFF) for _, mask in self._highlight.values())
+
+    def clear(
+        self,
+        owner: str | None = None,
+        channels: Iterable[tuple[int, int]] | None = None,
+    ) -> None:
+        """
+        Release overridden channels.
+
+        :param owner: Only release channels owned by this account. ``None``
+            releases channels regardless of their owner.
+        :param channels: ``(universe, address)`` pairs to release. ``None``
+            releases every channel of ``owner``.
+        """
+        if channels is None:
+            channels = [
+                (universe, address)
+                for universe, addresses in self._channels.items()
+                for address in addresses
+            ]
+        for universe, address in channels:
+            addresses = self._channels.get(universe)
+            if addresses is None or address not in addresses:
+                continue
+            if owner is not None and addresses[address][1] != owner:
+                continue
+            del addresses[address]
+            self._dirty.add(universe)
+
+    def owner(self, universe: int, address: int) -> str | None:
+        """
+        The account owning a channel.
+
+        :param universe: The universe index.
+        :param address: Zero based channel index.
+        :return: The owner or ``None`` if the channel is not overridden.
+        :rtype: str | None
+        """
+        entry = self._channels.get(universe, {}).get(address)
+        return None if entry is None else entry[1]
+
+    def items(self) -> Iterable[tuple[int, int, int, str]]:
+        """
+        Iterate over all overrides.
+
+        :return: ``(universe, address, value, owner)`` tuples.
+        """
+        for universe, channels in self._channels.items():
+            for address, (value, owner) in channels.items():
+                yield universe, address, value, owner
+
+    def _compile(self, universe: int) -> None:
+        channels = self._channels.get(universe)
+        if not channels:
+            self._channels.pop(universe, None)
+            self._compiled.pop(universe, None)
+            return
+        values = blank()
+        mask = blank()
+        for address, (value, _) in channels.items():
+            values[address] = value
+            mask[address] = 0xFF
+        self._compiled[universe] = (bytes(values), bytes(mask))
+
+    def apply(self, frame: dict[int, bytes]) -> None:
+        """
+        Merge the overrides into a frame (output stage).
+
+        :param frame: The universe buffers produced by playback.
+        """
+        if self._dirty:
+            for universe in self._dirty:
+                self._compile(universe)
+            self._dirty.clear()
+        for layer in (self._compiled, self._highlight):
+            for universe, (values, mask) in layer.items():
+                frame[universe] = masked_merge(
+                    frame.get(universe, blank()), values, mask
+                )
+
+    def apply_event(self, event: dict, defaults: FixtureDefaults | None = None) -> None:
+        """
+        Apply a change published by the programmer service.
+
+        :param event: A ``set``, ``clear``, ``locate`` or ``highlight`` event.
+        :param defaults: The show's home and highlight buffers; ``locate``
+            and ``highlight`` events are ignored without them.
+        """
+        match event.get("op"):
+            case "set":
+                self.set_many(event["owner"], event["values"])
+            case "clear":
+                self.clear(event["owner"], event["channels"])
+            case "locate" if defaults is not None:
+                fixtures = [uuid.UUID(f) for f in event["fixtures"]]
+                self.copy_masked(event["owner"], defaults.home(fixtures))
+            case "highlight" if defaults is not None:
+                fixtures = [uuid.UUID(f) for f in event["fixtures"]]
+                self.set_highlight(defaults.highlight(fixtures))
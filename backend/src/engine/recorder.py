@@ -0,0 +1,345 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Recording of the engine's output into an append-only binary log.
+
+File layout (all integers big endian)::
+
+    header   22 bytes    magic "HYRC", version, tick rate, wall clock time
+                         the recording started at (seconds since the epoch)
+    records  15 bytes    time since the start, kind, universe, block mask,
+                         followed by the blocks named in the mask
+
+A universe is split into 32 blocks of 16 channels. A keyframe carries all
+of them, a delta only the blocks that changed since the universe's previous
+record; unchanged universes are not written at all. Every few seconds a
+sync record is followed by keyframes of every universe seen so far, so a
+player can start anywhere by jumping to the nearest sync. A recording cut
+off by a crash ends at its last complete record.
+"""
+
+import bisect
+import logging
+import math
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+from .buffers import UNIVERSE_SIZE
+
+logger = logging.getLogger("hyperion.engine.recorder")
+
+MAGIC = b"HYRC"
+VERSION = 1
+_HEADER = struct.Struct("!4sHdd")
+_RECORD = struct.Struct("!dBHI")
+BLOCK = 16
+BLOCKS = UNIVERSE_SIZE // BLOCK
+FULL_MASK = (1 << BLOCKS) - 1
+SYNC, KEYFRAME, DELTA = range(3)
+KEYFRAME_INTERVAL = 5.0
+FLUSH_INTERVAL = 0.5
+_CLOSE = object()
+
+
+@dataclass(slots=True, frozen=True)
+class RecordingInfo:
+    """
+    Describes a recording file.
+
+    :param path: Location of the file.
+    :param rate: Ticks per second of the recorded engine.
+    :param started_at: Wall clock time the recording started at, in seconds
+        since the epoch.
+    :param duration: Time of the last record in seconds.
+    :param universes: The recorded universes.
+    """
+
+    path: str
+    rate: float
+    started_at: float
+    duration: float
+    universes: tuple[int, ...]
+
+
+class Recorder:
+    """
+    Captures frames into a recording file.
+
+    :meth:`capture` only queues the frame; a background thread encodes the
+    queued frames and appends them in batches, so the tick loop never waits
+    for the disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        origin: float,
+        keyframe_interval: float = KEYFRAME_INTERVAL,
+    ):
+        """
+        Initialise the recorder. Nothing is written before :meth:`start`.
+
+        :param path: Location of the file; it is replaced.
+        :param rate: Ticks per second of the recorded engine.
+        :param origin: The engine time the recording starts at.
+        :param keyframe_interval: Seconds between two syncs.
+        """
+        self.path = path
+        self.rate = rate
+        self.origin = origin
+        self.keyframe_interval = keyframe_interval
+        self.started_at = time.time()
+        self.frames = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closing = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last: dict[int, bytes] = {}
+        self._synced = -math.inf
+        self._duration = 0.0
+        self._failed = False
+
+    def start(self) -> None:
+        """
+        Start the writer thread.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="hyperion-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def capture(self, now: float, frame: dict[int, bytes]) -> None:
+        """
+        Queue a frame for recording.
+
+        :param now: The engine time of the frame.
+        :param frame: The universe buffers. Views are copied, so the caller
+            may reuse their memory.
+        """
+        if self._failed or self._closing.is_set():
+            return
+        self._queue.put((now - self.origin, {u: bytes(v) for u, v in frame.items()}))
+        self.frames += 1
+
+    def close(self) -> RecordingInfo:
+        """
+        Write the queued frames, then stop the writer thread.
+
+        Blocks until the file is complete; call it from a thread when the
+        queue may be long.
+
+        :return: Description of the finished file.
+        :rtype: RecordingInfo
+        """
+        self._closing.set()
+        self._queue.put(_CLOSE)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return RecordingInfo(
+            self.path,
+            self.rate,
+            self.started_at,
+            self._duration,
+            tuple(sorted(self._last)),
+        )
+
+    def _run(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, self.rate, self.started_at))
+                while self._write_batch(f):
+                    self._closing.wait(FLUSH_INTERVAL)
+        except OSError as e:
+            self._failed = True
+            logger.error(f"Recording to {self.path} failed: {e}")
+
+    def _write_batch(self, f) -> bool:
+        batch = [self._queue.get()]
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        records = bytearray()
+        running = True
+        for entry in batch:
+            if entry is _CLOSE:
+                running = False
+            else:
+                self._encode(records, *entry)
+        if not running and self._last:
+            # An empty delta marks the end of a recording that ends unchanged.
+            records += _RECORD.pack(self._duration, DELTA, min(self._last), 0)
+        f.write(records)
+        f.flush()
+        return running
+
+    def _encode(self, out: bytearray, at: float, frame: dict[int, bytes]) -> None:
+        self._duration = at
+        if at - self._synced >= self.keyframe_interval:
+            self._synced = at
+            self._last.update(frame)
+            out += _RECORD.pack(at, SYNC, 0, 0)
+            for universe in sorted(self._last):
+                out += _RECORD.pack(at, KEYFRAME, universe, FULL_MASK)
+                out += self._last[universe]
+            return
+        for universe, values in frame.items():
+            previous = self._last.get(universe)
+            if previous is None:
+                out += _RECORD.pack(at, KEYFRAME, universe, FULL_MASK)
+                out += values
+            elif values != previous:
+                mask = 0
+                blocks = []
+                for block, lo in enumerate(range(0, UNIVERSE_SIZE, BLOCK)):
+                    if values[lo : lo + BLOCK] != previous[lo : lo + BLOCK]:
+                        mask |= 1 << block
+                        blocks.append(values[lo : lo + BLOCK])
+                out += _RECORD.pack(at, DELTA, universe, mask)
+                out += b"".join(blocks)
+            else:
+                continue
+            self._last[universe] = values
+
+
+class Recording:
+    """
+    A recording mapped into memory for replay.
+
+    The player moves forward through the records; going back, or starting
+    somewhere in the middle, jumps to the nearest sync before the position.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a recording and index its syncs.
+
+        :param path: Location of the file.
+        :raises ValueError: If the file is not a recording.
+        """
+        # The mapping stays valid once the file is closed.
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is not a Hyperion recording.")
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rate, started_at = _HEADER.unpack_from(self._mapping)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a Hyperion recording.")
+        self._view = memoryview(self._mapping)
+
+        self._syncs: list[float] = []
+        self._sync_offsets: list[int] = []
+        universes = set()
+        duration = 0.0
+        offset = _HEADER.size
+        while offset + _RECORD.size <= size:
+            at, kind, universe, mask = _RECORD.unpack_from(self._view, offset)
+            length = _RECORD.size + mask.bit_count() * BLOCK
+            if offset + length > size:
+                break
+            if kind == SYNC:
+                self._syncs.append(at)
+                self._sync_offsets.append(offset)
+            else:
+                universes.add(universe)
+            duration = at
+            offset += length
+        self._end = offset
+        self.info = RecordingInfo(
+            path, rate, started_at, duration, tuple(sorted(universes))
+        )
+        self._frame: dict[int, bytes] = {}
+        self._offset = _HEADER.size
+        self._position = 0.0
+
+    def seek(self, position: float) -> None:
+        """
+        Move the player to a position.
+
+        :param position: Seconds since the start of the recording.
+        """
+        index = bisect.bisect_right(self._syncs, position) - 1
+        self._frame = {}
+        if index < 0:
+            self._offset = _HEADER.size
+            self._position = 0.0
+        else:
+            self._offset = self._sync_offsets[index]
+            self._position = self._syncs[index]
+
+    def frame_at(self, position: float) -> dict[int, bytes]:
+        """
+        The universe buffers at a position.
+
+        Positions past the end return the last frame, so a finished replay
+        holds its final look.
+
+        :param position: Seconds since the start of the recording.
+        :rtype: dict[int, bytes]
+        """
+        if position < self._position:
+            self.seek(position)
+        self._position = position
+        view = self._view
+        frame = self._frame
+        offset = self._offset
+        while offset < self._end:
+            at, kind, universe, mask = _RECORD.unpack_from(view, offset)
+            if at > position:
+                break
+            offset += _RECORD.size
+            if kind == KEYFRAME:
+                frame[universe] = bytes(view[offset : offset + UNIVERSE_SIZE])
+                offset += UNIVERSE_SIZE
+            elif kind == DELTA:
+                previous = frame.get(universe, bytes(UNIVERSE_SIZE))
+                parts = []
+                end = 0
+                for block in range(BLOCKS):
+                    if mask >> block & 1:
+                        lo = block * BLOCK
+                        parts.append(previous[end:lo])
+                        parts.append(view[offset : offset + BLOCK])
+                        offset += BLOCK
+                        end = lo + BLOCK
+                parts.append(previous[end:])
+                frame[universe] = b"".join(parts)
+        self._offset = offset
+        return dict(frame)
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        """
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+        mapping = getattr(self, "_mapping", None)
+        if mapping is not None:
+            mapping.close()
@@ -0,0 +1,278 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+In-memory selection index of a show's fixtures.
+
+Every patched fixture owns one bit. The index keeps one bitset (a plain
+integer) per fixture type, manufacturer, universe, attribute and user
+group, so a selection like "all spots of one manufacturer in universe 3"
+is a couple of ANDs instead of a join over fixtures, types and channels.
+Selections combine with the usual integer operators and are turned into
+fixtures or per-universe channel masks only when a stage consumes them:
+effects select their fixtures here (the ``select`` parameter) and the
+programmer resolves its selections here.
+
+Patching, unpatching or regrouping a fixture updates the affected bitsets
+only.
+"""
+
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+
+from ..models.fixtures import AttributeType
+from .buffers import UNIVERSE_SIZE, from_int
+from .patch import Patch, PatchedFixture
+
+
+class FixtureIndex:
+    """
+    Bitset index of fixtures by type, manufacturer, universe, attribute and
+    group.
+    """
+
+    def __init__(
+        self,
+        fixtures: Iterable[PatchedFixture] = (),
+        groups: Mapping[uuid.UUID, Sequence[uuid.UUID]] | None = None,
+    ):
+        """
+        Build the index.
+
+        :param fixtures: The patched fixtures.
+        :param groups: The fixture IDs of every group in selection order.
+        """
+        self.all = 0
+        self._slots: dict[uuid.UUID, int] = {}
+        self._fixtures: list[PatchedFixture | None] = []
+        self._free: list[int] = []
+        self._types: dict[uuid.UUID, int] = {}
+        self._manufacturers: dict[uuid.UUID, int] = {}
+        self._universes: dict[int, int] = {}
+        self._attributes: dict[AttributeType, int] = {}
+        self._groups: dict[uuid.UUID, frozenset[uuid.UUID]] = {}
+        self._group_bits: dict[uuid.UUID, int] = {}
+        for fixture in fixtures:
+            self.add(fixture)
+        for group_id, members in (groups or {}).items():
+            self.set_group(group_id, members)
+
+    @classmethod
+    def from_patch(cls, patch: Patch) -> "FixtureIndex":
+        """
+        Index all fixtures and groups of a patch.
+
+        :param patch: The patch.
+        :rtype: FixtureIndex
+        """
+        return cls(patch.fixtures.values(), patch.groups)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, fixture_id: uuid.UUID) -> bool:
+        return fixture_id in self._slots
+
+    def _index(self, fixture: PatchedFixture) -> Iterable[tuple[dict, object]]:
+        yield self._types, fixture.fixture_type_id
+        if fixture.manufacturer_id is not None:
+            yield self._manufacturers, fixture.manufacturer_id
+        yield self._universes, fixture.universe
+        for attribute in fixture.channels:
+            yield self._attributes, attribute
+
+    def add(self, fixture: PatchedFixture) -> None:
+        """
+        Index a fixture, replacing an older version of it.
+
+        :param fixture: The patched fixture.
+        """
+        if fixture.id in self._slots:
+            self.remove(fixture.id)
+        if self._free:
+            slot = self._free.pop()
+            self._fixtures[slot] = fixture
+        else:
+            slot = len(self._fixtures)
+            self._fixtures.append(fixture)
+        self._slots[fixture.id] = slot
+        bit = 1 << slot
+        self.all |= bit
+        for bitsets, key in self._index(fixture):
+            bitsets[key] = bitsets.get(key, 0) | bit
+        for group_id, members in self._groups.items():
+            if fixture.id in members:
+                self._group_bits[group_id] |= bit
+
+    def remove(self, fixture_id: uuid.UUID) -> None:
+        """
+        Drop an unpatched fixture. Group memberships are kept, so the
+        fixture is selected again once it is patched again.
+
+        :param fixture_id: The fixture's primary key.
+        """
+        slot = self._slots.pop(fixture_id, None)
+        if slot is None:
+            return
+        fixture = self._fixtures[slot]
+        self._fixtures[slot] = None
+        self._free.append(slot)
+        keep = ~(1 << slot)
+        self.all &= keep
+        for bitsets, key in self._index(fixture):
+            bits = bitsets[key] & keep
+            if bits:
+                bitsets[key] = bits
+            else:
+                del bitsets[key]
+        for group_id in self._group_bits:
+            self._group_bits[group_id] &= keep
+
+    def set_group(self, group_id: uuid.UUID, fixture_ids: Sequence[uuid.UUID]) -> None:
+        """
+        Create or replace a group.
+
+        :param group_id: The group's primary key.
+        :param fixture_ids: The members in selection order.
+        """
+        self._groups[group_id] = frozenset(fixture_ids)
+        bits = 0
+        for fixture_id in fixture_ids:
+            slot = self._slots.get(fixture_id)
+            if slot is not None:
+                bits |= 1 << slot
+        self._group_bits[group_id] = bits
+
+    def remove_group(self, group_id: uuid.UUID) -> None:
+        """
+        Drop a deleted group.
+
+        :param group_id: The group's primary key.
+        """
+        self._groups.pop(group_id, None)
+        self._group_bits.pop(group_id, None)
+
+    def select(
+        self,
+        *,
+        fixture_type: uuid.UUID | None = None,
+        manufacturer: uuid.UUID | None = None,
+        universe: int | None = None,
+        attributes: Iterable[AttributeType] = (),
+        group: uuid.UUID | None = None,
+    ) -> int:
+        """
+        Select the fixtures matching every given criterion.
+
+        :param fixture_type: Only fixtures of this type.
+        :param manufacturer: Only fixtures of this manufacturer.
+        :param universe: Only fixtures in this universe.
+        :param attributes: Only fixtures having all of these attributes.
+        :param group: Only members of this group.
+        :return: The selection as a bitset.
+        :rtype: int
+        """
+        selection = self.all
+        if fixture_type is not None:
+            selection &= self._types.get(fixture_type, 0)
+        if manufacturer is not None:
+            selection &= self._manufacturers.get(manufacturer, 0)
+        if universe is not None:
+            selection &= self._universes.get(universe, 0)
+        for attribute in attributes:
+            selection &= self._attributes.get(attribute, 0)
+        if group is not None:
+            selection &= self._group_bits.get(group, 0)
+        return selection
+
+    def query(self, criteria: Mapping) -> int:
+        """
+        Select fixtures by criteria given as JSON, e.g. in effect parameters.
+
+        :param criteria: Any of ``fixture_type``, ``manufacturer`` and
+            ``group`` as UUID strings, ``universe`` and ``attributes`` as a
+            list of :class:`AttributeType` values.
+        :raises ValueError: If a criterion is malformed.
+        :return: The selection as a bitset.
+        :rtype: int
+        """
+
+        def key(name: str) -> uuid.UUID | None:
+            value = criteria.get(name)
+            return None if value is None else uuid.UUID(str(value))
+
+        universe = criteria.get("universe")
+        return self.select(
+            fixture_type=key("fixture_type"),
+            manufacturer=key("manufacturer"),
+            universe=None if universe is None else int(universe),
+            attributes=[AttributeType(a) for a in criteria.get("attributes", ())],
+            group=key("group"),
+        )
+
+    def of(self, fixture_ids: Iterable[uuid.UUID]) -> int:
+        """
+        The selection of explicitly named fixtures.
+
+        :param fixture_ids: The fixtures; unpatched ones are skipped.
+        :rtype: int
+        """
+        selection = 0
+        for fixture_id in fixture_ids:
+            slot = self._slots.get(fixture_id)
+            if slot is not None:
+                selection |= 1 << slot
+        return selection
+
+    def fixtures(self, selection: int) -> list[PatchedFixture]:
+        """
+        The fixtures of a selection, ordered by fixture ID (FID).
+
+        :param selection: The bitset.
+        :rtype: list[PatchedFixture]
+        """
+        selected = []
+        while selection:
+            low = selection & -selection
+            fixture = self._fixtures[low.bit_length() - 1]
+            if fixture is not None:
+                selected.append(fixture)
+            selection ^= low
+        selected.sort(key=lambda fixture: fixture.fid)
+        return selected
+
+    def masks(
+        self, selection: int, attributes: Iterable[AttributeType] | None = None
+    ) -> dict[int, bytes]:
+        """
+        The channel masks of a selection.
+
+        :param selection: The bitset.
+        :param attributes: Only channels of these attributes. None
+            selects every channel.
+        :return: One mask per universe with a selected channel.
+        :rtype: dict[int, bytes]
+        """
+        wanted = None if attributes is None else set(attributes)
+        masks: dict[int, int] = {}
+        for fixture in self.fixtures(selection):
+            mask = masks.get(fixture.universe, 0)
+            for attribute, channel in fixture.channels.items():
+                if wanted is None or attribute in wanted:
+                    mask |= 0xFF << 8 * (UNIVERSE_SIZE - 1 - channel.address)
+            if mask:
+                masks[fixture.universe] = mask
+        return {universe: from_int(mask) for universe, mask in masks.items()}
@@ -0,0 +1,217 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The engine's output buffer in shared memory.
+
+One process (the engine) writes, any number of processes read. Writes are
+guarded by a seqlock: the sequence counter is odd while a frame is being
+written and even when it is complete. A reader copies what it needs and
+retries if the counter moved meanwhile, so neither side ever blocks.
+
+Layout (native byte order)::
+
+    header   64 bytes    sequence (u64), slot count (u32), padding,
+                         engine time of the last frame (f64) at offset 16
+    slots    528 bytes   generation (u64), universe (u16), padding,
+                         512 channel values
+
+Each slot carries the sequence number of the frame that last changed it,
+so readers only copy universes that changed since their previous read.
+"""
+
+import struct
+from multiprocessing import shared_memory
+
+from .buffers import UNIVERSE_SIZE
+
+HEADER_SIZE = 64
+_HEADER = struct.Struct("=QI")
+_TIME = struct.Struct("=d")
+TIME_OFFSET = 16
+_SLOT = struct.Struct("=QH")
+SLOT_SIZE = 16 + UNIVERSE_SIZE
+MAX_UNIVERSES = 256
+READ_RETRIES = 1000
+_BLANK = bytes(UNIVERSE_SIZE)
+
+
+class SharedOutput:
+    """
+    Seqlock protected universe buffers in a named shared memory block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self._slots: dict[int, int] = {}
+        for slot in range(_HEADER.unpack_from(self._buf)[1]):
+            _, universe = _SLOT.unpack_from(self._buf, HEADER_SIZE + slot * SLOT_SIZE)
+            self._slots[universe] = slot
+
+    @classmethod
+    def create(cls, capacity: int = MAX_UNIVERSES) -> "SharedOutput":
+        """
+        Allocate a new, empty output block.
+
+        :param capacity: The maximum number of universes.
+        :rtype: SharedOutput
+        """
+        shm = shared_memory.SharedMemory(
+            create=True, size=HEADER_SIZE + capacity * SLOT_SIZE
+        )
+        shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedOutput":
+        """
+        Attach to an existing output block.
+
+        :param name: The name of the shared memory block.
+        :rtype: SharedOutput
+        """
+        return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+
+    @property
+    def name(self) -> str:
+        """
+        The name other processes attach with.
+
+        :rtype: str
+        """
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        """
+        The maximum number of universes.
+
+        :rtype: int
+        """
+        return (self._shm.size - HEADER_SIZE) // SLOT_SIZE
+
+    @property
+    def sequence(self) -> int:
+        """
+        The sequence number of the last completed frame.
+
+        :rtype: int
+        """
+        return _HEADER.unpack_from(self._buf)[0] & ~1
+
+    def write(self, frame: dict[int, bytes], timestamp: float = 0.0) -> int:
+        """
+        Publish a frame. Only the engine process may call this.
+
+        Universes whose contents did not change are neither copied nor get a
+        new generation. Universes published earlier that are missing from
+        the frame are blanked, so released channels go dark.
+
+        :param frame: The universe buffers.
+        :param timestamp: The engine time the frame belongs to.
+        :raises ValueError: If the frame needs more universes than fit.
+        :return: The number of universes that changed.
+        :rtype: int
+        """
+        buf = self._buf
+        sequence, count = _HEADER.unpack_from(buf)
+        changed = []
+        for universe, slot in self._slots.items():
+            if universe not in frame:
+                offset = HEADER_SIZE + slot * SLOT_SIZE + 16
+                if buf[offset : offset + UNIVERSE_SIZE] != _BLANK:
+                    changed.append((slot, universe, _BLANK))
+        for universe, values in frame.items():
+            slot = self._slots.get(universe)
+            if slot is None:
+                if count >= self.capacity:
+                    raise ValueError(
+                        f"Shared output holds at most {self.capacity} universes."
+                    )
+                slot = self._slots[universe] = count
+                count += 1
+                changed.append((slot, universe, values))
+                continue
+            offset = HEADER_SIZE + slot * SLOT_SIZE + 16
+            if buf[offset : offset + UNIVERSE_SIZE] != values:
+                changed.append((slot, universe, values))
+        if not changed:
+            return 0
+
+        _HEADER.pack_into(buf, 0, sequence + 1, count)
+        _TIME.pack_into(buf, TIME_OFFSET, timestamp)
+        generation = sequence + 2
+        for slot, universe, values in changed:
+            offset = HEADER_SIZE + slot * SLOT_SIZE
+            _SLOT.pack_into(buf, offset, generation, universe)
+            buf[offset + 16 : offset + SLOT_SIZE] = values
+        _HEADER.pack_into(buf, 0, generation, count)
+        return len(changed)
+
+    def read(self, since: int = 0) -> tuple[int, dict[int, bytes]] | None:
+        """
+        Copy the universes that changed after a sequence number.
+
+        :param since: The sequence number of the reader's previous read.
+            ``0`` returns every universe.
+        :return: The current sequence number and the changed universes, or
+            ``None`` if the writer kept the block busy for every retry.
+        :rtype: tuple[int, dict[int, bytes]] | None
+        """
+        snapshot = self.read_timed(since)
+        if snapshot is None:
+            return None
+        sequence, _, frame = snapshot
+        return sequence, frame
+
+    def read_timed(self, since: int = 0) -> tuple[int, float, dict[int, bytes]] | None:
+        """
+        Like :meth:`read`, but also return the engine time of the current
+        frame.
+
+        :param since: The sequence number of the reader's previous read.
+        :return: The current sequence number, the frame's engine time and
+            the changed universes, or ``None`` if the writer kept the block
+            busy for every retry.
+        :rtype: tuple[int, float, dict[int, bytes]] | None
+        """
+        buf = self._buf
+        for _ in range(READ_RETRIES):
+            sequence, count = _HEADER.unpack_from(buf)
+            if sequence & 1:
+                continue
+            (timestamp,) = _TIME.unpack_from(buf, TIME_OFFSET)
+            frame = {}
+            if sequence != since:
+                for slot in range(count):
+                    offset = HEADER_SIZE + slot * SLOT_SIZE
+                    generation, universe = _SLOT.unpack_from(buf, offset)
+                    if generation > since:
+                        frame[universe] = bytes(buf[offset + 16 : offset + SLOT_SIZE])
+            if _HEADER.unpack_from(buf)[0] == sequence:
+                return sequence, timestamp, frame
+        return None
+
+    def close(self) -> None:
+        """
+        Detach from the block; the creating process also frees it.
+        """
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,259 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Faster than real time playback on a simulated clock.
+
+A simulation drives a :class:`PlaybackEngine` tick by tick on a
+:class:`SimulatedClock` and replays a script of operator commands at
+their exact times. The frames are the ones the live engine renders at
+those times, so a show's frames can be recorded once as golden digests
+and every later build checked against them in seconds.
+
+Run from the ``backend`` directory::
+
+    python -m src.engine.simulation record SHOW_ID show.golden.json \\
+        --duration 7200 --script script.json
+    python -m src.engine.simulation check SHOW_ID show.golden.json
+
+A script is a JSON list of ``{"at": seconds, "command": "go",
+"args": ["main"]}`` objects; the commands are ``go``, ``goto`` and
+``set_fader`` with the arguments of the engine methods. Without a script
+the main stack gets one GO at the start.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import asdict, dataclass, field
+
+import orjson
+
+from .clock import SimulatedClock
+from .playback import PlaybackEngine
+from .programmer import ProgrammerOverlay
+
+SCRIPT_COMMANDS = frozenset({"go", "goto", "set_fader"})
+
+
+@dataclass(slots=True)
+class ScriptEvent:
+    """
+    An operator command at a point of the show.
+
+    :param at: Seconds from the start of the simulation.
+    :param command: ``go``, ``goto`` or ``set_fader``.
+    :param args: The positional arguments of the engine method.
+    """
+
+    at: float
+    command: str
+    args: list = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.command not in SCRIPT_COMMANDS:
+            raise ValueError(f"Unknown script command {self.command}.")
+
+
+def load_script(data: bytes | None) -> list[ScriptEvent]:
+    """
+    Parse a JSON script.
+
+    :param data: The script's JSON, or ``None`` for a single GO at the start.
+    :rtype: list[ScriptEvent]
+    """
+    if data is None:
+        return [ScriptEvent(0.0, "go")]
+    return [ScriptEvent(**event) for event in orjson.loads(data)]
+
+
+def frame_digest(frame: dict[int, bytes]) -> str:
+    """
+    A short digest of a frame's universes.
+
+    :param frame: The universe buffers.
+    :rtype: str
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for universe in sorted(frame):
+        digest.update(universe.to_bytes(2, "big"))
+        digest.update(frame[universe])
+    return digest.hexdigest()
+
+
+async def simulate(
+    engine: PlaybackEngine, duration: float, script: Iterable[ScriptEvent] = ()
+) -> AsyncIterator[tuple[int, dict[int, bytes]]]:
+    """
+    Render a show tick by tick, as fast as possible.
+
+    :param engine: An engine on a :class:`SimulatedClock` with the show
+        loaded.
+    :param duration: Seconds of show to render.
+    :param script: The operator commands to replay.
+    :raises TypeError: If the engine runs on a real clock.
+    :return: ``(tick, frame)`` for every tick from 0 to ``duration``.
+    """
+    clock = engine.clock
+    if not isinstance(clock, SimulatedClock):
+        raise TypeError("Simulations need an engine on a SimulatedClock.")
+    start = clock.now()
+    events = sorted(script, key=lambda event: event.at)
+    index = 0
+    for tick in range(round(duration * engine.rate) + 1):
+        at = tick / engine.rate
+        while index < len(events) and events[index].at <= at:
+            event = events[index]
+            clock.set(start + event.at)
+            result = getattr(engine, event.command)(*event.args)
+            if inspect.isawaitable(result):
+                await result
+            index += 1
+        clock.set(start + at)
+        yield tick, await engine.tick()
+        # Let prefetches run between ticks like the live loop's sleep does.
+        await asyncio.sleep(0)
+
+
+async def record(
+    engine: PlaybackEngine, duration: float, script: list[ScriptEvent]
+) -> dict:
+    """
+    Simulate a show and collect the digest of every frame.
+
+    :param engine: An engine on a :class:`SimulatedClock` with the show
+        loaded.
+    :param duration: Seconds of show to render.
+    :param script: The operator commands to replay.
+    :return: The golden record: rate, duration, script and digests.
+    :rtype: dict
+    """
+    digests = [
+        frame_digest(frame) async for _, frame in simulate(engine, duration, script)
+    ]
+    return {
+        "rate": engine.rate,
+        "duration": duration,
+        "script": [asdict(event) for event in script],
+        "digests": digests,
+    }
+
+
+async def check(engine: PlaybackEngine, golden: dict) -> int | None:
+    """
+    Replay a golden record and compare every frame.
+
+    :param engine: An engine on a :class:`SimulatedClock` with the same show
+        loaded and the record's rate.
+    :param golden: A record from :func:`record`.
+    :raises ValueError: If the engine's rate differs from the record's.
+    :return: The first tick whose frame differs, or ``None`` if all match.
+    :rtype: int | None
+    """
+    if engine.rate != golden["rate"]:
+        raise ValueError("The engine rate differs from the golden record.")
+    script = [ScriptEvent(**event) for event in golden["script"]]
+    expected = golden["digests"]
+    async for tick, frame in simulate(engine, golden["duration"], script):
+        if tick >= len(expected) or frame_digest(frame) != expected[tick]:
+            return tick
+    return None
+
+
+async def throughput(
+    engine: PlaybackEngine, duration: float, script: Iterable[ScriptEvent] = ()
+) -> float:
+    """
+    Measure how fast a show renders on a simulated clock.
+
+    :param engine: An engine on a :class:`SimulatedClock` with the show
+        loaded.
+    :param duration: Seconds of show to render.
+    :param script: The operator commands to replay.
+    :return: Simulated show seconds rendered per wall clock second.
+    :rtype: float
+    """
+    started = time.perf_counter()
+    async for _ in simulate(engine, duration, script):
+        pass
+    return duration / (time.perf_counter() - started)
+
+
+async def _load(show_id: uuid.UUID, rate: float) -> PlaybackEngine:
+    engine = PlaybackEngine(None, rate, clock=SimulatedClock())
+    await engine.load_show(show_id)
+    # Live programmer overrides are not part of the show.
+    engine.programmer = ProgrammerOverlay()
+    return engine
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _write(path: str, data: bytes) -> None:
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+async def _main(args: argparse.Namespace) -> int:
+    # File I/O runs in threads, so it never stalls the engine's event loop.
+    if args.action == "record":
+        source = await asyncio.to_thread(args.script.read) if args.script else None
+        script = load_script(source)
+        engine = await _load(args.show_id, args.rate)
+        try:
+            golden = await record(engine, args.duration, script)
+        finally:
+            await engine.stop()
+            engine.renderer.close()
+        await asyncio.to_thread(_write, args.golden, orjson.dumps(golden))
+        print(f"Recorded {len(golden['digests'])} frames to {args.golden}")
+        return 0
+
+    golden = orjson.loads(await asyncio.to_thread(_read, args.golden))
+    engine = await _load(args.show_id, golden["rate"])
+    try:
+        tick = await check(engine, golden)
+    finally:
+        await engine.stop()
+        engine.renderer.close()
+    if tick is not None:
+        print(f"Frame {tick} ({tick / golden['rate']:.3f} s) differs")
+        return 1
+    print(f"All {len(golden['digests'])} frames match")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hyperion golden frame runs")
+    parser.add_argument("action", choices=["record", "check"])
+    parser.add_argument("show_id", type=uuid.UUID)
+    parser.add_argument("golden", help="The golden record file.")
+    parser.add_argument("--script", type=argparse.FileType("rb"))
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--rate", type=float, default=40.0)
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
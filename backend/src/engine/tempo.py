@@ -0,0 +1,126 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The show-wide tempo that beat-locked effects follow.
+
+The beat position is a linear function of the engine time, so every
+kernel computes it from the tick time it already has; no effect keeps a
+timer of its own and any number of chasers stay in step.
+"""
+
+import statistics
+from collections import deque
+from dataclasses import dataclass
+
+DEFAULT_BPM = 120.0
+MIN_BPM = 20.0
+MAX_BPM = 400.0
+# Taps further apart than this start a new measurement.
+TAP_TIMEOUT = 2.0
+TAP_HISTORY = 8
+
+
+@dataclass(frozen=True, slots=True)
+class Tempo:
+    """
+    A tempo anchored at a point in time.
+
+    :param bpm: Beats per minute.
+    :param anchor: The engine time in seconds at which ``anchor_beat``
+        was reached.
+    :param anchor_beat: The beat position at ``anchor``.
+    """
+
+    bpm: float = DEFAULT_BPM
+    anchor: float = 0.0
+    anchor_beat: float = 0.0
+
+    def beats(self, now: float) -> float:
+        """
+        The beat position at a point in time.
+
+        :param now: The engine time in seconds.
+        :return: Beats since the phase was last reset; the fraction is the
+            phase within the beat.
+        :rtype: float
+        """
+        return self.anchor_beat + (now - self.anchor) * self.bpm / 60.0
+
+
+class TempoClock:
+    """
+    The master tempo of a show, set by BPM or by tapping.
+
+    :attr:`current` is replaced, never mutated, so render threads can read
+    it without a lock.
+    """
+
+    def __init__(self, bpm: float = DEFAULT_BPM):
+        """
+        Initialise the clock with its phase at 0 at time 0.
+
+        :param bpm: The initial tempo.
+        """
+        self.current = Tempo(_clamp(bpm))
+        self._taps: deque[float] = deque(maxlen=TAP_HISTORY)
+
+    def set_bpm(self, bpm: float, now: float) -> Tempo:
+        """
+        Change the tempo without a jump in the beat position.
+
+        :param bpm: Beats per minute, clamped to [:data:`MIN_BPM`,
+            :data:`MAX_BPM`].
+        :param now: The engine time in seconds.
+        :rtype: Tempo
+        """
+        self.current = Tempo(_clamp(bpm), now, self.current.beats(now))
+        return self.current
+
+    def tap(self, now: float) -> Tempo:
+        """
+        Register a tap on the beat.
+
+        From the second tap on, the tempo follows the mean interval of the
+        recent taps and every tap lands exactly on a beat.
+
+        :param now: The engine time of the tap in seconds.
+        :rtype: Tempo
+        """
+        if self._taps and now - self._taps[-1] > TAP_TIMEOUT:
+            self._taps.clear()
+        self._taps.append(now)
+        if len(self._taps) < 2:
+            return self.current
+        taps = list(self._taps)
+        interval = statistics.fmean(b - a for a, b in zip(taps, taps[1:]))
+        bpm = _clamp(60.0 / interval) if interval > 0 else self.current.bpm
+        self.current = Tempo(bpm, now, float(round(self.current.beats(now))))
+        return self.current
+
+    def reset(self, now: float) -> Tempo:
+        """
+        Restart the beat count, making ``now`` the first beat.
+
+        :param now: The engine time in seconds.
+        :rtype: Tempo
+        """
+        self.current = Tempo(self.current.bpm, now, 0.0)
+        return self.current
+
+
+def _clamp(bpm: float) -> float:
+    return min(max(float(bpm), MIN_BPM), MAX_BPM)
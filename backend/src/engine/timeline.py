@@ -0,0 +1,285 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Offline rendering of a whole cue list into a flat binary timeline.
+
+File layout (all integers big endian)::
+
+    header   512 bytes   magic "HYTL", version, universe count, rate,
+                         tick count, followed by the universe IDs
+    records  512 bytes   one per tick and universe, ordered by tick, then
+                         by the universe order of the header
+
+Every record sits at a fixed offset, so a player maps the file and hands
+out ``memoryview`` slices of the mapping without copying or parsing.
+"""
+
+import bisect
+import math
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .baker import BakedCue
+from .buffers import UNIVERSE_SIZE
+from .fade import CueFade
+from .tempo import Tempo
+
+MAGIC = b"HYTL"
+VERSION = 1
+HEADER_SIZE = UNIVERSE_SIZE
+_HEADER = struct.Struct("!4sHHdI")
+MAX_UNIVERSES = (HEADER_SIZE - _HEADER.size) // 2
+
+
+@dataclass(slots=True, frozen=True)
+class TimelineInfo:
+    """
+    Describes a rendered timeline file.
+
+    :param path: Location of the file.
+    :param rate: Ticks per second.
+    :param tick_count: Number of ticks in the file.
+    :param universes: The universes in record order.
+    """
+
+    path: str
+    rate: float
+    tick_count: int
+    universes: tuple[int, ...]
+
+    @property
+    def duration(self) -> float:
+        """
+        Length of the timeline in seconds.
+
+        :rtype: float
+        """
+        return self.tick_count / self.rate
+
+
+def schedule(
+    cues: list[BakedCue], tempo: Tempo | None = None
+) -> tuple[list[CueFade], float]:
+    """
+    Lay out a cue list on a timeline.
+
+    Every cue follows its predecessor once the predecessor's fades,
+    including delays and split timing, and its hold have elapsed. The
+    source of each fade is the predecessor's final frame, so segments do
+    not depend on each other and can be rendered in any order.
+
+    :param cues: The baked cues in playback order, with tracking resolved.
+    :param tempo: The tempo of beat-locked effects, anchored at the start
+        of the timeline.
+    :return: The fades in order and the total duration in seconds.
+    :rtype: tuple[list[CueFade], float]
+    """
+    fades: list[CueFade] = []
+    start = 0.0
+    output: dict[int, bytes] = {}
+    for cue in cues:
+        if fades:
+            output = fades[-1].render(start, tempo=tempo)
+        fades.append(CueFade(cue, output, start))
+        start += cue.duration + cue.hold
+    return fades, start
+
+
+def _render_chunk(
+    path: str,
+    universes: tuple[int, ...],
+    fades: list[CueFade],
+    rate: float,
+    first: int,
+    last: int,
+    tempo: Tempo | None = None,
+) -> int:
+    starts = [fade.started_at for fade in fades]
+    stride = len(universes) * UNIVERSE_SIZE
+    empty = bytes(UNIVERSE_SIZE)
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mapping:
+        for tick in range(first, last):
+            now = tick / rate
+            fade = fades[max(bisect.bisect_right(starts, now) - 1, 0)]
+            frame = fade.render(now, tempo=tempo)
+            offset = HEADER_SIZE + tick * stride
+            for universe in universes:
+                mapping[offset : offset + UNIVERSE_SIZE] = frame.get(universe, empty)
+                offset += UNIVERSE_SIZE
+        mapping.flush()
+    return last - first
+
+
+def render_timeline(
+    path: str,
+    cues: list[BakedCue],
+    rate: float = 40.0,
+    workers: int | None = None,
+    tempo: Tempo | None = None,
+) -> TimelineInfo:
+    """
+    Render a cue list into a timeline file using several processes.
+
+    The tick range is split into chunks; every worker maps the file and
+    writes its chunk in place. The file is rendered next to its destination
+    and moved into place when complete, so a player that still maps the old
+    file is not affected.
+
+    :param path: Destination of the file; it is replaced.
+    :param cues: The baked cues in playback order, with tracking resolved.
+    :param rate: Ticks per second.
+    :param workers: Number of processes. Defaults to the CPU count.
+    :param tempo: The tempo of beat-locked effects, anchored at the start
+        of the timeline.
+    :raises ValueError: If the show uses more universes than the header holds.
+    :return: Description of the rendered file.
+    :rtype: TimelineInfo
+    """
+    fades, duration = schedule(cues, tempo)
+    universes = tuple(sorted(set().union(*(fade.universes for fade in fades))))
+    if len(universes) > MAX_UNIVERSES:
+        raise ValueError(f"Timelines support at most {MAX_UNIVERSES} universes.")
+    tick_count = math.ceil(duration * rate)
+
+    header = bytearray(HEADER_SIZE)
+    _HEADER.pack_into(header, 0, MAGIC, VERSION, len(universes), rate, tick_count)
+    struct.pack_into(f"!{len(universes)}H", header, _HEADER.size, *universes)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        f.write(header)
+        f.truncate(HEADER_SIZE + tick_count * len(universes) * UNIVERSE_SIZE)
+
+    if tick_count and universes:
+        _render_parallel(partial, universes, fades, rate, tick_count, workers, tempo)
+    os.replace(partial, path)
+    return TimelineInfo(path, rate, tick_count, universes)
+
+
+def _render_parallel(
+    path: str,
+    universes: tuple[int, ...],
+    fades: list[CueFade],
+    rate: float,
+    tick_count: int,
+    workers: int | None,
+    tempo: Tempo | None = None,
+) -> None:
+    workers = workers or os.cpu_count() or 1
+    chunk = max(math.ceil(tick_count / (workers * 4)), 1)
+    starts = [fade.started_at for fade in fades]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = []
+        for first in range(0, tick_count, chunk):
+            last = min(first + chunk, tick_count)
+            # Only ship the fades that overlap the chunk to the worker.
+            lo = max(bisect.bisect_right(starts, first / rate) - 1, 0)
+            hi = bisect.bisect_right(starts, (last - 1) / rate)
+            jobs.append(
+                pool.submit(
+                    _render_chunk,
+                    path,
+                    universes,
+                    fades[lo:hi],
+                    rate,
+                    first,
+                    last,
+                    tempo,
+                )
+            )
+        for job in jobs:
+            job.result()
+
+
+class Timeline:
+    """
+    A rendered timeline mapped into memory for playback.
+
+    :meth:`frame` returns ``memoryview`` slices of the mapping, so streaming
+    a timeline never copies or computes frames.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a timeline file.
+
+        :param path: Location of the file.
+        :raises ValueError: If the file is not a timeline.
+        """
+        with open(path, "rb") as file:
+            # The mapping keeps its own handle, so the file can be closed.
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapping) < HEADER_SIZE:
+            self.close()
+            raise ValueError(f"{path} is not a Hyperion timeline.")
+        magic, version, count, rate, tick_count = _HEADER.unpack_from(self._mapping)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a Hyperion timeline.")
+        universes = struct.unpack_from(f"!{count}H", self._mapping, _HEADER.size)
+        self.info = TimelineInfo(path, rate, tick_count, universes)
+        self._view = memoryview(self._mapping)
+
+    def frame(self, tick: int) -> dict[int, memoryview]:
+        """
+        The universe buffers of a tick.
+
+        Ticks past the end return the last frame, so a finished timeline
+        holds its final look.
+
+        :param tick: The tick index.
+        :return: Read-only views into the mapping, keyed by universe.
+        :rtype: dict[int, memoryview]
+        """
+        info = self.info
+        tick = min(max(tick, 0), info.tick_count - 1)
+        offset = HEADER_SIZE + tick * len(info.universes) * UNIVERSE_SIZE
+        frame = {}
+        for universe in info.universes:
+            frame[universe] = self._view[offset : offset + UNIVERSE_SIZE]
+            offset += UNIVERSE_SIZE
+        return frame
+
+    def frame_at(self, elapsed: float) -> dict[int, memoryview]:
+        """
+        The universe buffers at a time since the timeline started.
+
+        :param elapsed: Seconds since the start.
+        :rtype: dict[int, memoryview]
+        """
+        if self.info.tick_count == 0:
+            return {}
+        return self.frame(int(elapsed * self.info.rate))
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+
+        Frames handed out earlier stay valid; if any of them is still
+        referenced, the mapping is released once the last one is dropped.
+        """
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+        try:
+            self._mapping.close()
+        except BufferError:
+            pass
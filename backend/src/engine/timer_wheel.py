@@ -0,0 +1,206 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A hierarchical timer wheel counting engine ticks.
+
+Follows and hold timers are due on a tick, not at a wall clock time, so
+they are kept in a wheel the tick loop advances instead of in one
+``asyncio.sleep`` task each. Timers never drift against the rendered
+frames and a thousand of them cost no more per tick than one.
+
+The wheel has ``levels`` rings of ``2 ** bits`` slots. A timer is placed
+on the lowest level whose range reaches its deadline, in the slot of the
+deadline's digit on that level. When the lower digits of the current tick
+roll over, the current slot of the level above is emptied and its timers
+move down. Scheduling and cancelling are O(1); every timer is moved at
+most ``levels - 1`` times before it expires.
+"""
+
+import itertools
+from collections.abc import Callable
+
+
+class Timer:
+    """
+    A scheduled callback. Returned by :meth:`TimerWheel.call_at`.
+
+    :ivar deadline: The tick the timer expires on.
+    :ivar callback: The function to call.
+    :ivar args: Its positional arguments.
+    """
+
+    __slots__ = ("deadline", "callback", "args", "_order", "_wheel", "_bucket")
+
+    def __init__(
+        self,
+        wheel: "TimerWheel",
+        deadline: int,
+        callback: Callable,
+        args: tuple,
+        order: int,
+    ):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self._order = order
+        self._wheel = wheel
+        self._bucket: dict | None = None
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the timer is still waiting to expire.
+
+        :rtype: bool
+        """
+        return self._bucket is not None
+
+    def cancel(self) -> None:
+        """
+        Cancel the timer. Cancelling an expired timer does nothing.
+        """
+        if self._bucket is not None:
+            del self._bucket[self]
+            self._bucket = None
+            self._wheel._count -= 1
+
+
+class TimerWheel:
+    """
+    Timers keyed by tick number.
+    """
+
+    def __init__(self, bits: int = 8, levels: int = 4, now: int = 0):
+        """
+        Initialise an empty wheel.
+
+        :param bits: log2 of the slots per level.
+        :param levels: Number of levels. With the defaults the wheel reaches
+            ``2 ** 32`` ticks ahead, over three years at 40 Hz; timers
+            further out are parked on the top level until they come within
+            reach.
+        :param now: The current tick.
+        """
+        self.bits = bits
+        self.levels = levels
+        self.now = now
+        self._mask = (1 << bits) - 1
+        self._wheel: list[list[dict[Timer, None]]] = [
+            [{} for _ in range(1 << bits)] for _ in range(levels)
+        ]
+        self._due: dict[Timer, None] = {}
+        self._order = itertools.count()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _place(self, timer: Timer) -> None:
+        if timer.deadline <= self.now:
+            bucket = self._due
+        else:
+            distance = timer.deadline ^ self.now
+            level = min((distance.bit_length() - 1) // self.bits, self.levels - 1)
+            slot = (timer.deadline >> (level * self.bits)) & self._mask
+            bucket = self._wheel[level][slot]
+        bucket[timer] = None
+        timer._bucket = bucket
+
+    def call_at(self, deadline: int, callback: Callable, *args) -> Timer:
+        """
+        Schedule a callback for a tick.
+
+        :param deadline: The tick to expire on. Ticks that already passed
+            expire on the next :meth:`advance`.
+        :param callback: The function the caller of :meth:`advance` calls.
+        :param args: Its positional arguments.
+        :rtype: Timer
+        """
+        timer = Timer(self, deadline, callback, args, next(self._order))
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def call_later(self, ticks: int, callback: Callable, *args) -> Timer:
+        """
+        Schedule a callback a number of ticks from now.
+
+        :param ticks: Ticks from the current tick.
+        :param callback: The function the caller of :meth:`advance` calls.
+        :param args: Its positional arguments.
+        :rtype: Timer
+        """
+        return self.call_at(self.now + ticks, callback, *args)
+
+    def _cascade(self, level: int) -> None:
+        slot = (self.now >> (level * self.bits)) & self._mask
+        bucket = self._wheel[level][slot]
+        if not bucket:
+            return
+        self._wheel[level][slot] = {}
+        for timer in bucket:
+            self._place(timer)
+
+    def advance(self, tick: int) -> list[Timer]:
+        """
+        Move the wheel forward to a tick and collect the expired timers.
+
+        The wheel does not call the timers itself, so an async caller can
+        await coroutine callbacks.
+
+        :param tick: The new current tick. Going backwards does nothing.
+        :return: The expired timers ordered by deadline, then by scheduling
+            order.
+        :rtype: list[Timer]
+        """
+        expired = list(self._due)
+        self._due.clear()
+        while self.now < tick:
+            if len(expired) == self._count:
+                # Nothing left in the wheel; skip the empty ticks.
+                self.now = tick
+                break
+            self.now += 1
+            # Empty the upper slots that just came into reach, top down, so
+            # timers can fall through several levels on one tick.
+            for level in range(self.levels - 1, 0, -1):
+                if self.now & ((1 << (level * self.bits)) - 1) == 0:
+                    self._cascade(level)
+            slot = self.now & self._mask
+            expired.extend(self._wheel[0][slot])
+            self._wheel[0][slot] = {}
+            expired.extend(self._due)
+            self._due.clear()
+        for timer in expired:
+            timer._bucket = None
+        self._count -= len(expired)
+        expired.sort(key=lambda timer: (timer.deadline, timer._order))
+        return expired
+
+    def clear(self) -> None:
+        """
+        Cancel every timer.
+        """
+        for level in self._wheel:
+            for bucket in level:
+                for timer in bucket:
+                    timer._bucket = None
+                bucket.clear()
+        for timer in self._due:
+            timer._bucket = None
+        self._due.clear()
+        self._count = 0
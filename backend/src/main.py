@@ -25,10 +25,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from .core import settings
 from .core.redis_db import redis_manager
 from .core.startup import startup
+from .engine.pool import playback_engine
 from .routers.accounts import account_router
 from .routers.dmx import dmx_router
 from .routers.fixtures import fixture_router
 from .routers.manufacturer import manufacturer_router
+from .routers.palettes import palette_router
+from .routers.playback import playback_router
+from .routers.programmer import programmer_router
 from .routers.show import show_router
 from .routers.startup_router import startup_router
 from .mcp_server import mcp
@@ -61,6 +65,7 @@ async def lifespan(app: FastAPI):
     
     yield
 
+    await playback_engine.stop()
     await redis_manager.close()
 
 
@@ -83,6 +88,9 @@ app.include_router(manufacturer_router)
 app.include_router(show_router)
 app.include_router(fixture_router)
 app.include_router(startup_router)
+app.include_router(playback_router)
+app.include_router(programmer_router)
+app.include_router(palette_router)
 
 
 @app.get("/mcp/sse", tags=["MCP"])
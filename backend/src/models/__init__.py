@@ -15,19 +15,36 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from ..core.database import Base
-from .dmx.cues import Cue
+from .dmx.cues import Cue, CueTiming
 from .dmx.effects import CueEffect, EffectTemplate
-from .dmx.scenes import Scene
-from .fixtures import Fixture, FixtureChannel, FixtureType, Manufacturer
+from .dmx.palettes import Palette, PaletteValue, ScenePalette
+from .dmx.scenes import Scene, SceneFixtureColor
+from .fixtures import (
+    Fixture,
+    FixtureChannel,
+    FixtureGroup,
+    FixtureGroupMember,
+    FixtureType,
+    Manufacturer,
+    PixelMap,
+)
 
 __all__ = [
     "Base",
     "Cue",
     "CueEffect",
+    "CueTiming",
     "EffectTemplate",
     "Fixture",
     "FixtureChannel",
+    "FixtureGroup",
+    "FixtureGroupMember",
     "FixtureType",
     "Manufacturer",
+    "Palette",
+    "PaletteValue",
+    "PixelMap",
     "Scene",
+    "SceneFixtureColor",
+    "ScenePalette",
 ]
@@ -17,10 +17,22 @@
 import enum
 import uuid
 
-from sqlalchemy import UUID, Column, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    UUID,
+    Column,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from ...core.database import Base
+from ..fixtures import AttributeGroup
+
+MAIN_STACK = "main"
 
 
 class TriggerType(enum.Enum):
@@ -83,16 +95,33 @@ class Cue(Base):
     :type show_id: uuid.UUID
     :param scene_id: Foreign key linking to the visual scene to be triggered.
     :type scene_id: uuid.UUID
-    :param number: The numerical order of the cue within the show's sequence.
+    :param stack: The cue stack (playback) the cue belongs to. A show runs
+        its main cue list and any number of busking stacks at once. Defaults
+        to ``"main"``.
+    :type stack: str
+    :param number: The numerical order of the cue within its stack.
     :type number: int
     :param label: A human-readable description or name for the cue.
     :type label: str
     :param hold: The duration in seconds to maintain the current state
         before the next cue is eligible for triggering. Defaults to 2.0.
     :type hold: float
+    :param fade: The duration in seconds of the crossfade into this cue.
+        Defaults to 0 (snap).
+    :type fade: float
+    :param delay: Seconds between the GO and the start of the crossfade.
+        Defaults to 0.
+    :type delay: float
     :param easing: The mathematical profile used to transition values (e.g.
         Linear, Ease-In, Ease-Out).
     :type easing: EasingProfile
+    :param trigger: Whether the next cue of the stack waits for a GO or
+        follows this one automatically after its fade and hold. Defaults to
+        manual.
+    :type trigger: TriggerType
+    :param timings: Fade and delay times of single attribute groups, which
+        override the cue's ``fade`` and ``delay``.
+    :type timings: list[CueTiming]
     """
 
     __tablename__ = "cues"
@@ -102,12 +131,52 @@ class Cue(Base):
 
     scene_id = Column(UUID, ForeignKey("scenes.id"))
 
+    stack = Column(String(32), default=MAIN_STACK, nullable=False, index=True)
     number = Column(Integer, index=True)
     label = Column(String(64))
     hold = Column(Float, default=2, comment="Time to wait until next cue is loaded.")
+    fade = Column(Float, default=0, comment="Crossfade duration into this cue.")
+    delay = Column(Float, default=0, comment="Wait between GO and crossfade.")
 
     easing = Column(Enum(EasingProfile), default=EasingProfile.LINEAR)
+    trigger = Column(Enum(TriggerType), default=TriggerType.MANUAL)
 
     scene = relationship("Scene", back_populates="cues")
     show = relationship("Show", back_populates="cues")
     effects = relationship("CueEffect", backref="cue", cascade="all, delete-orphan")
+    timings = relationship(
+        "CueTiming", back_populates="cue", cascade="all, delete-orphan"
+    )
+
+
+class CueTiming(Base):
+    """
+    Split timing of one attribute group within a cue.
+
+    Typical uses are a colour change that completes before the intensity
+    comes up, or moving lights that only start to move once they are dark.
+
+    :param id: Unique identifier, using UUID v7.
+    :type id: uuid.UUID
+    :param cue_id: Reference to the parent :class:`Cue`.
+    :type cue_id: uuid.UUID
+    :param group: The attribute group the timing applies to.
+    :type group: AttributeGroup
+    :param fade: Crossfade duration of the group in seconds. ``None`` uses
+        the cue's fade.
+    :type fade: float | None
+    :param delay: Seconds between the GO and the start of the group's
+        crossfade. ``None`` uses the cue's delay.
+    :type delay: float | None
+    """
+
+    __tablename__ = "cue_timings"
+    __table_args__ = (UniqueConstraint("cue_id", "group"),)
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid7)
+    cue_id = Column(UUID, ForeignKey("cues.id", ondelete="CASCADE"), nullable=False)
+    group = Column(Enum(AttributeGroup), nullable=False)
+    fade = Column(Float, nullable=True)
+    delay = Column(Float, nullable=True)
+
+    cue = relationship("Cue", back_populates="timings")
@@ -40,11 +40,21 @@ class FxTypes(enum.Enum):
     :cvar SPARKLE: A stochastic effect that triggers brief, high-intensity
         flashes at random intervals across the fixture selection.
         Simulates a shimmering or 'glitter' aesthetic.
+    :cvar AUDIO: An audio-reactive effect that follows the loudness of the
+        live audio input or of one of its frequency bands.
+    :cvar COLOR_CYCLE: Blends the selection through the hue circle or a
+        list of colours, converted to the colour channels of every fixture
+        type.
+    :cvar PIXEL_MAP: Plays an image sequence or a generated pattern on a
+        :class:`PixelMap`.
     """
 
     SINE = "sine"
     CHASER = "chaser"
     SPARKLE = "sparkle"
+    AUDIO = "audio"
+    PIXEL_MAP = "pixel_map"
+    COLOR_CYCLE = "color_cycle"
 
 
 class EffectTemplate(Base):
@@ -0,0 +1,161 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from sqlalchemy import (
+    UUID,
+    Column,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+
+from ...core.database import Base
+from ..fixtures import AttributeGroup, AttributeType
+from .scenes import ColorSpace
+
+
+class Palette(Base):
+    """
+    Represent a named look for one attribute group, e.g. "stage-left blue".
+
+    Scenes reference palettes through :class:`ScenePalette` instead of
+    storing the values themselves, so editing a palette changes every scene
+    that uses it. Only attributes of the palette's group are applied.
+
+    A palette holds values shared by all fixtures, values for single
+    fixtures (which win over the shared ones) and, for colour palettes, an
+    optional abstract colour converted to each fixture's colour channels.
+
+    :param id: Unique identifier, utilising UUID v7.
+    :type id: uuid.UUID
+    :param show_id: Foreign key linking the palette to its :class:`Show`.
+    :type show_id: uuid.UUID
+    :param number: The palette number within its group, used on the desk.
+    :type number: int
+    :param name: A human-readable name.
+    :type name: str
+    :param group: The attribute group the palette controls.
+    :type group: AttributeGroup
+    :param space: The colour space of ``a``, ``b`` and ``c``; ``None`` if the
+        palette has no abstract colour.
+    :type space: ColorSpace
+    :param values: The palette's channel values.
+    :type values: list[PaletteValue]
+    """
+
+    __tablename__ = "palettes"
+    __table_args__ = (UniqueConstraint("show_id", "group", "number"),)
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid7)
+    show_id = Column(
+        UUID(as_uuid=True), ForeignKey("shows.id", ondelete="CASCADE"), nullable=False
+    )
+    number = Column(Integer, nullable=False)
+    name = Column(String(64), nullable=True)
+    group = Column(Enum(AttributeGroup), nullable=False)
+
+    space = Column(Enum(ColorSpace), nullable=True)
+    a = Column(Float, nullable=True)
+    b = Column(Float, nullable=True)
+    c = Column(Float, nullable=True)
+
+    values = relationship(
+        "PaletteValue",
+        back_populates="palette",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+
+class PaletteValue(Base):
+    """
+    Represent one attribute value of a palette.
+
+    :param id: Unique identifier, utilising UUID v7.
+    :type id: uuid.UUID
+    :param palette_id: Reference to the :class:`Palette`.
+    :type palette_id: uuid.UUID
+    :param fixture_id: The fixture the value is for; ``None`` applies it to
+        every fixture that references the palette.
+    :type fixture_id: uuid.UUID
+    :param attribute: The attribute being set.
+    :type attribute: AttributeType
+    :param value: The DMX value.
+    :type value: int
+    """
+
+    __tablename__ = "palette_values"
+    __table_args__ = (UniqueConstraint("palette_id", "fixture_id", "attribute"),)
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid7)
+    palette_id = Column(
+        UUID,
+        ForeignKey("palettes.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    fixture_id = Column(
+        UUID, ForeignKey("fixtures.id", ondelete="CASCADE"), nullable=True
+    )
+    attribute = Column(Enum(AttributeType), nullable=False)
+    value = Column(Integer, nullable=False)
+
+    palette = relationship("Palette", back_populates="values")
+
+
+class ScenePalette(Base):
+    """
+    Represent a fixture in a scene taking its values from a palette.
+
+    Literal values of the same fixture in the scene take precedence.
+
+    :param id: Unique identifier, utilising UUID v7.
+    :type id: uuid.UUID
+    :param scene_id: Reference to the :class:`Scene`.
+    :type scene_id: uuid.UUID
+    :param fixture_id: Reference to the :class:`Fixture`.
+    :type fixture_id: uuid.UUID
+    :param palette_id: Reference to the :class:`Palette`.
+    :type palette_id: uuid.UUID
+    """
+
+    __tablename__ = "scene_palettes"
+    __table_args__ = (UniqueConstraint("scene_id", "fixture_id", "palette_id"),)
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid7)
+    scene_id = Column(
+        UUID,
+        ForeignKey("scenes.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    fixture_id = Column(
+        UUID, ForeignKey("fixtures.id", ondelete="CASCADE"), nullable=False
+    )
+    palette_id = Column(
+        UUID,
+        ForeignKey("palettes.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    scene = relationship("Scene", back_populates="palette_references")
@@ -14,15 +14,39 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import enum
 import uuid
 
-from sqlalchemy import UUID, Column, Enum, ForeignKey, Integer, String
+from sqlalchemy import (
+    UUID,
+    Column,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from ...core.database import Base
 from ..fixtures import AttributeType
 
 
+class ColorSpace(str, enum.Enum):
+    """
+    The colour spaces scenes and effects describe colours in.
+
+    :cvar RGB: Red, green and blue in [0, 1].
+    :cvar HSV: Hue in degrees, saturation and value in [0, 1].
+    :cvar XY: CIE 1931 chromaticity x and y, plus brightness in [0, 1].
+    """
+
+    RGB = "rgb"
+    HSV = "hsv"
+    XY = "xy"
+
+
 class Scene(Base):
     """
     Represent a static lighting snapshot or 'look' within the system.
@@ -54,6 +78,11 @@ class Scene(Base):
         (DMX data) that constitute this scene. Utilises 'selectin'
         loading for optimised database performance.
     :type fixture_associations: list[SceneFixtureValue]
+    :param fixture_colors: Colours of fixtures, independent of the colour
+        channels each fixture type has.
+    :type fixture_colors: list[SceneFixtureColor]
+    :param palette_references: Fixtures taking their values from palettes.
+    :type palette_references: list[ScenePalette]
     """
 
     __tablename__ = "scenes"
@@ -72,6 +101,18 @@ class Scene(Base):
         cascade="all, delete-orphan",
         lazy="selectin",
     )
+    fixture_colors = relationship(
+        "SceneFixtureColor",
+        back_populates="scene",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+    palette_references = relationship(
+        "ScenePalette",
+        back_populates="scene",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
 
 
 class SceneFixtureValue(Base):
@@ -132,3 +173,51 @@ class SceneFixtureValue(Base):
     scene = relationship("Scene", back_populates="fixture_associations")
 
     fixture = relationship("Fixture", lazy="joined")
+
+
+class SceneFixtureColor(Base):
+    """
+    Represent the colour of a fixture within a scene.
+
+    The colour is stored abstractly and converted to the fixture's own
+    colour channels (RGB, RGBW, white or a colour wheel) when the scene is
+    baked. Values of the same fixture in :class:`SceneFixtureValue` take
+    precedence over the converted ones.
+
+    :param id: Unique identifier, utilising UUID v7.
+    :type id: uuid.UUID
+    :param scene_id: Reference to the :class:`Scene` that contains the colour.
+    :type scene_id: uuid.UUID
+    :param fixture_id: Reference to the :class:`Fixture` being coloured.
+    :type fixture_id: uuid.UUID
+    :param space: The colour space of the components.
+    :type space: ColorSpace
+    :param a: Red, hue in degrees or CIE x.
+    :type a: float
+    :param b: Green, saturation or CIE y.
+    :type b: float
+    :param c: Blue, value or brightness.
+    :type c: float
+    """
+
+    __tablename__ = "scene_fixture_colors"
+    __table_args__ = (UniqueConstraint("scene_id", "fixture_id"),)
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid7)
+    scene_id = Column(
+        UUID,
+        ForeignKey("scenes.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    fixture_id = Column(
+        UUID,
+        ForeignKey("fixtures.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    space = Column(Enum(ColorSpace), default=ColorSpace.RGB, nullable=False)
+    a = Column(Float, nullable=False)
+    b = Column(Float, nullable=False)
+    c = Column(Float, nullable=False)
+
+    scene = relationship("Scene", back_populates="fixture_colors")
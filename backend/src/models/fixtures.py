@@ -10,6 +10,7 @@ import enum
 import uuid
 
 from sqlalchemy import (
+    JSON,
     Boolean,
     Column,
     Enum,
@@ -69,6 +70,69 @@ class AttributeType(str, enum.Enum):
     UNKNOWN = "unknown"
 
 
+class AttributeGroup(str, enum.Enum):
+    """
+    Groups of attributes that share their timing within a cue.
+
+    :param INTENSITY: Dimmer, strobe and shutter.
+    :param POSITION: Pan and tilt.
+    :param COLOR: Colour mixing and colour wheel.
+    :param BEAM: Everything else.
+    """
+
+    INTENSITY = "intensity"
+    POSITION = "position"
+    COLOR = "color"
+    BEAM = "beam"
+
+    @property
+    def attributes(self) -> frozenset[AttributeType]:
+        """
+        The attributes of the group.
+
+        :rtype: frozenset[AttributeType]
+        """
+        return frozenset(
+            attribute for attribute, group in ATTRIBUTE_GROUPS.items() if group is self
+        )
+
+
+ATTRIBUTE_GROUPS = {
+    AttributeType.DIMMER: AttributeGroup.INTENSITY,
+    AttributeType.STROBE: AttributeGroup.INTENSITY,
+    AttributeType.SHUTTER: AttributeGroup.INTENSITY,
+    AttributeType.PAN: AttributeGroup.POSITION,
+    AttributeType.PAN_FINE: AttributeGroup.POSITION,
+    AttributeType.TILT: AttributeGroup.POSITION,
+    AttributeType.TILT_FINE: AttributeGroup.POSITION,
+    AttributeType.COLOR_RED: AttributeGroup.COLOR,
+    AttributeType.COLOR_GREEN: AttributeGroup.COLOR,
+    AttributeType.COLOR_BLUE: AttributeGroup.COLOR,
+    AttributeType.COLOR_WHITE: AttributeGroup.COLOR,
+    AttributeType.COLOR_WHEEL: AttributeGroup.COLOR,
+    AttributeType.FOG: AttributeGroup.BEAM,
+    AttributeType.FAN: AttributeGroup.BEAM,
+    AttributeType.SPEED: AttributeGroup.BEAM,
+    AttributeType.UNKNOWN: AttributeGroup.BEAM,
+}
+
+
+class DimmerCurve(str, enum.Enum):
+    """
+    Response curves that map a channel's value to its output.
+
+    :param LINEAR: Output equals input.
+    :param SQUARE: Square law; fine control at the low end.
+    :param S_CURVE: Slow at both ends, fast in the middle.
+    :param CUSTOM: Linear interpolation between user defined points.
+    """
+
+    LINEAR = "linear"
+    SQUARE = "square"
+    S_CURVE = "s_curve"
+    CUSTOM = "custom"
+
+
 class Manufacturer(Base):
     """
     Represents a manufacturer of lighting fixtures.
@@ -100,6 +164,8 @@ class FixtureType(Base):
     :param manufacturer_id: Foreign key linking to the manufacturer.
     :param model: The model name of the fixture.
     :param mode_name: The specific DMX mode name.
+    :param color_wheel: The slots of the colour wheel, if any, as
+        ``{"value": dmx, "color": [r, g, b]}`` with components in [0, 255].
     """
 
     __tablename__ = "fixture_types"
@@ -109,6 +175,7 @@ class FixtureType(Base):
 
     model = Column(String(100), nullable=False)
     mode_name = Column(String(50), default="Standard")
+    color_wheel = Column(JSON, default=list)
 
     manufacturer = relationship(
         "Manufacturer", back_populates="fixture_types", lazy="joined"
@@ -143,6 +210,8 @@ class FixtureChannel(Base):
     :param default_value: Standard DMX value.
     :param highlight_value: Value used for the highlight function.
     :param invert_default: Whether the default logic is inverted.
+    :param curve: The response curve applied in the output stage.
+    :param curve_points: CUSTOM only: ``[input, output]`` pairs in [0, 255].
     """
 
     __tablename__ = "fixture_channels"
@@ -157,6 +226,8 @@ class FixtureChannel(Base):
     default_value = Column(Integer, default=0)
     highlight_value = Column(Integer, default=255)
     invert_default = Column(Boolean, default=False)
+    curve = Column(Enum(DimmerCurve), default=DimmerCurve.LINEAR)
+    curve_points = Column(JSON, nullable=True)
 
     fixture_type = relationship("FixtureType", back_populates="channels")
 
@@ -197,3 +268,106 @@ class Fixture(Base):
 
     def __repr__(self):
         return f"<Fixture(name='{self.name}', address='{self.universe}.{self.start_address}')>"
+
+
+class PixelWiring(str, enum.Enum):
+    """
+    How the cells of a pixel map are chained.
+
+    :param ROWS: Row by row, each row left to right.
+    :param SNAKE: Row by row, every second row right to left.
+    :param COLUMNS: Column by column, each column top to bottom.
+    """
+
+    ROWS = "rows"
+    SNAKE = "snake"
+    COLUMNS = "columns"
+
+
+class PixelMap(Base):
+    """
+    A grid of RGB pixels patched as one unit, e.g. an LED wall.
+
+    The pixels are chained from the start address through as many
+    consecutive universes as they need; a pixel never straddles two
+    universes.
+
+    :param id: Unique identifier (UUIDv7).
+    :param name: Friendly name of the pixel map.
+    :param width: Cells per row.
+    :param height: Rows.
+    :param universe: The DMX universe of the first pixel.
+    :param start_address: The DMX address of the first pixel.
+    :param color_order: The order of the colour channels, e.g. ``GRB``.
+    :param wiring: How the cells are chained.
+    """
+
+    __tablename__ = "pixel_maps"
+    __table_args__ = (UniqueConstraint("show_id", "name"),)
+
+    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid7)
+    show_id = Column(UUID, ForeignKey("shows.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    universe = Column(Integer, default=0, nullable=False)
+    start_address = Column(Integer, default=1, nullable=False)
+    color_order = Column(String(3), default="RGB", nullable=False)
+    wiring = Column(Enum(PixelWiring), default=PixelWiring.ROWS, nullable=False)
+
+    def __repr__(self):
+        return f"<PixelMap(name='{self.name}', size='{self.width}x{self.height}')>"
+
+
+class FixtureGroup(Base):
+    """
+    A user defined, ordered selection of fixtures, e.g. "truss spots".
+
+    :param id: Unique identifier (UUIDv7).
+    :param show_id: The show the group belongs to.
+    :param name: Friendly name of the group.
+    :param members: The fixtures of the group in selection order.
+    """
+
+    __tablename__ = "fixture_groups"
+    __table_args__ = (UniqueConstraint("show_id", "name"),)
+
+    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid7)
+    show_id = Column(UUID, ForeignKey("shows.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(100), nullable=False)
+
+    members = relationship(
+        "FixtureGroupMember",
+        order_by="FixtureGroupMember.position",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+    def __repr__(self):
+        return f"<FixtureGroup(name='{self.name}')>"
+
+
+class FixtureGroupMember(Base):
+    """
+    A fixture's place in a :class:`FixtureGroup`.
+
+    :param id: Unique identifier (UUIDv7).
+    :param group_id: The group.
+    :param fixture_id: The fixture.
+    :param position: The fixture's index in the selection order.
+    """
+
+    __tablename__ = "fixture_group_members"
+    __table_args__ = (UniqueConstraint("group_id", "fixture_id"),)
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid7)
+    group_id = Column(
+        UUID,
+        ForeignKey("fixture_groups.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    fixture_id = Column(
+        UUID, ForeignKey("fixtures.id", ondelete="CASCADE"), nullable=False
+    )
+    position = Column(Integer, nullable=False, default=0)
@@ -16,6 +16,7 @@
 import logging
 import asyncio
 
+import orjson
 import redis.asyncio as redis
 from fastapi import (
     APIRouter,
@@ -31,6 +32,7 @@ from ..core.dependencies import get_current_device
 from ..core.exc import Conflict, Unauthorised
 from ..core.redis_db import get_redis
 from ..core.security.access import require_admin
+from ..engine.pool import playback_engine
 from ..schemas.device_management import AuthenticateOTP
 from ..schemas.dmx_processor import DMXFrameRequest
 from ..services.device_management import DeviceService
@@ -96,17 +98,27 @@ async def ws_show(
 ):
     """
     WebSocket Endpoint for DMX Nodes using Redis Pub/Sub.
+
+    Text messages are JSON, binary messages are DMX input frames.
     """
     await websocket.accept()
 
-    dmxp = DMXProcessor(websocket, redis_client)
+    dmxp = DMXProcessor(websocket, redis_client, device.name)
 
     redis_task = asyncio.create_task(dmxp.subscribe_and_stream())
+    output_task = asyncio.create_task(
+        dmxp.stream_output(playback_engine.outputs, playback_engine.rate)
+    )
 
     try:
         while True:
-            j = await websocket.receive_json()
-            await dmxp.json_data(data=j)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                await dmxp.input_frame(message["bytes"])
+            elif message.get("text") is not None:
+                await dmxp.json_data(data=orjson.loads(message["text"]))
 
     except WebSocketDisconnect:
         logger.info(f"Node {device.name} disconnected")
@@ -114,6 +126,11 @@ async def ws_show(
         logger.error(str(e))
     finally:
         redis_task.cancel()
+        output_task.cancel()
+        try:
+            await dmxp.release_inputs()
+        except (redis.RedisError, OSError) as e:
+            logger.error(f"Failed to release inputs of {device.name}: {e}")
 
 
 @dmx_router.websocket("/ws/engine")
@@ -138,7 +155,7 @@ async def ws_engine(
             # Receive JSON data directly from the Svelte frontend
             data = await websocket.receive_json(mode="text")
             data = dict(data)
-          
+
             universe = data.get("universe", 0)
             channels = data.get("channels", [])
 
@@ -14,13 +14,24 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import uuid
+
+import redis.asyncio as redis
 from fastapi import APIRouter, Depends, HTTPException
 
 from ..core.database import get_db
 from ..core.security.access import require_operator, require_tech_lead, require_programmer
 from ..core.exc import DuplicateEntryError
-from ..schemas.fixtures import CreateFixturePatch, CreateFixtureType
+from ..core.redis_db import get_redis
+from ..schemas.fixtures import (
+    CreateFixtureGroup,
+    CreateFixturePatch,
+    CreateFixtureType,
+    CreatePixelMap,
+    SetFixtureGroupMembers,
+)
 from ..services.fixture_service import FixtureService
+from ..services.show_events import ShowEvents
 
 fixture_router = APIRouter(tags=["fixtures"])
 
@@ -42,12 +53,67 @@ async def post_add_fixture(
 
 
 @fixture_router.post("/api/fixture")
-async def post_fixture_patch_endpoint(patch_data: CreateFixturePatch, db=Depends(get_db), current_user = Depends(require_programmer)):
+async def post_fixture_patch_endpoint(
+    patch_data: CreateFixturePatch,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = FixtureService(db)
+    try:
+        fixture = await service.patch_fixture(patch_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await ShowEvents(db, redis_client).fixture_changed(patch_data.show_id, fixture.id)
+    return fixture
+
+
+@fixture_router.post("/api/pixel-map")
+async def post_pixel_map_endpoint(
+    pixel_map: CreatePixelMap,
+    db=Depends(get_db),
+    current_user=Depends(require_programmer),
+):
+    service = FixtureService(db)
+    try:
+        return await service.patch_pixel_map(pixel_map)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@fixture_router.post("/api/fixture-groups")
+async def post_fixture_group_endpoint(
+    group: CreateFixtureGroup,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = FixtureService(db)
+    try:
+        created = await service.create_group(group)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await ShowEvents(db, redis_client).group_changed(created.id)
+    return created
+
+
+@fixture_router.put("/api/fixture-groups/{group_id}/members")
+async def put_fixture_group_members_endpoint(
+    group_id: uuid.UUID,
+    members: SetFixtureGroupMembers,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
     service = FixtureService(db)
     try:
-        return await service.patch_fixture(patch_data)
+        group = await service.set_group_members(group_id, members.fixture_ids)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await ShowEvents(db, redis_client).group_changed(group.id)
+    return group
 
 
 @fixture_router.get("/api/fixture-types")
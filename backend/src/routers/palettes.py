@@ -0,0 +1,109 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+import redis.asyncio as redis
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ..core.database import get_db
+from ..core.exc import DuplicateEntryError
+from ..core.redis_db import get_redis
+from ..core.security.access import require_programmer
+from ..schemas.palettes import (
+    CreatePalette,
+    PaletteColor,
+    PaletteValueUpdate,
+    ScenePaletteReference,
+)
+from ..services.palettes import PaletteService
+from ..services.show_events import ShowEvents
+
+palette_router = APIRouter(tags=["palettes"])
+
+
+@palette_router.post("/api/shows/{show_id}/palettes")
+async def post_create_palette(
+    show_id: uuid.UUID,
+    palette: CreatePalette,
+    db=Depends(get_db),
+    current_user=Depends(require_programmer),
+):
+    try:
+        return await PaletteService(db).create_palette(show_id, palette)
+    except DuplicateEntryError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+async def _load(service: PaletteService, palette_id: uuid.UUID):
+    palette = await service.get_palette(palette_id)
+    if palette is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Palette not found.")
+    return palette
+
+
+@palette_router.put("/api/palettes/{palette_id}/color")
+async def put_palette_color(
+    palette_id: uuid.UUID,
+    color: PaletteColor,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = PaletteService(db)
+    palette = await service.set_color(await _load(service, palette_id), color)
+    await ShowEvents(db, redis_client).publish(
+        palette.show_id, "palette", palette_id=palette.id
+    )
+    recompiled = await service.count_users(palette.id)
+    return {"palette": palette, "recompiled_cues": recompiled}
+
+
+@palette_router.put("/api/palettes/{palette_id}/values")
+async def put_palette_value(
+    palette_id: uuid.UUID,
+    value: PaletteValueUpdate,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = PaletteService(db)
+    palette = await _load(service, palette_id)
+    try:
+        palette_value = await service.set_value(palette, value)
+    except ValueError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await ShowEvents(db, redis_client).publish(
+        palette.show_id, "palette", palette_id=palette.id
+    )
+    recompiled = await service.count_users(palette.id)
+    return {"value": palette_value, "recompiled_cues": recompiled}
+
+
+@palette_router.put("/api/shows/scenes/{scene_id}/palettes")
+async def put_scene_palette(
+    scene_id: uuid.UUID,
+    reference: ScenePaletteReference,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    try:
+        created = await PaletteService(db).reference(scene_id, reference)
+    except DuplicateEntryError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    await ShowEvents(db, redis_client).scene_changed(scene_id)
+    return created
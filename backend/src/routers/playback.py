@@ -0,0 +1,256 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ..core.security.access import (
+    require_operator,
+    require_programmer,
+    require_viewer,
+)
+from ..engine.pool import playback_engine
+from ..models.dmx.cues import MAIN_STACK
+from ..schemas.playback import FaderUpdate, GotoCue, ReplayRecording, TempoUpdate
+
+playback_router = APIRouter(tags=["playback"])
+
+
+@playback_router.post("/api/playback/{show_id}/load")
+async def post_load_show(show_id: uuid.UUID, current_user=Depends(require_operator)):
+    return await playback_engine.load_show(show_id)
+
+
+@playback_router.delete("/api/playback/{show_id}")
+async def delete_unload_show(
+    show_id: uuid.UUID, current_user=Depends(require_operator)
+):
+    if not await playback_engine.unload_show(show_id):
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Show not loaded.")
+    return await playback_engine.status()
+
+
+@playback_router.post("/api/playback/go")
+async def post_go(
+    show_id: uuid.UUID | None = None,
+    stack: str = MAIN_STACK,
+    current_user=Depends(require_operator),
+):
+    try:
+        await playback_engine.go(show_id, stack)
+        return await playback_engine.status(show_id)
+    except LookupError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@playback_router.post("/api/playback/goto")
+async def post_goto(
+    goto: GotoCue,
+    show_id: uuid.UUID | None = None,
+    current_user=Depends(require_operator),
+):
+    try:
+        cue = await playback_engine.goto(goto.number, show_id, goto.stack)
+    except LookupError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    if cue is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Cue not found.")
+    return await playback_engine.status(show_id)
+
+
+@playback_router.put("/api/playback/fader")
+async def put_fader(
+    fader: FaderUpdate,
+    show_id: uuid.UUID | None = None,
+    current_user=Depends(require_operator),
+):
+    try:
+        await playback_engine.set_fader(
+            show_id, fader.stack, fader.level, fader.priority
+        )
+        return await playback_engine.status(show_id)
+    except LookupError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@playback_router.post("/api/playback/tempo/tap")
+async def post_tap_tempo(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_operator)
+):
+    try:
+        return {"bpm": await playback_engine.tap_tempo(show_id)}
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@playback_router.put("/api/playback/tempo")
+async def put_tempo(
+    tempo: TempoUpdate,
+    show_id: uuid.UUID | None = None,
+    current_user=Depends(require_operator),
+):
+    try:
+        return {"bpm": await playback_engine.set_tempo(tempo.bpm, show_id)}
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@playback_router.post("/api/playback/tempo/reset")
+async def post_reset_tempo(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_operator)
+):
+    try:
+        await playback_engine.reset_tempo(show_id)
+        return await playback_engine.status(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@playback_router.get("/api/playback/status")
+async def get_playback_status(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_viewer)
+):
+    try:
+        return await playback_engine.status(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@playback_router.get("/api/playback/output")
+async def get_playback_output(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_viewer)
+):
+    try:
+        output = playback_engine.engine(show_id).output
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(e))
+    snapshot = output.read() if output is not None else None
+    if snapshot is None:
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE, detail="Engine output unavailable."
+        )
+    sequence, frame = snapshot
+    return {
+        "sequence": sequence,
+        "universes": {universe: list(values) for universe, values in frame.items()},
+    }
+
+
+@playback_router.post("/api/playback/{show_id}/timeline")
+async def post_render_timeline(
+    show_id: uuid.UUID, current_user=Depends(require_programmer)
+):
+    try:
+        info = await playback_engine.render_timeline(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    return {
+        "path": info.path,
+        "rate": info.rate,
+        "ticks": info.tick_count,
+        "duration": info.duration,
+        "universes": list(info.universes),
+    }
+
+
+@playback_router.post("/api/playback/{show_id}/timeline/play")
+async def post_play_timeline(
+    show_id: uuid.UUID, current_user=Depends(require_operator)
+):
+    try:
+        await playback_engine.play_timeline(show_id)
+    except FileNotFoundError:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, detail="Timeline has not been rendered."
+        )
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    return await playback_engine.status()
+
+
+@playback_router.post("/api/playback/timeline/stop")
+async def post_stop_timeline(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_operator)
+):
+    try:
+        await playback_engine.stop_timeline(show_id)
+        return await playback_engine.status(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@playback_router.post("/api/playback/recording")
+async def post_start_recording(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_operator)
+):
+    try:
+        name = await playback_engine.start_recording(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    return {"name": name}
+
+
+@playback_router.post("/api/playback/recording/stop")
+async def post_stop_recording(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_operator)
+):
+    try:
+        info = await playback_engine.stop_recording(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    return {
+        "path": info.path,
+        "started_at": info.started_at,
+        "duration": info.duration,
+        "universes": list(info.universes),
+    }
+
+
+@playback_router.post("/api/playback/replay")
+async def post_play_recording(
+    replay: ReplayRecording,
+    show_id: uuid.UUID | None = None,
+    current_user=Depends(require_operator),
+):
+    try:
+        await playback_engine.play_recording(
+            replay.name, replay.speed, replay.start, show_id
+        )
+    except FileNotFoundError:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Recording not found.")
+    except ValueError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
+    return await playback_engine.status(show_id)
+
+
+@playback_router.post("/api/playback/replay/stop")
+async def post_stop_replay(
+    show_id: uuid.UUID | None = None, current_user=Depends(require_operator)
+):
+    try:
+        await playback_engine.stop_replay(show_id)
+        return await playback_engine.status(show_id)
+    except RuntimeError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(e))
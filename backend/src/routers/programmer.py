@@ -0,0 +1,127 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+import redis.asyncio as redis
+from fastapi import APIRouter, Depends, HTTPException
+
+from ..core.database import get_db
+from ..core.redis_db import get_redis
+from ..core.security.access import require_programmer, require_viewer
+from ..schemas.programmer import (
+    ClearProgrammerValues,
+    HighlightFixtures,
+    LocateFixtures,
+    RecordProgrammer,
+    SetProgrammerValues,
+)
+from ..services.programmer import ProgrammerService
+from ..services.show_events import ShowEvents
+
+programmer_router = APIRouter(tags=["programmer"])
+
+
+@programmer_router.get("/api/programmer/{show_id}")
+async def get_programmer(
+    show_id: uuid.UUID,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_viewer),
+):
+    service = ProgrammerService(db, redis_client)
+    return await service.get_values(show_id)
+
+
+@programmer_router.put("/api/programmer/{show_id}/values")
+async def put_programmer_values(
+    show_id: uuid.UUID,
+    values: SetProgrammerValues,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = ProgrammerService(db, redis_client)
+    try:
+        count = await service.set_values(show_id, str(current_user.id), values.values)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"set": count}
+
+
+@programmer_router.post("/api/programmer/{show_id}/clear")
+async def post_clear_programmer(
+    show_id: uuid.UUID,
+    clear: ClearProgrammerValues,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = ProgrammerService(db, redis_client)
+    count = await service.clear_values(show_id, str(current_user.id), clear.fixture_ids)
+    return {"cleared": count}
+
+
+@programmer_router.post("/api/programmer/{show_id}/locate")
+async def post_locate_fixtures(
+    show_id: uuid.UUID,
+    locate: LocateFixtures,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = ProgrammerService(db, redis_client)
+    try:
+        count = await service.locate(
+            show_id, str(current_user.id), locate.fixture_ids, locate.selection
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"set": count}
+
+
+@programmer_router.post("/api/programmer/{show_id}/highlight")
+async def post_highlight_fixtures(
+    show_id: uuid.UUID,
+    highlight: HighlightFixtures,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = ProgrammerService(db, redis_client)
+    count = await service.highlight(show_id, highlight.fixture_ids, highlight.selection)
+    return {"highlighted": count}
+
+
+@programmer_router.post("/api/programmer/{show_id}/record")
+async def post_record_programmer(
+    show_id: uuid.UUID,
+    record: RecordProgrammer,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = ProgrammerService(db, redis_client)
+    owner = None if record.all_owners else str(current_user.id)
+    try:
+        count = await service.record_into_scene(show_id, record.scene_id, owner)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if count:
+        await ShowEvents(db, redis_client).publish(
+            show_id, "scene", scene_id=record.scene_id
+        )
+    return {"recorded": count}
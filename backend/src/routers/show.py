@@ -16,9 +16,11 @@
 
 import logging
 
+import redis.asyncio as redis
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from ..core.database import get_db
+from ..core.redis_db import get_redis
 from ..core.security.access import require_operator, require_programmer
 from ..core.exc import DuplicateEntryError
 from ..schemas.show import (
@@ -28,7 +30,10 @@ from ..schemas.show import (
     CreateShow,
     GetShowfile,
     GetShowfiles,
+    SetFixtureColor,
+    SetFixtureColorRequest,
 )
+from ..services.show_events import ShowEvents
 from ..services.shows import ShowService
 
 show_router = APIRouter(tags=["show"])
@@ -90,6 +95,7 @@ async def put_create_fixture_definition(
     scene_id: str,
     fixture_definition: CreateFixturesInSceneRequest,
     db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
     current_user=Depends(require_programmer),
 ):
     try:
@@ -106,4 +112,24 @@ async def put_create_fixture_definition(
         raise HTTPException(409, detail=str(e))
     except Exception:
         raise HTTPException(500)
+    await ShowEvents(db, redis_client).scene_changed(fix_def.scene_id)
     return fix_def
+
+
+@show_router.put("/api/shows/scenes/{scene_id}/fixture-color")
+async def put_fixture_color(
+    scene_id: str,
+    color_definition: SetFixtureColorRequest,
+    db=Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+    current_user=Depends(require_programmer),
+):
+    service = ShowService(db)
+    try:
+        color = await service.set_fixture_color(
+            SetFixtureColor(scene_id=scene_id, **color_definition.model_dump())
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await ShowEvents(db, redis_client).scene_changed(color.scene_id)
+    return color
@@ -14,11 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, Field, UUID7
+from pydantic import UUID7, BaseModel, Field
 
-from ..models.fixtures import AttributeType
+from ..models.fixtures import AttributeType, DimmerCurve, PixelWiring
 
 
 class FixtureChannelCreate(BaseModel):
@@ -27,6 +27,13 @@ class FixtureChannelCreate(BaseModel):
     default_value: int = 0
     highlight_value: int = 255
     invert_default: bool = False
+    curve: DimmerCurve = DimmerCurve.LINEAR
+    curve_points: Optional[List[List[int]]] = None
+
+
+class ColorWheelSlot(BaseModel):
+    value: int = Field(..., ge=0, le=255)
+    color: List[int] = Field(..., min_length=3, max_length=3)
 
 
 class CreateFixtureType(BaseModel):
@@ -34,6 +41,7 @@ class CreateFixtureType(BaseModel):
     model: str
     mode_name: str
     channels: List[FixtureChannelCreate]  # <--- Diese Liste wird oben iteriert
+    color_wheel: List[ColorWheelSlot] = []
 
 
 class CreateFixturePatch(BaseModel):
@@ -45,3 +53,24 @@ class CreateFixturePatch(BaseModel):
     start_address: int = Field(..., ge=1, le=512)
     invert_pan: bool = False
     invert_tilt: bool = False
+
+
+class CreatePixelMap(BaseModel):
+    show_id: UUID7
+    name: str = Field(..., max_length=100)
+    width: int = Field(..., ge=1, le=1024)
+    height: int = Field(..., ge=1, le=1024)
+    universe: int = Field(0, ge=0)
+    start_address: int = Field(1, ge=1, le=510)
+    color_order: str = Field("RGB", pattern="^(RGB|RBG|GRB|GBR|BRG|BGR)$")
+    wiring: PixelWiring = PixelWiring.ROWS
+
+
+class CreateFixtureGroup(BaseModel):
+    show_id: UUID7
+    name: str = Field(..., max_length=100)
+    fixture_ids: List[UUID7] = []
+
+
+class SetFixtureGroupMembers(BaseModel):
+    fixture_ids: List[UUID7] = Field(..., description="Members in selection order.")
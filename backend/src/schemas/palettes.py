@@ -0,0 +1,46 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from pydantic import BaseModel, Field
+
+from ..models.dmx.scenes import ColorSpace
+from ..models.fixtures import AttributeGroup, AttributeType
+
+
+class CreatePalette(BaseModel):
+    number: int = Field(..., ge=1)
+    name: str | None = Field(None, max_length=64)
+    group: AttributeGroup
+
+
+class PaletteColor(BaseModel):
+    space: ColorSpace = ColorSpace.RGB
+    a: float
+    b: float
+    c: float
+
+
+class PaletteValueUpdate(BaseModel):
+    fixture_id: uuid.UUID | None = None
+    attribute: AttributeType
+    value: int = Field(..., ge=0, le=255)
+
+
+class ScenePaletteReference(BaseModel):
+    fixture_id: uuid.UUID
+    palette_id: uuid.UUID
@@ -0,0 +1,40 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from pydantic import BaseModel, Field
+
+from ..models.dmx.cues import MAIN_STACK
+
+
+class GotoCue(BaseModel):
+    number: int
+    stack: str = Field(MAIN_STACK, max_length=32)
+
+
+class FaderUpdate(BaseModel):
+    stack: str = Field(MAIN_STACK, max_length=32)
+    level: float | None = Field(None, ge=0.0, le=1.0)
+    priority: int | None = Field(None, ge=0, le=254)
+
+
+class TempoUpdate(BaseModel):
+    bpm: float = Field(..., ge=20.0, le=400.0)
+
+
+class ReplayRecording(BaseModel):
+    name: str = Field(..., min_length=1, max_length=128)
+    speed: float = Field(1.0, gt=0.0, le=16.0)
+    start: float = Field(0.0, ge=0.0)
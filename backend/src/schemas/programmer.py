@@ -0,0 +1,69 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from ..models.fixtures import AttributeType
+
+
+class ProgrammerValue(BaseModel):
+    fixture_id: UUID
+    attribute: AttributeType
+    value: int = Field(..., ge=0, le=255)
+
+
+class SetProgrammerValues(BaseModel):
+    values: list[ProgrammerValue] = Field(..., min_length=1)
+
+
+class ClearProgrammerValues(BaseModel):
+    fixture_ids: list[UUID] | None = Field(
+        None, description="Only release these fixtures. Omit to release all."
+    )
+
+
+class FixtureSelection(BaseModel):
+    fixture_type: UUID | None = None
+    manufacturer: UUID | None = None
+    universe: int | None = Field(None, ge=0, le=65535)
+    attributes: list[AttributeType] = Field(default_factory=list)
+    group: UUID | None = None
+
+
+class LocateFixtures(BaseModel):
+    fixture_ids: list[UUID] = Field(default_factory=list)
+    selection: FixtureSelection | None = Field(
+        None, description="Also locate every fixture matching all criteria."
+    )
+
+
+class HighlightFixtures(BaseModel):
+    fixture_ids: list[UUID] = Field(
+        default_factory=list,
+        description="Leave empty without a selection to turn highlight off.",
+    )
+    selection: FixtureSelection | None = Field(
+        None, description="Also highlight every fixture matching all criteria."
+    )
+
+
+class RecordProgrammer(BaseModel):
+    scene_id: UUID
+    all_owners: bool = Field(
+        False, description="Record every user's values, not only your own."
+    )
@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from pydantic import BaseModel, Field
+
+from ..models.dmx.scenes import ColorSpace
 from ..models.fixtures import AttributeType
 
 
@@ -53,3 +55,15 @@ class CreateFixturesInSceneRequest(BaseModel):
 
 class CreateFixturesInScene(CreateFixturesInSceneRequest):
     scene_id: str
+
+
+class SetFixtureColorRequest(BaseModel):
+    fixture_id: str
+    space: ColorSpace = ColorSpace.RGB
+    a: float = Field(..., description="Red, hue in degrees or CIE x")
+    b: float = Field(..., description="Green, saturation or CIE y")
+    c: float = Field(..., description="Blue, value or brightness")
+
+
+class SetFixtureColor(SetFixtureColorRequest):
+    scene_id: str
@@ -14,42 +14,170 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
+import base64
 import logging
+import math
+import time
+from collections.abc import Callable
 
+import orjson
 import redis.asyncio as redis
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 
+from ..core import settings
+from ..engine.shared_output import SharedOutput
 from .dmx_protocol import DMXProtocol
 
 logger = logging.getLogger("hyperion")
 
+DMX_INPUT = "hyperion:dmx:input"
+
+
+def server_clock() -> int:
+    """
+    The clock nodes synchronise to, in microseconds.
+
+    It is the monotonic system clock the playback engines tick on, so the
+    engine times of frames translate directly.
+
+    :rtype: int
+    """
+    return time.monotonic_ns() // 1000
+
 
 class DMXProcessor:
     """
     Handles DMX signal processing and WebSocket communication.
     """
 
-    def __init__(self, websocket: WebSocket, redis_client: redis.Redis):
+    def __init__(
+        self, websocket: WebSocket, redis_client: redis.Redis, name: str = "node"
+    ):
         """
         Initialise the processor with a WebSocket and a Redis client.
 
         :param websocket: The active WebSocket connection.
         :param redis_client: The Redis client instance for Pub/Sub.
+        :param name: The node's name; its inputs are merged as the sources
+            ``name:port``.
         """
         self.ws = websocket
         self.redis = redis_client
+        self.name = name
         self.channel_name = "hyperion:dmx:global"
+        self.timed = False
+        self.playout_delay = round(settings.DMX_PLAYOUT_DELAY * 1_000_000)
+        self.input_interval = 1.0 / settings.DMX_INPUT_RATE
+        # Per (port, universe): last published frame, its time, and the
+        # newest frame held back by the rate limit.
+        self._inputs: dict[tuple[int, int], tuple[int, bytes]] = {}
+        self._published: dict[tuple[int, int], float] = {}
+        self._pending: dict[tuple[int, int], tuple[int, bytes]] = {}
+        self._flushes: dict[tuple[int, int], asyncio.Task] = {}
 
     async def json_data(self, data):
         """
         Handle incoming JSON data from the DMX node (Client -> Server).
 
+        ``{"type": "sync", "t0": ...}`` is an NTP-style clock sync request
+        sent at node time ``t0``. The reply adds the server times the
+        request arrived (``t1``) and the reply left (``t2``), both from
+        :func:`server_clock`, and the playout ``delay``. With its own
+        arrival time ``t3`` the node estimates the clock offset as
+        ``((t1 - t0) + (t2 - t3)) / 2``.
+
+        After its first sync request the node receives timed frames: each
+        carries the server time to output it at, a fixed delay after the
+        engine tick it belongs to. Holding frames in a small buffer until
+        then plays them out on the engine's exact cadence whatever the
+        network jitter.
+
         :param data: The JSON payload received.
         """
-
+        received = server_clock()
+        if isinstance(data, dict) and data.get("type") == "sync":
+            self.timed = True
+            reply = {
+                "type": "sync",
+                "t0": data.get("t0"),
+                "t1": received,
+                "delay": self.playout_delay,
+            }
+            reply["t2"] = server_clock()
+            await self.ws.send_text(orjson.dumps(reply).decode())
+            return
 
         await self.ws.send_text("ACK_FROM_SERVER")
 
+    async def input_frame(self, data: bytes):
+        """
+        Handle an incoming binary input frame (Client -> Server).
+
+        Frames equal to the last published one of the same input are
+        dropped. Changed frames are published on :data:`DMX_INPUT` at most
+        :data:`Settings.DMX_INPUT_RATE` times per second and input; the
+        newest frame held back meanwhile is published when the interval is
+        over, so the engines always end up with the latest values.
+
+        :param data: The packed input frame.
+        """
+        try:
+            universe, port, priority, values = DMXProtocol.unpack_input(data)
+        except ValueError as e:
+            logger.warning(f"Dropped input frame from {self.name}: {e}")
+            return
+        key = (port, universe)
+        frame = (priority, values)
+        if key in self._flushes:
+            self._pending[key] = frame
+            return
+        if self._inputs.get(key) == frame:
+            return
+        wait = self._published.get(key, -math.inf) + self.input_interval
+        wait -= asyncio.get_running_loop().time()
+        if wait > 0:
+            self._pending[key] = frame
+            self._flushes[key] = asyncio.create_task(self._flush(key, wait))
+            return
+        await self._publish_input(key, frame)
+
+    async def _flush(self, key: tuple[int, int], wait: float) -> None:
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            del self._flushes[key]
+        frame = self._pending.pop(key)
+        if self._inputs.get(key) != frame:
+            await self._publish_input(key, frame)
+
+    async def _publish_input(
+        self, key: tuple[int, int], frame: tuple[int, bytes]
+    ) -> None:
+        (port, universe), (priority, values) = key, frame
+        self._inputs[key] = frame
+        self._published[key] = asyncio.get_running_loop().time()
+        event = {
+            "source": f"{self.name}:{port}",
+            "universe": universe,
+            "priority": priority,
+            "values": base64.b64encode(values).decode("ascii"),
+        }
+        await self.redis.publish(DMX_INPUT, orjson.dumps(event))
+
+    async def release_inputs(self):
+        """
+        Withdraw every input of the node from the merge, e.g. when it
+        disconnects.
+        """
+        for task in self._flushes.values():
+            task.cancel()
+        self._pending.clear()
+        for port in sorted({port for port, _ in self._inputs}):
+            event = {"source": f"{self.name}:{port}", "release": True}
+            await self.redis.publish(DMX_INPUT, orjson.dumps(event))
+        self._inputs.clear()
+
     async def subscribe_and_stream(self):
         """
         Subscribe to the Redis channel and stream data to the WebSocket.
@@ -67,9 +195,53 @@ class DMXProcessor:
                     b64_payload = message["data"]
 
                     raw_bytes = DMXProtocol.from_transport(b64_payload)
+                    if self.timed:
+                        raw_bytes = DMXProtocol.stamp(
+                            raw_bytes, server_clock() + self.playout_delay
+                        )
 
                     await self.ws.send_bytes(raw_bytes)
-        except Exception as e:
+        except (redis.RedisError, WebSocketDisconnect, OSError) as e:
             logger.error(f"Redis Subscription Error: {e}")
         finally:
             await pubsub.unsubscribe(self.channel_name)
+
+    async def stream_output(
+        self, outputs: Callable[[], dict[object, SharedOutput]], rate: float = 40.0
+    ):
+        """
+        Stream the playback engines' output to the WebSocket.
+
+        Polls every engine's shared output block once per engine tick and
+        sends every universe that changed since the previous poll. The first
+        poll of a block sends all of its universes. Once the node is synced,
+        the frames are stamped with their engine tick plus the playout
+        delay. (Engine -> Client)
+
+        :param outputs: Returns the output blocks of the running engines,
+            keyed by show. Engines may come and go while streaming.
+        :param rate: Polls per second.
+        """
+        period = 1.0 / rate
+        since: dict[object, int] = {}
+        try:
+            while True:
+                for key, output in outputs().items():
+                    snapshot = output.read_timed(since.get(key, 0))
+                    if snapshot is None:
+                        continue
+                    since[key], timestamp, frame = snapshot
+                    if not self.timed:
+                        for universe, values in frame.items():
+                            await self.ws.send_bytes(
+                                DMXProtocol.pack_buffer(universe, values)
+                            )
+                        continue
+                    presentation = round(timestamp * 1_000_000) + self.playout_delay
+                    for universe, values in frame.items():
+                        await self.ws.send_bytes(
+                            DMXProtocol.pack_timed(universe, presentation, values)
+                        )
+                await asyncio.sleep(period)
+        except (WebSocketDisconnect, OSError) as e:
+            logger.error(f"Output stream error: {e}")
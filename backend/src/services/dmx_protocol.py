@@ -25,8 +25,24 @@ class DMXProtocol:
     Structure:
     - Bytes 0-1: Universe ID (Unsigned Short, 16-bit, Big Endian)
     - Bytes 2-N: Channel Values (Unsigned Char, 8-bit)
+
+    Input frames (Node -> Server) carry DMX received by a node:
+    - Bytes 0-1: Universe ID (Unsigned Short, 16-bit, Big Endian)
+    - Byte 2: Input port of the node (Unsigned Char)
+    - Byte 3: Merge priority, 0-254 (Unsigned Char)
+    - Bytes 4-N: 1 to 512 Channel Values, starting at channel 1
+
+    Timed frames (Server -> Client) are sent instead of plain frames once the
+    node has synchronised its clock:
+    - Bytes 0-1: Universe ID (Unsigned Short, 16-bit, Big Endian)
+    - Bytes 2-9: Presentation timestamp in microseconds of the server clock
+      (Signed Long Long, 64-bit, Big Endian)
+    - Bytes 10-N: Channel Values (Unsigned Char, 8-bit)
     """
 
+    INPUT_HEADER = struct.Struct("!HBB")
+    TIMED_HEADER = struct.Struct("!Hq")
+
     @staticmethod
     def pack_frame(universe: int, channels: list[int]) -> bytes:
         """
@@ -43,6 +59,73 @@ class DMXProtocol:
         fmt = f"!H{len(channels)}B"
         return struct.pack(fmt, universe, *channels)
 
+    @staticmethod
+    def pack_buffer(universe: int, buffer: bytes) -> bytes:
+        """
+        Creates a binary DMX frame from a rendered universe buffer.
+
+        :param universe: The DMX universe ID (0-65535).
+        :param buffer: The channel values as bytes.
+        :return: The packed binary frame.
+        """
+        return struct.pack("!H", universe) + buffer
+
+    @staticmethod
+    def pack_timed(universe: int, timestamp: int, buffer: bytes) -> bytes:
+        """
+        Creates a timed binary DMX frame.
+
+        :param universe: The DMX universe ID (0-65535).
+        :param timestamp: When the node should output the frame, in
+            microseconds of the server clock.
+        :param buffer: The channel values as bytes.
+        :return: The packed frame.
+        """
+        return DMXProtocol.TIMED_HEADER.pack(universe, timestamp) + buffer
+
+    @staticmethod
+    def stamp(frame: bytes, timestamp: int) -> bytes:
+        """
+        Turns a plain binary DMX frame into a timed one.
+
+        :param frame: The plain frame.
+        :param timestamp: When the node should output the frame, in
+            microseconds of the server clock.
+        :return: The timed frame.
+        """
+        return frame[:2] + struct.pack("!q", timestamp) + frame[2:]
+
+    @staticmethod
+    def pack_input(universe: int, port: int, priority: int, buffer: bytes) -> bytes:
+        """
+        Creates a binary input frame.
+
+        :param universe: The DMX universe ID (0-65535).
+        :param port: The node's input port (0-255).
+        :param priority: The merge priority (0-254).
+        :param buffer: The received channel values.
+        :return: The packed input frame.
+        """
+        return DMXProtocol.INPUT_HEADER.pack(universe, port, priority) + buffer
+
+    @staticmethod
+    def unpack_input(data: bytes) -> tuple[int, int, int, bytes]:
+        """
+        Reads a binary input frame.
+
+        :param data: The frame as received from the node.
+        :raises ValueError: If the frame is malformed.
+        :return: The universe, port, priority and channel values.
+        """
+        header = DMXProtocol.INPUT_HEADER
+        values = data[header.size :]
+        if not 0 < len(values) <= 512:
+            raise ValueError(f"Input frame of {len(data)} bytes.")
+        universe, port, priority = header.unpack_from(data)
+        if priority > 254:
+            raise ValueError(f"Input priority {priority} out of range.")
+        return universe, port, priority, bytes(values)
+
     @staticmethod
     def to_transport(universe: int, channels: list[int]) -> str:
         """
@@ -16,13 +16,25 @@
 
 import uuid
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, delete, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from ..models.fixtures import Fixture, FixtureChannel, FixtureType
-from ..schemas.fixtures import CreateFixturePatch, CreateFixtureType
+from ..models.fixtures import (
+    Fixture,
+    FixtureChannel,
+    FixtureGroup,
+    FixtureGroupMember,
+    FixtureType,
+    PixelMap,
+)
+from ..schemas.fixtures import (
+    CreateFixtureGroup,
+    CreateFixturePatch,
+    CreateFixtureType,
+    CreatePixelMap,
+)
 from ..core.exc import DuplicateEntryError
 
 class FixtureService:
@@ -35,6 +47,9 @@ class FixtureService:
                 manufacturer_id=uuid.UUID(str(fixture_type_data.manufacturer_id)),
                 mode_name=fixture_type_data.mode_name,
                 model=fixture_type_data.model,
+                color_wheel=[
+                    slot.model_dump() for slot in fixture_type_data.color_wheel
+                ],
             )
 
             self.db.add(new_fixture_type)
@@ -49,6 +64,8 @@ class FixtureService:
                     default_value=channel.default_value,
                     highlight_value=channel.highlight_value,
                     invert_default=channel.invert_default,
+                    curve=channel.curve,
+                    curve_points=channel.curve_points,
                 )
                 self.db.add(new_channel)
 
@@ -128,6 +145,74 @@ class FixtureService:
 
             raise ValueError("FID or Name already exists in this Show.")
 
+    async def patch_pixel_map(self, data: CreatePixelMap):
+        pixel_map = PixelMap(
+            id=uuid.uuid7(),
+            show_id=data.show_id,
+            name=data.name,
+            width=data.width,
+            height=data.height,
+            universe=data.universe,
+            start_address=data.start_address,
+            color_order=data.color_order,
+            wiring=data.wiring,
+        )
+
+        try:
+            self.db.add(pixel_map)
+            await self.db.commit()
+            await self.db.refresh(pixel_map)
+            return pixel_map
+        except IntegrityError:
+            await self.db.rollback()
+
+            raise ValueError("Pixel map name already exists in this Show.")
+
+    async def create_group(self, data: CreateFixtureGroup):
+        group = FixtureGroup(id=uuid.uuid7(), show_id=data.show_id, name=data.name)
+        group.members = self._members(data.fixture_ids)
+
+        try:
+            self.db.add(group)
+            await self.db.commit()
+            await self.db.refresh(group)
+            return group
+        except IntegrityError:
+            await self.db.rollback()
+
+            raise ValueError("Group name already exists in this Show.")
+
+    async def set_group_members(
+        self, group_id: uuid.UUID, fixture_ids: list[uuid.UUID]
+    ):
+        if await self.db.get(FixtureGroup, group_id) is None:
+            raise LookupError("Group not found")
+
+        try:
+            await self.db.execute(
+                delete(FixtureGroupMember).where(
+                    FixtureGroupMember.group_id == group_id
+                )
+            )
+            members = self._members(fixture_ids)
+            for member in members:
+                member.group_id = group_id
+            self.db.add_all(members)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+
+            raise ValueError("Unknown fixture in group.")
+        return await self.db.get(FixtureGroup, group_id, populate_existing=True)
+
+    @staticmethod
+    def _members(fixture_ids: list[uuid.UUID]) -> list[FixtureGroupMember]:
+        unique = dict.fromkeys(fixture_ids)
+        return [
+            FixtureGroupMember(fixture_id=fixture_id, position=position)
+            for position, fixture_id in enumerate(unique)
+        ]
+
     async def get_all_devices(self):
         qry = select(FixtureType).order_by(FixtureType.id)
         fixtures = await self.db.execute(qry)
@@ -0,0 +1,174 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.exc import DuplicateEntryError
+from ..models.dmx.cues import Cue
+from ..models.dmx.palettes import Palette, PaletteValue, ScenePalette
+from ..schemas.palettes import (
+    CreatePalette,
+    PaletteColor,
+    PaletteValueUpdate,
+    ScenePaletteReference,
+)
+
+
+class PaletteService:
+    """
+    Manages palettes and the scenes referencing them.
+
+    Every edit of a palette is a single row; the engine recompiles the
+    scenes using it.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialise the PaletteService with a database session.
+
+        :param session: The asynchronous database session.
+        :type session: AsyncSession
+        """
+        self.db = session
+
+    async def create_palette(self, show_id: uuid.UUID, data: CreatePalette) -> Palette:
+        """
+        Create a palette.
+
+        :param show_id: The show's primary key.
+        :param data: Number, name and attribute group.
+        :raises DuplicateEntryError: If the number is taken in the group.
+        :rtype: Palette
+        """
+        palette = Palette(
+            show_id=show_id, number=data.number, name=data.name, group=data.group
+        )
+        try:
+            self.db.add(palette)
+            await self.db.commit()
+            await self.db.refresh(palette)
+        except IntegrityError:
+            await self.db.rollback()
+            raise DuplicateEntryError("Palette number already exists in this group.")
+        return palette
+
+    async def get_palette(self, palette_id: uuid.UUID) -> Palette | None:
+        """
+        Load a palette with its values.
+
+        :param palette_id: The palette's primary key.
+        :rtype: Palette | None
+        """
+        return await self.db.get(Palette, palette_id)
+
+    async def count_users(self, palette_id: uuid.UUID) -> int:
+        """
+        Count the cues whose scenes reference a palette.
+
+        These are the cues recompiled after the palette was edited.
+
+        :param palette_id: The palette's primary key.
+        :rtype: int
+        """
+        qry = (
+            select(func.count(func.distinct(Cue.id)))
+            .join(ScenePalette, ScenePalette.scene_id == Cue.scene_id)
+            .where(ScenePalette.palette_id == palette_id)
+        )
+        return (await self.db.execute(qry)).scalar_one()
+
+    async def set_color(self, palette: Palette, color: PaletteColor) -> Palette:
+        """
+        Set the abstract colour of a colour palette.
+
+        :param palette: The palette.
+        :param color: The colour.
+        :rtype: Palette
+        """
+        palette.space = color.space
+        palette.a, palette.b, palette.c = color.a, color.b, color.c
+        await self.db.commit()
+        await self.db.refresh(palette)
+        return palette
+
+    async def set_value(
+        self, palette: Palette, data: PaletteValueUpdate
+    ) -> PaletteValue:
+        """
+        Set one value of a palette, replacing an existing one.
+
+        :param palette: The palette.
+        :param data: Fixture (None for all fixtures), attribute and value.
+        :raises ValueError: If the attribute is not in the palette's group or
+            the fixture does not exist.
+        :rtype: PaletteValue
+        """
+        if data.attribute not in palette.group.attributes:
+            raise ValueError(
+                f"{data.attribute.value} is not part of {palette.group.value} palettes."
+            )
+        qry = select(PaletteValue).where(
+            PaletteValue.palette_id == palette.id,
+            PaletteValue.attribute == data.attribute,
+            (
+                PaletteValue.fixture_id.is_(None)
+                if data.fixture_id is None
+                else PaletteValue.fixture_id == data.fixture_id
+            ),
+        )
+        value = (await self.db.execute(qry)).scalars().first()
+        if value is None:
+            value = PaletteValue(
+                palette_id=palette.id,
+                fixture_id=data.fixture_id,
+                attribute=data.attribute,
+            )
+            self.db.add(value)
+        value.value = data.value
+        try:
+            await self.db.commit()
+            await self.db.refresh(value)
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError("Fixture not found.")
+        return value
+
+    async def reference(
+        self, scene_id: uuid.UUID, data: ScenePaletteReference
+    ) -> ScenePalette:
+        """
+        Let a fixture in a scene take its values from a palette.
+
+        :param scene_id: The scene's primary key.
+        :param data: The fixture and the palette.
+        :raises DuplicateEntryError: If the reference already exists.
+        :rtype: ScenePalette
+        """
+        reference = ScenePalette(
+            scene_id=scene_id, fixture_id=data.fixture_id, palette_id=data.palette_id
+        )
+        try:
+            self.db.add(reference)
+            await self.db.commit()
+            await self.db.refresh(reference)
+        except IntegrityError:
+            await self.db.rollback()
+            raise DuplicateEntryError("The scene already references this palette.")
+        return reference
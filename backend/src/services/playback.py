@@ -0,0 +1,333 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+
+from ..engine.palettes import BakedPalette
+from ..engine.patch import Patch, PatchedFixture
+from ..models.dmx.cues import MAIN_STACK, Cue
+from ..models.dmx.effects import CueEffect
+from ..models.dmx.palettes import Palette, ScenePalette
+from ..models.dmx.scenes import Scene, SceneFixtureColor, SceneFixtureValue
+from ..models.fixtures import (
+    AttributeType,
+    Fixture,
+    FixtureGroup,
+    FixtureType,
+    PixelMap,
+)
+
+
+class PlaybackService:
+    """
+    Loads everything the playback engine needs from the database.
+
+    The engine itself never talks to MariaDB; it only receives the detached
+    results of this service.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialise the PlaybackService with a database session.
+
+        :param session: The asynchronous database session.
+        :type session: AsyncSession
+        """
+        self.db = session
+
+    async def get_patch(self, show_id: uuid.UUID) -> Patch:
+        """
+        Load the patch of a show.
+
+        :param show_id: The show's primary key.
+        :return: The detached patch of all active fixtures and pixel maps.
+        :rtype: Patch
+        """
+        qry = (
+            select(Fixture)
+            .where(Fixture.show_id == show_id)
+            .options(
+                selectinload(Fixture.fixture_type).selectinload(FixtureType.channels)
+            )
+        )
+        fixtures = (await self.db.execute(qry)).scalars().all()
+        qry = select(PixelMap).where(PixelMap.show_id == show_id)
+        pixel_maps = (await self.db.execute(qry)).scalars().all()
+        qry = select(FixtureGroup).where(FixtureGroup.show_id == show_id)
+        groups = (await self.db.execute(qry)).scalars().all()
+        return Patch.from_models(fixtures, pixel_maps, groups)
+
+    async def get_fixture(
+        self, show_id: uuid.UUID, fixture_id: uuid.UUID
+    ) -> PatchedFixture | None:
+        """
+        Load a single fixture of a show.
+
+        :param show_id: The show's primary key.
+        :param fixture_id: The fixture's primary key.
+        :return: The detached fixture or ``None`` if it does not exist in
+            the show or is inactive.
+        :rtype: PatchedFixture | None
+        """
+        qry = (
+            select(Fixture)
+            .where(Fixture.show_id == show_id, Fixture.id == fixture_id)
+            .options(
+                selectinload(Fixture.fixture_type).selectinload(FixtureType.channels)
+            )
+        )
+        fixture = (await self.db.execute(qry)).scalars().first()
+        if fixture is None or not fixture.is_active:
+            return None
+        return Patch.detach(fixture)
+
+    async def get_group(
+        self, show_id: uuid.UUID, group_id: uuid.UUID
+    ) -> list[uuid.UUID] | None:
+        """
+        Load the members of a fixture group.
+
+        :param show_id: The show's primary key.
+        :param group_id: The group's primary key.
+        :return: The fixture IDs in selection order or ``None`` if the group
+            does not exist in the show.
+        :rtype: list[uuid.UUID] | None
+        """
+        qry = select(FixtureGroup).where(
+            FixtureGroup.show_id == show_id, FixtureGroup.id == group_id
+        )
+        group = (await self.db.execute(qry)).scalars().first()
+        if group is None:
+            return None
+        return [member.fixture_id for member in group.members]
+
+    async def get_stacks(self, show_id: uuid.UUID) -> list[str]:
+        """
+        List the cue stacks of a show.
+
+        :param show_id: The show's primary key.
+        :return: The stack names; the main stack is always included and first.
+        :rtype: list[str]
+        """
+        qry = select(Cue.stack).where(Cue.show_id == show_id).distinct()
+        stacks = set((await self.db.execute(qry)).scalars().all())
+        stacks.discard(MAIN_STACK)
+        return [MAIN_STACK, *sorted(stacks)]
+
+    async def get_cue_deltas(
+        self,
+        show_id: uuid.UUID,
+        stack: str = MAIN_STACK,
+        patch: Patch | None = None,
+        numbers: Iterable[int] | None = None,
+    ) -> dict[int, list[tuple[uuid.UUID, AttributeType, int]]]:
+        """
+        Load the scene values of every cue of a stack in a single query.
+
+        :param show_id: The show's primary key.
+        :param stack: The cue stack.
+        :param patch: The show's patch. With it, scene colours are loaded
+            too and converted to channel values ahead of the raw values, so
+            raw values of the same channels win.
+        :param numbers: Only load these cues. Cues that do not exist are
+            left out of the result.
+        :return: The ``(fixture, attribute, value)`` triples of every cue,
+            keyed by cue number. Cues without values map to an empty list.
+        :rtype: dict[int, list[tuple[uuid.UUID, AttributeType, int]]]
+        """
+        qry = (
+            select(
+                Cue.number,
+                SceneFixtureValue.fixture_id,
+                SceneFixtureValue.attribute,
+                SceneFixtureValue.value,
+            )
+            .outerjoin(SceneFixtureValue, SceneFixtureValue.scene_id == Cue.scene_id)
+            .where(*self._cue_filter(show_id, stack, numbers))
+            .order_by(Cue.number)
+        )
+        result = await self.db.execute(qry)
+        deltas: dict[int, list[tuple[uuid.UUID, AttributeType, int]]] = {}
+        if patch is not None:
+            deltas = await self._cue_colors(show_id, stack, patch, numbers)
+        for number, fixture_id, attribute, value in result.all():
+            values = deltas.setdefault(number, [])
+            if fixture_id is not None:
+                values.append((fixture_id, attribute, value))
+        return deltas
+
+    @staticmethod
+    def _cue_filter(
+        show_id: uuid.UUID, stack: str, numbers: Iterable[int] | None
+    ) -> list:
+        conditions = [Cue.show_id == show_id, Cue.stack == stack]
+        if numbers is not None:
+            conditions.append(Cue.number.in_(list(numbers)))
+        return conditions
+
+    async def _cue_colors(
+        self,
+        show_id: uuid.UUID,
+        stack: str,
+        patch: Patch,
+        numbers: Iterable[int] | None = None,
+    ) -> dict[int, list[tuple[uuid.UUID, AttributeType, int]]]:
+        qry = (
+            select(
+                Cue.number,
+                SceneFixtureColor.fixture_id,
+                SceneFixtureColor.space,
+                SceneFixtureColor.a,
+                SceneFixtureColor.b,
+                SceneFixtureColor.c,
+            )
+            .join(SceneFixtureColor, SceneFixtureColor.scene_id == Cue.scene_id)
+            .where(*self._cue_filter(show_id, stack, numbers))
+        )
+        colors: dict[int, list] = {}
+        for number, *color in (await self.db.execute(qry)).all():
+            colors.setdefault(number, []).append(color)
+        return {number: patch.color_values(values) for number, values in colors.items()}
+
+    async def get_cue_palettes(
+        self,
+        show_id: uuid.UUID,
+        stack: str = MAIN_STACK,
+        numbers: Iterable[int] | None = None,
+    ) -> dict[int, list[tuple[uuid.UUID, uuid.UUID]]]:
+        """
+        Load the palette references of every cue of a stack.
+
+        :param show_id: The show's primary key.
+        :param stack: The cue stack.
+        :param numbers: Only load these cues.
+        :return: The ``(fixture, palette)`` pairs of every cue's scene, keyed
+            by cue number. Cues without references are left out.
+        :rtype: dict[int, list[tuple[uuid.UUID, uuid.UUID]]]
+        """
+        qry = (
+            select(Cue.number, ScenePalette.fixture_id, ScenePalette.palette_id)
+            .join(ScenePalette, ScenePalette.scene_id == Cue.scene_id)
+            .where(*self._cue_filter(show_id, stack, numbers))
+        )
+        references: dict[int, list[tuple[uuid.UUID, uuid.UUID]]] = {}
+        for number, fixture_id, palette_id in (await self.db.execute(qry)).all():
+            references.setdefault(number, []).append((fixture_id, palette_id))
+        return references
+
+    async def get_scene_cues(
+        self, show_id: uuid.UUID, scene_id: uuid.UUID
+    ) -> dict[str, list[int]]:
+        """
+        Find the cues playing a scene.
+
+        :param show_id: The show's primary key.
+        :param scene_id: The scene's primary key.
+        :return: The cue numbers using the scene, keyed by stack.
+        :rtype: dict[str, list[int]]
+        """
+        qry = select(Cue.stack, Cue.number).where(
+            Cue.show_id == show_id, Cue.scene_id == scene_id
+        )
+        cues: dict[str, list[int]] = {}
+        for stack, number in (await self.db.execute(qry)).all():
+            cues.setdefault(stack, []).append(number)
+        return cues
+
+    async def get_palettes(self, show_id: uuid.UUID) -> list[BakedPalette]:
+        """
+        Load every palette of a show.
+
+        :param show_id: The show's primary key.
+        :return: The detached palettes.
+        :rtype: list[BakedPalette]
+        """
+        qry = select(Palette).where(Palette.show_id == show_id)
+        result = await self.db.execute(qry)
+        return [BakedPalette.from_model(p) for p in result.scalars().all()]
+
+    async def get_palette(
+        self, show_id: uuid.UUID, palette_id: uuid.UUID
+    ) -> BakedPalette | None:
+        """
+        Load a single palette.
+
+        :param show_id: The show's primary key.
+        :param palette_id: The palette's primary key.
+        :return: The detached palette or ``None`` if the show has no such
+            palette.
+        :rtype: BakedPalette | None
+        """
+        qry = select(Palette).where(
+            Palette.show_id == show_id, Palette.id == palette_id
+        )
+        palette = (await self.db.execute(qry)).scalars().first()
+        return BakedPalette.from_model(palette) if palette is not None else None
+
+    @staticmethod
+    def _cue_options():
+        return (
+            selectinload(Cue.scene)
+            .selectinload(Scene.fixture_associations)
+            .options(noload(SceneFixtureValue.fixture)),
+            selectinload(Cue.scene).selectinload(Scene.fixture_colors),
+            selectinload(Cue.scene).selectinload(Scene.palette_references),
+            selectinload(Cue.effects).selectinload(CueEffect.template),
+            selectinload(Cue.timings),
+        )
+
+    async def get_cue(
+        self, show_id: uuid.UUID, number: int, stack: str = MAIN_STACK
+    ) -> Cue | None:
+        """
+        Load a cue with its scene values and effect templates.
+
+        :param show_id: The show's primary key.
+        :param number: The cue number.
+        :param stack: The cue stack.
+        :return: The cue or ``None`` if it does not exist.
+        :rtype: Cue | None
+        """
+        qry = (
+            select(Cue)
+            .where(Cue.show_id == show_id, Cue.stack == stack, Cue.number == number)
+            .options(*self._cue_options())
+        )
+        result = await self.db.execute(qry)
+        return result.scalars().first()
+
+    async def get_cues(self, show_id: uuid.UUID, stack: str = MAIN_STACK) -> list[Cue]:
+        """
+        Load every cue of a stack with its scene values and effect templates.
+
+        :param show_id: The show's primary key.
+        :param stack: The cue stack.
+        :return: The cues ordered by number.
+        :rtype: list[Cue]
+        """
+        qry = (
+            select(Cue)
+            .where(Cue.show_id == show_id, Cue.stack == stack)
+            .order_by(Cue.number)
+            .options(*self._cue_options())
+        )
+        result = await self.db.execute(qry)
+        return list(result.scalars().all())
@@ -14,3 +14,390 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import uuid
+
+import orjson
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+
+from ..engine.patch import Patch
+from ..engine.programmer import ProgrammerOverlay
+from ..engine.selection import FixtureIndex
+from ..models.dmx.scenes import Scene, SceneFixtureValue
+from ..models.fixtures import AttributeType, Fixture, FixtureType
+from ..schemas.programmer import FixtureSelection, ProgrammerValue
+from .playback import PlaybackService
+
+PROGRAMMER_EVENTS = "hyperion:programmer:events"
+
+
+def programmer_key(show_id: uuid.UUID) -> str:
+    """
+    The Redis hash holding a show's programmer overrides.
+
+    :param show_id: The show's primary key.
+    :rtype: str
+    """
+    return f"hyperion:programmer:{show_id}"
+
+
+class ProgrammerService:
+    """
+    Live overrides ("the programmer") of a show.
+
+    Overrides are stored in a Redis hash with one field per touched channel
+    and every change is published on :data:`PROGRAMMER_EVENTS`, so every
+    API worker and the playback engine see the same state. Only the
+    fixtures named in a request are loaded from the database.
+    """
+
+    def __init__(self, session: AsyncSession, redis_client: redis.Redis):
+        """
+        Initialise the ProgrammerService.
+
+        :param session: The asynchronous database session.
+        :param redis_client: The Redis client instance.
+        """
+        self.db = session
+        self.redis = redis_client
+
+    async def _patch_for(
+        self, show_id: uuid.UUID, fixture_ids: set[uuid.UUID]
+    ) -> Patch:
+        qry = (
+            select(Fixture)
+            .where(Fixture.show_id == show_id, Fixture.id.in_(fixture_ids))
+            .options(
+                selectinload(Fixture.fixture_type).selectinload(FixtureType.channels)
+            )
+        )
+        result = await self.db.execute(qry)
+        return Patch.from_models(result.scalars().all())
+
+    async def _entries(self, show_id: uuid.UUID) -> dict[str, dict]:
+        raw = await self.redis.hgetall(programmer_key(show_id))
+        return {field: orjson.loads(entry) for field, entry in raw.items()}
+
+    async def set_values(
+        self, show_id: uuid.UUID, owner: str, values: list[ProgrammerValue]
+    ) -> int:
+        """
+        Override fixture attributes.
+
+        :param show_id: The show's primary key.
+        :param owner: The account setting the values.
+        :param values: The values to set.
+        :raises ValueError: If a fixture attribute is not patched in the show.
+        :return: The number of channels set.
+        :rtype: int
+        """
+        patch = await self._patch_for(show_id, {value.fixture_id for value in values})
+        mapping = {}
+        channels = []
+        for value in values:
+            position = patch.resolve(value.fixture_id, value.attribute)
+            if position is None:
+                raise ValueError(
+                    f"Fixture {value.fixture_id} has no patched "
+                    f"{value.attribute.value}."
+                )
+            universe, address = position
+            mapping[f"{universe}:{address}"] = orjson.dumps(
+                {
+                    "value": value.value,
+                    "owner": owner,
+                    "fixture_id": str(value.fixture_id),
+                    "attribute": value.attribute.value,
+                }
+            )
+            channels.append([universe, address, value.value])
+        if not mapping:
+            return 0
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(programmer_key(show_id), mapping=mapping)
+            pipe.publish(
+                PROGRAMMER_EVENTS,
+                orjson.dumps(
+                    {
+                        "show_id": str(show_id),
+                        "op": "set",
+                        "owner": owner,
+                        "values": channels,
+                    }
+                ),
+            )
+            await pipe.execute()
+        return len(mapping)
+
+    async def clear_values(
+        self,
+        show_id: uuid.UUID,
+        owner: str,
+        fixture_ids: list[uuid.UUID] | None = None,
+    ) -> int:
+        """
+        Release the caller's overrides.
+
+        :param show_id: The show's primary key.
+        :param owner: The account releasing its channels.
+        :param fixture_ids: Only release channels of these fixtures. ``None``
+            releases all of the caller's channels.
+        :return: The number of channels released.
+        :rtype: int
+        """
+        selected = None if fixture_ids is None else {str(f) for f in fixture_ids}
+        key = programmer_key(show_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                # A channel taken over by another account between reading
+                # and deleting aborts the transaction, which is then retried.
+                try:
+                    await pipe.watch(key)
+                    entries = {
+                        field: orjson.loads(entry)
+                        for field, entry in (await pipe.hgetall(key)).items()
+                    }
+                    fields = [
+                        field
+                        for field, entry in entries.items()
+                        if entry["owner"] == owner
+                        and (selected is None or entry["fixture_id"] in selected)
+                    ]
+                    if not fields:
+                        await pipe.reset()
+                        return 0
+
+                    channels = [
+                        [int(part) for part in field.split(":")] for field in fields
+                    ]
+                    pipe.multi()
+                    pipe.hdel(key, *fields)
+                    pipe.publish(
+                        PROGRAMMER_EVENTS,
+                        orjson.dumps(
+                            {
+                                "show_id": str(show_id),
+                                "op": "clear",
+                                "owner": owner,
+                                "channels": channels,
+                            }
+                        ),
+                    )
+                    await pipe.execute()
+                    return len(fields)
+                except redis.WatchError:
+                    continue
+
+    async def select_fixtures(
+        self,
+        show_id: uuid.UUID,
+        fixture_ids: list[uuid.UUID],
+        selection: FixtureSelection | None = None,
+    ) -> list[uuid.UUID]:
+        """
+        Resolve a programmer selection.
+
+        Criteria are matched with a :class:`FixtureIndex` of the show's
+        patch.
+
+        :param show_id: The show's primary key.
+        :param fixture_ids: Explicitly selected fixtures.
+        :param selection: Criteria selecting further fixtures.
+        :return: The explicit fixtures in their order, then the matching
+            fixtures in FID order.
+        :rtype: list[uuid.UUID]
+        """
+        selected = list(dict.fromkeys(fixture_ids))
+        if selection is not None:
+            patch = await PlaybackService(self.db).get_patch(show_id)
+            index = FixtureIndex.from_patch(patch)
+            matches = index.fixtures(index.select(**selection.model_dump()))
+            explicit = set(selected)
+            selected.extend(f.id for f in matches if f.id not in explicit)
+        return selected
+
+    async def locate(
+        self,
+        show_id: uuid.UUID,
+        owner: str,
+        fixture_ids: list[uuid.UUID],
+        selection: FixtureSelection | None = None,
+    ) -> int:
+        """
+        Set every channel of the selected fixtures to its home value.
+
+        The values are stored like any other override, so they can be
+        recorded. The engine copies them from its precomputed home buffers.
+
+        :param show_id: The show's primary key.
+        :param owner: The account locating the fixtures.
+        :param fixture_ids: The selected fixtures.
+        :param selection: Criteria selecting further fixtures, see
+            :meth:`select_fixtures`.
+        :raises ValueError: If neither fixtures nor criteria are given.
+        :return: The number of channels set.
+        :rtype: int
+        """
+        if not fixture_ids and selection is None:
+            raise ValueError("Select fixtures by ID or by criteria.")
+        fixture_ids = await self.select_fixtures(show_id, fixture_ids, selection)
+        patch = await self._patch_for(show_id, set(fixture_ids))
+        mapping = {
+            f"{fixture.universe}:{channel.address}": orjson.dumps(
+                {
+                    "value": channel.home,
+                    "owner": owner,
+                    "fixture_id": str(fixture.id),
+                    "attribute": channel.attribute.value,
+                }
+            )
+            for fixture in patch.fixtures.values()
+            for channel in fixture.channels.values()
+        }
+        if not mapping:
+            return 0
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(programmer_key(show_id), mapping=mapping)
+            pipe.publish(
+                PROGRAMMER_EVENTS,
+                orjson.dumps(
+                    {
+                        "show_id": str(show_id),
+                        "op": "locate",
+                        "owner": owner,
+                        "fixtures": [str(fixture_id) for fixture_id in patch.fixtures],
+                    }
+                ),
+            )
+            await pipe.execute()
+        return len(mapping)
+
+    async def highlight(
+        self,
+        show_id: uuid.UUID,
+        fixture_ids: list[uuid.UUID],
+        selection: FixtureSelection | None = None,
+    ) -> int:
+        """
+        Highlight a selection, replacing the previous one.
+
+        Highlighting is not stored; it only lasts until the next highlight
+        or until the show is loaded again.
+
+        :param show_id: The show's primary key.
+        :param fixture_ids: The selected fixtures. Empty without a selection
+            turns highlight off.
+        :param selection: Criteria selecting further fixtures, see
+            :meth:`select_fixtures`.
+        :return: The number of selected fixtures.
+        :rtype: int
+        """
+        fixture_ids = await self.select_fixtures(show_id, fixture_ids, selection)
+        await self.redis.publish(
+            PROGRAMMER_EVENTS,
+            orjson.dumps(
+                {
+                    "show_id": str(show_id),
+                    "op": "highlight",
+                    "fixtures": [str(fixture_id) for fixture_id in fixture_ids],
+                }
+            ),
+        )
+        return len(fixture_ids)
+
+    async def get_values(self, show_id: uuid.UUID) -> list[dict]:
+        """
+        List all overrides of a show.
+
+        :param show_id: The show's primary key.
+        :return: One dictionary per overridden channel.
+        :rtype: list[dict]
+        """
+        values = []
+        for field, entry in (await self._entries(show_id)).items():
+            universe, address = (int(part) for part in field.split(":"))
+            values.append({"universe": universe, "address": address + 1, **entry})
+        return values
+
+    async def record_into_scene(
+        self, show_id: uuid.UUID, scene_id: uuid.UUID, owner: str | None
+    ) -> int:
+        """
+        Store the programmer's contents in a scene.
+
+        Existing values of the same fixture attributes are updated, all other
+        values of the scene are kept.
+
+        :param show_id: The show's primary key.
+        :param scene_id: The scene to record into.
+        :param owner: Only record this account's channels. ``None`` records
+            the whole programmer.
+        :raises ValueError: If the scene does not belong to the show.
+        :return: The number of recorded values.
+        :rtype: int
+        """
+        qry = select(Scene.id).where(Scene.id == scene_id, Scene.show_id == show_id)
+        if (await self.db.execute(qry)).scalar_one_or_none() is None:
+            raise ValueError("Scene not found in this show.")
+
+        recorded = {
+            (uuid.UUID(entry["fixture_id"]), AttributeType(entry["attribute"])): entry[
+                "value"
+            ]
+            for entry in (await self._entries(show_id)).values()
+            if owner is None or entry["owner"] == owner
+        }
+        if not recorded:
+            return 0
+
+        qry = (
+            select(SceneFixtureValue)
+            .where(
+                SceneFixtureValue.scene_id == scene_id,
+                SceneFixtureValue.fixture_id.in_({key[0] for key in recorded}),
+            )
+            .options(noload(SceneFixtureValue.fixture))
+        )
+        existing = {
+            (row.fixture_id, row.attribute): row
+            for row in (await self.db.execute(qry)).scalars().all()
+        }
+        for (fixture_id, attribute), value in recorded.items():
+            row = existing.get((fixture_id, attribute))
+            if row is not None:
+                row.value = value
+            else:
+                self.db.add(
+                    SceneFixtureValue(
+                        scene_id=scene_id,
+                        fixture_id=fixture_id,
+                        attribute=attribute,
+                        value=value,
+                    )
+                )
+        await self.db.commit()
+        return len(recorded)
+
+    @staticmethod
+    async def load_overlay(
+        redis_client: redis.Redis, show_id: uuid.UUID
+    ) -> ProgrammerOverlay:
+        """
+        Restore the engine side overlay of a show from Redis.
+
+        :param redis_client: The Redis client instance.
+        :param show_id: The show's primary key.
+        :return: The overlay with all stored overrides.
+        :rtype: ProgrammerOverlay
+        """
+        overlay = ProgrammerOverlay()
+        raw = await redis_client.hgetall(programmer_key(show_id))
+        for field, entry in raw.items():
+            universe, address = (int(part) for part in field.split(":"))
+            entry = orjson.loads(entry)
+            overlay.set_many(entry["owner"], [(universe, address, entry["value"])])
+        return overlay
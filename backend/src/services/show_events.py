@@ -0,0 +1,122 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+import orjson
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.dmx.palettes import Palette
+from ..models.dmx.scenes import Scene
+from ..models.fixtures import FixtureGroup
+
+SHOW_EVENTS = "hyperion:show:events"
+
+
+class ShowEvents:
+    """
+    Announces edits of a show's data to the playback engines.
+
+    Every edit is published on :data:`SHOW_EVENTS` as a small invalidation
+    event naming what changed, never the new data itself. The engine that
+    plays the show, whichever worker or process it runs in, reloads only
+    the affected cues and swaps them in between two ticks.
+
+    Events look like ``{"show_id": ..., "change": "scene", "scene_id": ...}``
+    with ``change`` one of ``scene``, ``cue`` (``stack``, ``number``),
+    ``fixture``, ``palette`` or ``group``.
+    """
+
+    def __init__(self, session: AsyncSession, redis_client: redis.Redis):
+        """
+        Initialise the ShowEvents publisher.
+
+        :param session: The asynchronous database session, used to find the
+            show of an edited object.
+        :param redis_client: The Redis client instance.
+        """
+        self.db = session
+        self.redis = redis_client
+
+    async def publish(self, show_id: uuid.UUID | None, change: str, **keys) -> None:
+        """
+        Publish an invalidation event.
+
+        :param show_id: The edited show; None publishes nothing.
+        :param change: What changed.
+        :param keys: The keys of the changed object.
+        """
+        if show_id is None:
+            return
+        await self.redis.publish(
+            SHOW_EVENTS,
+            orjson.dumps({"show_id": str(show_id), "change": change, **keys}),
+        )
+
+    async def _show_of(self, model, object_id: uuid.UUID) -> uuid.UUID | None:
+        qry = select(model.show_id).where(model.id == object_id)
+        return (await self.db.execute(qry)).scalar_one_or_none()
+
+    async def scene_changed(self, scene_id: uuid.UUID) -> None:
+        """
+        Announce edited values, colours or palette references of a scene.
+
+        :param scene_id: The scene's primary key.
+        """
+        await self.publish(
+            await self._show_of(Scene, scene_id), "scene", scene_id=scene_id
+        )
+
+    async def cue_changed(self, show_id: uuid.UUID, stack: str, number: int) -> None:
+        """
+        Announce a created, edited or deleted cue.
+
+        :param show_id: The show's primary key.
+        :param stack: The cue's stack.
+        :param number: The cue number.
+        """
+        await self.publish(show_id, "cue", stack=stack, number=number)
+
+    async def fixture_changed(self, show_id: uuid.UUID, fixture_id: uuid.UUID) -> None:
+        """
+        Announce a patched, repatched or removed fixture.
+
+        :param show_id: The show's primary key.
+        :param fixture_id: The fixture's primary key.
+        """
+        await self.publish(show_id, "fixture", fixture_id=fixture_id)
+
+    async def palette_changed(self, palette_id: uuid.UUID) -> None:
+        """
+        Announce an edited palette.
+
+        :param palette_id: The palette's primary key.
+        """
+        await self.publish(
+            await self._show_of(Palette, palette_id), "palette", palette_id=palette_id
+        )
+
+    async def group_changed(self, group_id: uuid.UUID) -> None:
+        """
+        Announce an edited fixture group.
+
+        :param group_id: The group's primary key.
+        """
+        await self.publish(
+            await self._show_of(FixtureGroup, group_id), "group", group_id=group_id
+        )
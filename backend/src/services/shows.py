@@ -20,7 +20,7 @@ from sqlalchemy import desc, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.dmx.scenes import Scene, SceneFixtureValue
+from ..models.dmx.scenes import Scene, SceneFixtureColor, SceneFixtureValue
 from ..models.fixtures import Fixture
 from ..models.shows import Show
 from ..schemas.show import (
@@ -29,6 +29,7 @@ from ..schemas.show import (
     CreateShow,
     GetShowfile,
     GetShowfiles,
+    SetFixtureColor,
 )
 from ..core.exc import DuplicateEntryError
 
@@ -109,5 +110,28 @@ class ShowService:
             raise DuplicateEntryError("Duplicate fixture definition found.")
         return fix_def
 
+    async def set_fixture_color(self, color_definition: SetFixtureColor):
+        scene_id = uuid.UUID(color_definition.scene_id)
+        fixture_id = uuid.UUID(color_definition.fixture_id)
+        qry = select(SceneFixtureColor).where(
+            SceneFixtureColor.scene_id == scene_id,
+            SceneFixtureColor.fixture_id == fixture_id,
+        )
+        color = (await self.db.execute(qry)).scalars().first()
+        if color is None:
+            color = SceneFixtureColor(scene_id=scene_id, fixture_id=fixture_id)
+            self.db.add(color)
+        color.space = color_definition.space
+        color.a = color_definition.a
+        color.b = color_definition.b
+        color.c = color_definition.c
+        try:
+            await self.db.commit()
+            await self.db.refresh(color)
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError("Scene or fixture not found.")
+        return color
+
     async def create_cue(self):
         raise NotImplementedError
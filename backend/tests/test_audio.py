@@ -0,0 +1,83 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import cmath
+import math
+import random
+import struct
+import wave
+
+import pytest
+
+from src.engine.audio import AudioAnalyzer, AudioLevels, band_edges, fft
+
+RATE = 8000
+WINDOW = 256
+
+
+def _dft(samples: list[float]) -> list[complex]:
+    size = len(samples)
+    return [
+        sum(samples[n] * cmath.exp(-2j * math.pi * k * n / size) for n in range(size))
+        for k in range(size)
+    ]
+
+
+def test_fft_matches_the_dft():
+    rng = random.Random(3)
+    samples = [rng.uniform(-1, 1) for _ in range(64)]
+    for value, expected in zip(fft(samples), _dft(samples)):
+        assert value == pytest.approx(expected, abs=1e-9)
+
+
+def test_band_edges_cover_increasing_ranges():
+    edges = band_edges(44100, 1024, 8)
+    assert len(edges) == 8
+    for (first, last), (next_first, _) in zip(edges, edges[1:]):
+        assert first < last <= next_first
+    assert edges[-1][1] <= 512
+
+
+def test_band_index_is_clamped():
+    levels = AudioLevels(level=9, bands=bytes([1, 2, 3]))
+    assert levels.band(None) == 9
+    assert levels.band(-4) == 1
+    assert levels.band(10) == 3
+
+
+def test_analyzer_reports_levels_and_onsets(tmp_path):
+    # One second of silence with a short 1 kHz burst every quarter second.
+    samples = []
+    for n in range(RATE):
+        burst = n % (RATE // 4) < WINDOW
+        value = math.sin(2 * math.pi * 1000 * n / RATE) if burst else 0.0
+        samples.append(round(value * 20000))
+    path = tmp_path / "bursts.wav"
+    with wave.open(str(path), "wb") as stream:
+        stream.setnchannels(1)
+        stream.setsampwidth(2)
+        stream.setframerate(RATE)
+        stream.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+    analyzer = AudioAnalyzer(str(path), window=WINDOW)
+    analyzer.start()
+    analyzer._thread.join(timeout=10)
+    assert analyzer.levels.onsets >= 2
+
+
+def test_analyzer_rejects_odd_windows():
+    with pytest.raises(ValueError):
+        AudioAnalyzer("unused.wav", window=1000)
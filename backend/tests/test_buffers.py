@@ -0,0 +1,69 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+
+import pytest
+
+from src.engine.buffers import MAX_PRIORITY, UNIVERSE_SIZE, priority_merge
+
+
+def _reference(layers):
+    values, mask = bytearray(UNIVERSE_SIZE), bytearray(UNIVERSE_SIZE)
+    for channel in range(UNIVERSE_SIZE):
+        owners = [(p, v[channel]) for p, v, m in layers if m[channel]]
+        if owners:
+            values[channel] = max(owners)[1]
+            mask[channel] = 0xFF
+    return bytes(values), bytes(mask)
+
+
+def _layer(rng, priority):
+    values = rng.randbytes(UNIVERSE_SIZE)
+    mask = bytes(rng.choice((0, 0xFF)) for _ in range(UNIVERSE_SIZE))
+    return priority, values, mask
+
+
+@pytest.mark.parametrize("count", [2, 3, 8])
+def test_priority_merge_matches_reference(count):
+    rng = random.Random(count)
+    layers = [_layer(rng, rng.choice((0, 1, MAX_PRIORITY))) for _ in range(count)]
+    assert priority_merge(layers) == _reference(layers)
+
+
+def test_higher_priority_wins_over_brighter_values():
+    low = (0, bytes([255]) * UNIVERSE_SIZE, bytes([0xFF]) * UNIVERSE_SIZE)
+    high = (5, bytes([10]) * UNIVERSE_SIZE, bytes([0xFF]) * 2 + bytes(510))
+    values, mask = priority_merge([low, high])
+    assert values[:3] == bytes([10, 10, 255])
+    assert mask == bytes([0xFF]) * UNIVERSE_SIZE
+
+
+def test_equal_priorities_merge_highest_takes_precedence():
+    a = (3, bytes([200, 10]) + bytes(510), bytes([0xFF, 0xFF]) + bytes(510))
+    b = (3, bytes([20, 100]) + bytes(510), bytes([0xFF, 0xFF]) + bytes(510))
+    values, mask = priority_merge([a, b])
+    assert values[:2] == bytes([200, 100])
+    assert mask[:3] == bytes([0xFF, 0xFF, 0])
+
+
+def test_unowned_channels_are_dark():
+    layer = (1, bytes([255]) * UNIVERSE_SIZE, bytes([0xFF]) + bytes(511))
+    assert priority_merge([layer]) == (
+        bytes([255]) + bytes(511),
+        bytes([0xFF]) + bytes(511),
+    )
+    assert priority_merge([]) == (bytes(UNIVERSE_SIZE), bytes(UNIVERSE_SIZE))
@@ -0,0 +1,57 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import struct
+
+import orjson
+
+from src.core import settings
+from src.services.dmx_processor import DMXProcessor, server_clock
+from src.services.dmx_protocol import DMXProtocol
+
+
+class _Socket:
+    def __init__(self):
+        self.texts: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        self.texts.append(text)
+
+
+def test_timed_frames_put_the_timestamp_after_the_universe():
+    values = bytes([1, 2, 3])
+    frame = DMXProtocol.pack_timed(300, 1_234_567, values)
+    assert struct.unpack("!Hq", frame[:10]) == (300, 1_234_567)
+    assert frame[10:] == values
+    assert DMXProtocol.stamp(DMXProtocol.pack_buffer(300, values), 1_234_567) == frame
+
+
+def test_sync_requests_are_answered_with_server_times():
+    socket = _Socket()
+    processor = DMXProcessor(socket, None)
+    assert not processor.timed
+
+    before = server_clock()
+    asyncio.run(processor.json_data({"type": "sync", "t0": 42}))
+    after = server_clock()
+
+    reply = orjson.loads(socket.texts[0])
+    assert reply["type"] == "sync"
+    assert reply["t0"] == 42
+    assert before <= reply["t1"] <= reply["t2"] <= after
+    assert reply["delay"] == round(settings.DMX_PLAYOUT_DELAY * 1_000_000)
+    assert processor.timed
@@ -0,0 +1,138 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+import pytest
+
+from src.engine.color import ColorConverter, to_rgb, wheel_slots
+from src.engine.effects import compile_effect
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.models.dmx.effects import FxTypes
+from src.models.dmx.scenes import ColorSpace
+from src.models.fixtures import AttributeType
+
+RED = AttributeType.COLOR_RED
+GREEN = AttributeType.COLOR_GREEN
+BLUE = AttributeType.COLOR_BLUE
+WHITE = AttributeType.COLOR_WHITE
+WHEEL = AttributeType.COLOR_WHEEL
+WHEEL_SLOTS = wheel_slots(
+    [
+        {"value": 0, "color": [255, 255, 255]},
+        {"value": 20, "color": [255, 0, 0]},
+        {"value": 40, "color": [0, 0, 255]},
+    ]
+)
+
+
+def _fixture(fixture_type_id: uuid.UUID, first: int, attributes, wheel=()):
+    return PatchedFixture(
+        uuid.uuid4(),
+        first + 1,
+        "Fixture",
+        1,
+        fixture_type_id,
+        {
+            attribute: PatchedChannel(attribute, first + offset)
+            for offset, attribute in enumerate(attributes)
+        },
+        wheel,
+    )
+
+
+@pytest.mark.parametrize(
+    "space, components, expected",
+    [
+        (ColorSpace.RGB, (0.2, 1.5, -1.0), (0.2, 1.0, 0.0)),
+        (ColorSpace.HSV, (120.0, 1.0, 0.5), (0.0, 0.5, 0.0)),
+        (ColorSpace.HSV, (480.0, 1.0, 1.0), (0.0, 1.0, 0.0)),
+        (ColorSpace.XY, (0.3127, 0.3290, 1.0), (1.0, 1.0, 1.0)),
+    ],
+)
+def test_colours_convert_to_rgb(space, components, expected):
+    assert to_rgb(space, *components) == pytest.approx(expected, abs=0.01)
+
+
+def test_rgbw_extracts_the_white_part():
+    converter = ColorConverter([RED, GREEN, BLUE, WHITE])
+    assert converter.convert((1.0, 0.6, 0.2)) == {
+        RED: 204,
+        GREEN: 102,
+        BLUE: 0,
+        WHITE: 51,
+    }
+
+
+def test_white_only_fixtures_show_the_luminance():
+    assert ColorConverter([WHITE]).convert((0.0, 1.0, 0.0)) == {WHITE: 182}
+
+
+def test_wheels_pick_the_nearest_slot_unless_the_type_mixes():
+    assert ColorConverter([WHEEL], WHEEL_SLOTS).convert((0.9, 0.1, 0.2)) == {WHEEL: 20}
+    mixing = ColorConverter([RED, GREEN, BLUE, WHEEL], WHEEL_SLOTS)
+    assert WHEEL not in mixing.convert((0.0, 0.0, 1.0))
+
+
+def test_tables_are_shared_per_cycle():
+    converter = ColorConverter([RED, GREEN, BLUE])
+    cycle = [(1.0, 0.0, 0.0), (0.0, 0.0, 1.0)]
+    tables = converter.tables(cycle)
+    assert tables == {RED: bytes([255, 0]), GREEN: bytes(2), BLUE: bytes([0, 255])}
+    assert converter.tables(list(cycle)) is tables
+
+
+def test_patch_converts_scene_colours_per_type():
+    rgb = _fixture(uuid.uuid4(), 0, [RED, GREEN, BLUE])
+    wheel = _fixture(uuid.uuid4(), 3, [WHEEL], WHEEL_SLOTS)
+    patch = Patch([rgb, wheel])
+    values = patch.color_values(
+        [
+            (rgb.id, ColorSpace.HSV, 240.0, 1.0, 1.0),
+            (wheel.id, ColorSpace.HSV, 240.0, 1.0, 1.0),
+            (uuid.uuid4(), ColorSpace.RGB, 1.0, 1.0, 1.0),
+        ]
+    )
+    assert sorted(values) == sorted(
+        [
+            (rgb.id, RED, 0),
+            (rgb.id, GREEN, 0),
+            (rgb.id, BLUE, 255),
+            (wheel.id, WHEEL, 40),
+        ]
+    )
+    assert patch.converter(wheel.id) is patch.converter(wheel.id)
+
+
+def test_colour_cycle_drives_mixed_fixture_types():
+    rgb = _fixture(uuid.uuid4(), 0, [RED, GREEN, BLUE])
+    white = _fixture(uuid.uuid4(), 3, [WHITE])
+    patch = Patch([rgb, white])
+    kernel = compile_effect(
+        uuid.uuid4(),
+        FxTypes.COLOR_CYCLE,
+        {
+            "fixtures": [str(rgb.id), str(white.id)],
+            "colors": [[255, 0, 0], [0, 0, 255]],
+            "phase_spread": 0,
+        },
+        patch,
+    )
+    frame = {1: bytes([7]) * 512}
+    kernel.render(0.0, frame)
+    assert list(frame[1][:5]) == [255, 0, 0, 54, 7]
+    kernel.render(0.5, frame)
+    assert list(frame[1][:5]) == [0, 0, 255, 18, 7]
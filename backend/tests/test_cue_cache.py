@@ -0,0 +1,75 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.engine.cue_cache import CueCache
+
+
+async def _missing(number):
+    return None
+
+
+async def _broken(number):
+    raise RuntimeError("database unavailable")
+
+
+@pytest.mark.parametrize("failure", [_missing, _broken])
+def test_failed_goto_keeps_prefetch(failure):
+    async def run():
+        async def loader(number):
+            if number == 4:
+                return await failure(number)
+            return SimpleNamespace(number=number)
+
+        cache = CueCache([1, 2, 3, 4], loader)
+        await cache.prime()
+        assert (await cache.advance()).number == 1
+        try:
+            assert await cache.goto(4) is None
+        except RuntimeError:
+            pass
+        assert (await cache.advance()).number == 2
+        assert (await cache.advance()).number == 3
+        await cache.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("failure", [_missing, _broken])
+def test_failed_prefetch_is_retried(failure):
+    async def run():
+        failed = set()
+
+        async def loader(number):
+            if number == 2 and number not in failed:
+                failed.add(number)
+                return await failure(number)
+            return SimpleNamespace(number=number)
+
+        cache = CueCache([1, 2, 3], loader)
+        await cache.prime()
+        assert (await cache.advance()).number == 1
+        assert (await cache.advance()).number == 2
+        assert cache.misses == 1
+        assert (await cache.advance()).number == 3
+        assert await cache.advance() is None
+        await cache.close()
+
+    asyncio.run(run())
@@ -0,0 +1,62 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import uuid
+
+from src.engine.curves import LINEAR, CurveStage, curve_table
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.engine.playback import PlaybackEngine
+from src.models.fixtures import AttributeType, DimmerCurve
+
+
+def test_curve_tables():
+    assert curve_table(None) == LINEAR
+    square = curve_table(DimmerCurve.SQUARE)
+    assert (square[0], square[128], square[255]) == (0, 64, 255)
+    s_curve = curve_table(DimmerCurve.S_CURVE)
+    assert s_curve[64] < 64 and s_curve[192] > 192
+
+
+def test_custom_curves_interpolate_between_points():
+    table = curve_table(DimmerCurve.CUSTOM, [[200, 255], [100, 50], [100, 60]])
+    assert table[0] == table[100] == 60
+    assert table[150] == 158
+    assert table[255] == 255
+    assert curve_table(DimmerCurve.CUSTOM, []) == LINEAR
+
+
+def test_stage_corrects_only_curved_channels():
+    square = curve_table(DimmerCurve.SQUARE)
+    stage = CurveStage([(1, 0, square), (1, 2, square), (1, 3, LINEAR)])
+    assert len(stage) == 1
+    frame = {1: memoryview(bytes([128]) * 512), 2: bytes([128]) * 512}
+    stage.apply(frame)
+    assert list(frame[1][:4]) == [64, 128, 64, 128]
+    assert frame[2] == bytes([128]) * 512
+
+
+def test_curves_apply_to_the_programmer_without_a_cue():
+    dimmer = PatchedChannel(
+        AttributeType.DIMMER, 3, curve=curve_table(DimmerCurve.SQUARE)
+    )
+    fixture = PatchedFixture(
+        uuid.uuid4(), 1, "Dimmer 1", 0, uuid.uuid4(), {AttributeType.DIMMER: dimmer}
+    )
+    engine = PlaybackEngine(None)
+    asyncio.run(engine.load_cues(Patch([fixture]), {}))
+    engine.programmer.set_many("a", [(0, 3, 128)])
+    assert engine.render_frame(0.0)[0][3] == 64
@@ -0,0 +1,152 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+import pytest
+
+from src.engine.audio import AudioLevels
+from src.engine.effects import compile_effect
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.models.dmx.effects import FxTypes
+from src.models.fixtures import AttributeType
+
+
+def _patch(count: int) -> Patch:
+    fixture_type_id = uuid.uuid4()
+    return Patch(
+        [
+            PatchedFixture(
+                uuid.uuid4(),
+                fid,
+                f"Dimmer {fid}",
+                1,
+                fixture_type_id,
+                {AttributeType.DIMMER: PatchedChannel(AttributeType.DIMMER, fid - 1)},
+            )
+            for fid in range(1, count + 1)
+        ]
+    )
+
+
+def _render(kernel, t: float, count: int) -> list[int]:
+    frame = {1: bytes(512)}
+    kernel.render(t, frame)
+    return list(frame[1][:count])
+
+
+def _fixtures(patch: Patch) -> list[str]:
+    return [str(fixture_id) for fixture_id in patch.fixtures]
+
+
+def test_sine_follows_the_waveform():
+    patch = _patch(4)
+    kernel = compile_effect(
+        uuid.uuid4(),
+        FxTypes.SINE,
+        {"fixtures": _fixtures(patch), "phase_spread": 0},
+        patch,
+    )
+    assert _render(kernel, 0.0, 4) == [128] * 4
+    assert _render(kernel, 0.25, 4) == [255] * 4
+    assert _render(kernel, 0.75, 4) == [0] * 4
+
+
+def test_chaser_steps_through_the_selection():
+    patch = _patch(4)
+    kernel = compile_effect(
+        uuid.uuid4(), FxTypes.CHASER, {"fixtures": _fixtures(patch)}, patch
+    )
+    for step in range(4):
+        expected = [0] * 4
+        expected[step] = 255
+        assert _render(kernel, step * 0.25 + 0.1, 4) == expected
+
+
+def test_sparkle_is_deterministic():
+    patch = _patch(8)
+    parameters = {"fixtures": _fixtures(patch), "density": 0.5, "speed": 4}
+    effect_id = uuid.uuid4()
+    first = compile_effect(effect_id, FxTypes.SPARKLE, parameters, patch)
+    second = compile_effect(effect_id, FxTypes.SPARKLE, parameters, patch)
+    for t in (0.0, 0.3, 0.6, 0.3):
+        values = _render(first, t, 8)
+        assert values == _render(second, t, 8)
+        assert values.count(255) == 4
+
+
+def test_effect_keeps_unselected_channels():
+    patch = _patch(2)
+    kernel = compile_effect(
+        uuid.uuid4(),
+        FxTypes.SINE,
+        {"fixtures": _fixtures(patch)[:1], "phase_spread": 0},
+        patch,
+    )
+    frame = {1: bytes([0, 7]) + bytes(510)}
+    kernel.render(0.25, frame)
+    assert list(frame[1][:2]) == [255, 7]
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        {"fixtures": ["not-a-uuid"]},
+        {"speed": "fast"},
+        {"low": None},
+        {"attribute": "no-such-attribute"},
+        {"fixtures": 5},
+    ],
+)
+def test_invalid_parameters_skip_the_effect(parameters):
+    patch = _patch(2)
+    parameters = {"fixtures": _fixtures(patch), **parameters}
+    assert compile_effect(uuid.uuid4(), FxTypes.SINE, parameters, patch) is None
+
+
+def test_beat_locked_effects_stay_in_step():
+    patch = _patch(4)
+    parameters = {"fixtures": _fixtures(patch), "beats": 1}
+    kernel = compile_effect(uuid.uuid4(), FxTypes.CHASER, parameters, patch)
+    # One step per beat, whenever the cue started.
+    for beat in (0.1, 0.35, 0.6, 2.85):
+        assert kernel.phase(0.0, beat) == kernel.phase(12.3, beat)
+    frame = {1: bytes(512)}
+    kernel.render(0.0, frame, beat=1.3)
+    assert list(frame[1][:4]) == [0, 255, 0, 0]
+
+
+def test_audio_effects_follow_the_analysis():
+    patch = _patch(2)
+    parameters = {"fixtures": _fixtures(patch), "band": 1, "low": 0, "high": 100}
+    kernel = compile_effect(uuid.uuid4(), FxTypes.AUDIO, parameters, patch)
+    frame = {1: bytes(512)}
+    kernel.render(0.0, frame, audio=AudioLevels(bands=bytes([0, 255, 0])))
+    assert list(frame[1][:2]) == [100, 100]
+    kernel.render(0.0, frame)
+    assert list(frame[1][:2]) == [0, 0]
+
+
+def test_onset_effects_step_on_onsets():
+    patch = _patch(4)
+    parameters = {"fixtures": _fixtures(patch), "onset": True}
+    kernel = compile_effect(uuid.uuid4(), FxTypes.CHASER, parameters, patch)
+    for onsets in range(4):
+        expected = [0] * 4
+        expected[onsets] = 255
+        frame = {1: bytes(512)}
+        kernel.render(99.0, frame, audio=AudioLevels(onsets=onsets))
+        assert list(frame[1][:4]) == expected
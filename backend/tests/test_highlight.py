@@ -0,0 +1,108 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.engine.programmer import ProgrammerOverlay
+from src.models.fixtures import AttributeType
+
+
+def _patch() -> Patch:
+    fixture_type_id = uuid.uuid4()
+    return Patch(
+        [
+            PatchedFixture(
+                uuid.uuid4(),
+                fid,
+                f"Spot {fid}",
+                1,
+                fixture_type_id,
+                {
+                    AttributeType.DIMMER: PatchedChannel(
+                        AttributeType.DIMMER, fid * 2, 0, 255
+                    ),
+                    # A shutter that is open at 0.
+                    AttributeType.SHUTTER: PatchedChannel(
+                        AttributeType.SHUTTER, fid * 2 + 1, 255, 255, True
+                    ),
+                },
+            )
+            for fid in range(2)
+        ]
+    )
+
+
+def _event(kind: str, fixtures) -> dict:
+    return {"op": kind, "owner": "a", "fixtures": [str(f) for f in fixtures]}
+
+
+def test_home_and_highlight_honour_inverted_channels():
+    patch = _patch()
+    f0, f1 = patch.fixtures
+    defaults = patch.defaults()
+    values, mask, addresses = defaults.home([f1, uuid.uuid4()])[1]
+    assert addresses == (2, 3)
+    assert mask[:4] == b"\x00\x00\xff\xff"
+    assert values[2:4] == bytes([0, 0])
+    values, _, _ = defaults.highlight([f0])[1]
+    assert values[:2] == bytes([255, 0])
+
+
+def test_locate_is_a_programmer_override_of_its_owner():
+    patch = _patch()
+    defaults = patch.defaults()
+    programmer = ProgrammerOverlay()
+    programmer.set_many("a", [(1, 2, 9)])
+    programmer.apply_event(_event("locate", patch.fixtures), defaults)
+    assert programmer.owner(1, 2) == "a"
+
+    frame = {1: bytes([7]) * 512}
+    programmer.apply(frame)
+    assert frame[1][:5] == bytes([0, 0, 0, 0, 7])
+
+    programmer.clear("a")
+    frame = {1: bytes([7]) * 512}
+    programmer.apply(frame)
+    assert frame[1][:5] == bytes([7] * 5)
+
+
+def test_highlight_is_replaced_and_never_owned():
+    patch = _patch()
+    f0, f1 = patch.fixtures
+    defaults = patch.defaults()
+    programmer = ProgrammerOverlay()
+    programmer.apply_event(_event("highlight", [f0]), defaults)
+    programmer.apply_event(_event("highlight", [f1]), defaults)
+    assert programmer.highlighted == 2
+    assert programmer.owner(1, 2) is None
+
+    frame = {}
+    programmer.apply(frame)
+    assert frame[1][:4] == bytes([0, 0, 255, 0])
+
+    programmer.apply_event(_event("highlight", []), defaults)
+    assert programmer.highlighted == 0
+
+
+def test_defaults_are_needed_for_locate_and_highlight():
+    patch = _patch()
+    programmer = ProgrammerOverlay()
+    programmer.apply_event(_event("locate", patch.fixtures))
+    programmer.apply_event(_event("highlight", patch.fixtures))
+    frame = {}
+    programmer.apply(frame)
+    assert frame == {}
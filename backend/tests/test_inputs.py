@@ -0,0 +1,84 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import base64
+
+import pytest
+
+from src.engine.buffers import priority_merge
+from src.engine.inputs import InputSources
+from src.services.dmx_protocol import DMXProtocol
+
+
+def test_input_sources_own_the_channels_they_send():
+    inputs = InputSources()
+    inputs.set("wing:0", 1, 300, bytes([10, 20]))
+    ((priority, values, mask),) = inputs.layers()[1]
+    assert priority == 254
+    assert values == bytes([10, 20]) + bytes(510)
+    assert mask == b"\xff\xff" + bytes(510)
+
+    inputs.set("wing:0", 1, 0, bytes(600))
+    assert inputs.layers()[1][0][2] == b"\xff" * 512
+
+
+def test_higher_priority_inputs_win_the_merge():
+    inputs = InputSources()
+    inputs.set("wing:0", 1, 50, bytes([10, 20]))
+    inputs.set("panel:0", 1, 100, bytes([5]))
+    stack = (50, bytes([200, 0, 30]) + bytes(509), b"\xff" * 3 + bytes(509))
+    values, _ = priority_merge([stack, *inputs.layers()[1]])
+    # Channel 1 belongs to the panel, channel 2 to the highest value of
+    # the stack and the wing at equal priority.
+    assert values[:3] == bytes([5, 20, 30])
+
+
+def test_released_sources_leave_the_merge():
+    inputs = InputSources()
+    inputs.apply_event(
+        {
+            "source": "wing:0",
+            "universe": "2",
+            "priority": 10,
+            "values": base64.b64encode(bytes([1, 2, 3])).decode(),
+        }
+    )
+    inputs.set("panel:0", 1, 10, bytes([4]))
+    assert len(inputs) == 2
+    assert inputs.sources == ["panel:0", "wing:0"]
+
+    inputs.apply_event({"source": "wing:0", "release": True})
+    assert list(inputs.layers()) == [1]
+    assert inputs.sources == ["panel:0"]
+
+
+def test_input_frames_round_trip():
+    frame = DMXProtocol.pack_input(513, 2, 80, bytes([1, 2, 3]))
+    assert DMXProtocol.unpack_input(frame) == (513, 2, 80, bytes([1, 2, 3]))
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        DMXProtocol.pack_input(1, 0, 80, b""),
+        DMXProtocol.pack_input(1, 0, 80, bytes(513)),
+        DMXProtocol.pack_input(1, 0, 255, bytes(1)),
+        b"\x00",
+    ],
+)
+def test_malformed_input_frames_are_rejected(frame):
+    with pytest.raises(ValueError):
+        DMXProtocol.unpack_input(frame)
@@ -0,0 +1,77 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from src.engine import interpreter
+from src.engine.pool import EnginePool
+from src.engine.process import EngineProcess
+
+
+class _ExecutionFailed(Exception):
+    pass
+
+
+class _Interpreter:
+    def __init__(self, failing: str | None):
+        self.failing = failing
+        self.closed = False
+
+    def exec(self, code: str) -> None:
+        if self.failing is not None and self.failing in code:
+            raise _ExecutionFailed(f"{self.failing} does not support subinterpreters")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Interpreters:
+    ExecutionFailed = _ExecutionFailed
+
+    def __init__(self, failing: str | None = None):
+        self.failing = failing
+        self.created: list[_Interpreter] = []
+
+    def create(self) -> _Interpreter:
+        self.created.append(_Interpreter(self.failing))
+        return self.created[-1]
+
+
+def _probe(monkeypatch, fake: _Interpreters | None) -> bool:
+    monkeypatch.setattr(interpreter, "interpreters", fake)
+    interpreter.available.cache_clear()
+    try:
+        return interpreter.available()
+    finally:
+        interpreter.available.cache_clear()
+
+
+def test_unsupported_engine_imports_fall_back_to_processes(monkeypatch):
+    fake = _Interpreters(failing="playback")
+    monkeypatch.setattr(interpreter, "interpreters", fake)
+    interpreter.available.cache_clear()
+    try:
+        assert isinstance(EnginePool(isolation="interpreter")._create(), EngineProcess)
+        assert interpreter.available() is False
+        assert len(fake.created) == 1 and fake.created[0].closed
+    finally:
+        interpreter.available.cache_clear()
+
+
+def test_available_when_the_engine_imports(monkeypatch):
+    assert _probe(monkeypatch, _Interpreters()) is True
+
+
+def test_unavailable_before_python_3_14(monkeypatch):
+    assert _probe(monkeypatch, None) is False
@@ -0,0 +1,91 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from src.engine.baker import BakedCue, Baker, TrackingResolver
+from src.engine.fade import CueFade
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.models.dmx.cues import EasingProfile
+from src.models.fixtures import AttributeType
+
+DIMMER = AttributeType.DIMMER
+PAN = AttributeType.PAN
+
+
+def _patch(count: int) -> Patch:
+    fixture_type_id = uuid.uuid4()
+    return Patch(
+        [
+            PatchedFixture(
+                uuid.uuid4(),
+                fid,
+                f"Spot {fid}",
+                1,
+                fixture_type_id,
+                {
+                    DIMMER: PatchedChannel(DIMMER, (fid - 1) * 2),
+                    PAN: PatchedChannel(PAN, (fid - 1) * 2 + 1),
+                },
+            )
+            for fid in range(1, count + 1)
+        ]
+    )
+
+
+def _cue(number: int) -> BakedCue:
+    return BakedCue(
+        id=uuid.uuid4(),
+        number=number,
+        label=None,
+        hold=0.0,
+        fade=2.0,
+        easing=EasingProfile.LINEAR,
+    )
+
+
+def test_dark_fixtures_move_before_they_light_up():
+    patch = _patch(2)
+    f1, f2 = patch.fixtures
+    resolver = TrackingResolver(
+        Baker(patch),
+        {
+            1: [(f1, DIMMER, 255), (f1, PAN, 10), (f2, PAN, 20)],
+            2: [(f1, PAN, 90), (f2, DIMMER, 255), (f2, PAN, 200)],
+        },
+    )
+    cue = resolver.track(_cue(1))
+
+    # Only the dark fixture is pre-moved, and the follow time is unchanged.
+    assert bytes(cue.tracked[1].values[:4]) == bytes([255, 10, 0, 200])
+    assert cue.duration == 2.0
+    (premove,) = [timing for timing in cue.timings[1] if timing.premove]
+    assert (premove.delay, premove.fade) == (2.0, 1.0)
+
+    # The pre-move starts once the cue's own fade has finished.
+    fade = CueFade(cue, {1: bytes([0, 10, 0, 20]) + bytes(508)}, 0.0)
+    assert fade.render(1.0)[1][:4] == bytes([128, 10, 0, 20])
+    assert fade.render(2.0)[1][:4] == bytes([255, 10, 0, 20])
+    assert fade.render(3.0)[1][:4] == bytes([255, 10, 0, 200])
+
+
+def test_the_last_cue_is_not_pre_moved():
+    patch = _patch(1)
+    (f1,) = patch.fixtures
+    resolver = TrackingResolver(Baker(patch), {1: [(f1, PAN, 10)]})
+    cue = resolver.track(_cue(1))
+    assert cue.timings == {}
+    assert bytes(cue.tracked[1].values[:2]) == bytes([0, 10])
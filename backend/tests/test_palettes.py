@@ -0,0 +1,102 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from src.engine.baker import Baker, TrackingResolver
+from src.engine.palettes import BakedPalette
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.models.dmx.scenes import ColorSpace
+from src.models.fixtures import AttributeGroup, AttributeType
+
+RED = AttributeType.COLOR_RED
+GREEN = AttributeType.COLOR_GREEN
+BLUE = AttributeType.COLOR_BLUE
+DIMMER = AttributeType.DIMMER
+
+
+def _patch(count: int) -> Patch:
+    fixture_type_id = uuid.uuid4()
+    return Patch(
+        [
+            PatchedFixture(
+                uuid.uuid4(),
+                fid,
+                f"LED {fid}",
+                1,
+                fixture_type_id,
+                {
+                    attribute: PatchedChannel(attribute, (fid - 1) * 4 + offset)
+                    for offset, attribute in enumerate((DIMMER, RED, GREEN, BLUE))
+                },
+            )
+            for fid in range(1, count + 1)
+        ]
+    )
+
+
+def test_fixture_values_win_over_shared_values_and_colour():
+    patch = _patch(2)
+    f1, f2 = patch.fixtures
+    palette = BakedPalette(
+        uuid.uuid4(),
+        AttributeGroup.COLOR,
+        color=(ColorSpace.RGB, 1.0, 0.0, 0.0),
+        shared=((GREEN, 10),),
+        fixtures={f2: ((RED, 20),)},
+    )
+    assert palette.values(f1, patch) == [
+        (f1, RED, 255),
+        (f1, GREEN, 0),
+        (f1, BLUE, 0),
+        (f1, GREEN, 10),
+    ]
+    assert palette.values(f2, patch)[-1] == (f2, RED, 20)
+
+
+def test_literal_values_override_palettes():
+    patch = _patch(1)
+    (f1,) = patch.fixtures
+    red = BakedPalette(uuid.uuid4(), AttributeGroup.COLOR, shared=((RED, 255),))
+    resolver = TrackingResolver(
+        Baker(patch, [red]),
+        {1: [(f1, RED, 7)], 2: []},
+        {1: [(f1, red.id), (f1, uuid.uuid4())], 2: [(f1, red.id)]},
+    )
+    assert resolver.state(1)[1].values[1] == 7
+    assert resolver.state(2)[1].values[1] == 255
+    assert resolver.palette_users(red.id) == [1, 2]
+
+
+def test_palette_edits_recompile_their_users():
+    patch = _patch(1)
+    (f1,) = patch.fixtures
+    baker = Baker(
+        patch, [BakedPalette(uuid.uuid4(), AttributeGroup.COLOR, shared=((RED, 50),))]
+    )
+    (palette_id,) = baker.palettes
+    resolver = TrackingResolver(
+        baker, {1: [], 2: [(f1, DIMMER, 255)], 3: []}, {2: [(f1, palette_id)]}
+    )
+    assert resolver.state(3)[1].values[1] == 50
+
+    baker.palettes[palette_id] = BakedPalette(
+        palette_id, AttributeGroup.COLOR, shared=((RED, 90),)
+    )
+    for number in resolver.palette_users(palette_id):
+        resolver.invalidate(number)
+
+    assert bytes(resolver.state(3)[1].values[:2]) == bytes([255, 90])
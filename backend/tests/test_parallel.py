@@ -0,0 +1,66 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+import uuid
+
+from src.engine.baker import BakedCue, UniverseState
+from src.engine.fade import CueFade
+from src.engine.parallel import UniverseRenderer, free_threaded
+from src.models.dmx.cues import EasingProfile
+
+
+def test_threads_render_every_universe_once():
+    renderer = UniverseRenderer(3, force=True)
+    try:
+        assert renderer.parallel
+        frame = renderer.map(lambda universe: bytes([universe]), range(1, 8))
+        assert frame == {universe: bytes([universe]) for universe in range(1, 8)}
+    finally:
+        renderer.close()
+
+
+def test_the_gil_falls_back_to_the_calling_thread():
+    renderer = UniverseRenderer(4)
+    assert renderer.parallel == free_threaded()
+    renderer.close()
+
+
+def test_parallel_fades_match_serial_ones():
+    rng = random.Random(7)
+    tracked = {
+        universe: UniverseState(
+            bytearray(rng.randbytes(512)), bytearray(b"\xff" * 256 + bytes(256))
+        )
+        for universe in range(1, 7)
+    }
+    cue = BakedCue(
+        id=uuid.uuid4(),
+        number=1,
+        label=None,
+        hold=0.0,
+        fade=2.0,
+        easing=EasingProfile.LINEAR,
+        tracked=tracked,
+    )
+    source = {universe: rng.randbytes(512) for universe in range(1, 5)}
+    fade = CueFade(cue, source, 0.0)
+    renderer = UniverseRenderer(3, force=True)
+    try:
+        for now in (0.0, 0.5, 2.0):
+            assert fade.render(now, renderer) == fade.render(now)
+    finally:
+        renderer.close()
@@ -0,0 +1,116 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+import pytest
+
+from src.engine.effects import compile_effect
+from src.engine.patch import Patch
+from src.engine.pixelmap import (
+    ImageSequence,
+    Pattern,
+    PixelLayout,
+    Sampler,
+    read_ppm,
+)
+from src.models.dmx.effects import FxTypes
+from src.models.fixtures import PixelWiring
+
+
+def _layout(width: int, height: int, **kwargs) -> PixelLayout:
+    return PixelLayout(uuid.uuid4(), width, height, 1, 0, **kwargs)
+
+
+def _ppm(width: int, height: int, pixels: bytes) -> bytes:
+    return b"P6\n# test\n%d %d\n255\n" % (width, height) + pixels
+
+
+@pytest.mark.parametrize(
+    "wiring, cells",
+    [
+        (PixelWiring.ROWS, [(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1)]),
+        (PixelWiring.SNAKE, [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1)]),
+        (PixelWiring.COLUMNS, [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0), (2, 1)]),
+    ],
+)
+def test_wiring_orders_the_cells(wiring, cells):
+    layout = _layout(3, 2, wiring=wiring)
+    assert [layout.cell(pixel) for pixel in range(6)] == cells
+
+
+def test_pixels_do_not_straddle_universes():
+    channels = PixelLayout(uuid.uuid4(), 2, 1, 1, 509).channels()
+    addresses = [(universe, address) for universe, address, _, _ in channels]
+    assert addresses == [(1, 509), (1, 510), (1, 511), (2, 0), (2, 1), (2, 2)]
+
+
+def test_sampler_honours_the_colour_order():
+    frame = bytes(range(12))
+    sampler = Sampler(_layout(2, 2, color_order="GRB"), 2, 2)
+    first, values = sampler.sample(frame, 1)
+    assert first == 0
+    assert values == bytes([1, 0, 2, 4, 3, 5, 7, 6, 8, 10, 9, 11])
+    assert sampler.row(frame, 1)[:12] == values
+    assert sampler.masks()[1][:13] == b"\xff" * 12 + b"\x00"
+
+
+def test_sampler_picks_the_nearest_source_pixel():
+    # A 4x1 source on a 2x1 layout shows source pixels 1 and 3.
+    frame = bytes([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3])
+    assert Sampler(_layout(2, 1), 4, 1).sample(frame, 1)[1] == bytes([1, 1, 1, 3, 3, 3])
+
+
+def test_ppm_images_are_read():
+    assert read_ppm(_ppm(1, 2, bytes(range(6)))) == (1, 2, bytes(range(6)))
+    with pytest.raises(ValueError):
+        read_ppm(_ppm(2, 2, bytes(6)))
+    with pytest.raises(ValueError):
+        read_ppm(b"P3\n1 1\n255\n" + bytes(3))
+
+
+def test_image_sequences_load_in_name_order(tmp_path):
+    (tmp_path / "b.ppm").write_bytes(_ppm(1, 1, b"\x02\x02\x02"))
+    (tmp_path / "a.ppm").write_bytes(_ppm(1, 1, b"\x01\x01\x01"))
+    sequence = ImageSequence(str(tmp_path))
+    assert sequence.steps == 2
+    assert sequence.frame(0) == b"\x01\x01\x01"
+    (tmp_path / "c.ppm").write_bytes(_ppm(2, 1, bytes(6)))
+    with pytest.raises(ValueError):
+        ImageSequence(str(tmp_path))
+
+
+def test_pixel_map_effect_splices_its_run():
+    layout = _layout(4, 1)
+    patch = Patch(pixel_maps=[layout])
+    kernel = compile_effect(
+        uuid.uuid4(),
+        FxTypes.PIXEL_MAP,
+        {"pixel_map": str(layout.id), "pattern": "rainbow"},
+        patch,
+    )
+    frame = {1: bytes([9]) * 512}
+    kernel.render(0.0, frame)
+    pattern = Pattern(4, 1)
+    assert frame[1][:12] == pattern.frame(0)
+    assert frame[1][12:] == bytes([9]) * 500
+
+
+def test_unknown_patterns_skip_the_effect():
+    layout = _layout(4, 1)
+    parameters = {"pixel_map": str(layout.id), "pattern": "plasma"}
+    patch = Patch(pixel_maps=[layout])
+    assert compile_effect(uuid.uuid4(), FxTypes.PIXEL_MAP, parameters, patch) is None
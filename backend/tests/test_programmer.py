@@ -0,0 +1,124 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import uuid
+
+import orjson
+import redis.asyncio as redis
+
+from src.engine.playback import PlaybackEngine
+from src.engine.programmer import ProgrammerOverlay
+from src.services.programmer import ProgrammerService
+
+
+def test_overlay_releases_only_the_owners_channels():
+    overlay = ProgrammerOverlay()
+    overlay.set_many("a", [(0, 1, 100), (1, 5, 7)])
+    overlay.set_many("b", [(0, 1, 50)])
+    assert overlay.owner(0, 1) == "b"
+
+    overlay.clear("a")
+    frame = {0: bytes(512)}
+    overlay.apply(frame)
+    assert frame[0][1] == 50
+    assert 1 not in frame
+
+    overlay.apply_event({"op": "clear", "owner": "b", "channels": [[0, 1]]})
+    frame = {}
+    overlay.apply(frame)
+    assert frame == {}
+    assert len(overlay) == 0
+
+
+def test_programmer_is_output_without_a_cue():
+    engine = PlaybackEngine(None)
+    engine.programmer.set_many("a", [(5, 0, 255)])
+    frame = engine.render_frame(0.0)
+    assert list(frame) == [5]
+    assert frame[5][:2] == b"\xff\x00"
+
+
+class _Pipeline:
+    """
+    The part of a Redis transaction pipeline ``clear_values`` uses. The
+    first ``conflicts`` executes fail as if the hash changed after WATCH.
+    """
+
+    def __init__(self, hash_: dict, conflicts: int):
+        self.hash = hash_
+        self.conflicts = conflicts
+        self.watches = 0
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def watch(self, key):
+        self.watches += 1
+
+    async def hgetall(self, key):
+        return dict(self.hash)
+
+    async def reset(self):
+        pass
+
+    def multi(self):
+        self.commands = []
+
+    def hdel(self, key, *fields):
+        self.commands.append(fields)
+
+    def publish(self, channel, message):
+        pass
+
+    async def execute(self):
+        if self.conflicts:
+            self.conflicts -= 1
+            # Another account takes a channel over before the transaction.
+            self.hash["0:1"] = orjson.dumps({"owner": "b", "fixture_id": "x"})
+            raise redis.WatchError()
+        for fields in self.commands:
+            for field in fields:
+                del self.hash[field]
+
+
+class _Redis:
+    def __init__(self, pipeline: _Pipeline):
+        self._pipeline = pipeline
+
+    def pipeline(self, transaction: bool):
+        return self._pipeline
+
+
+def test_clear_retries_when_a_channel_is_taken_over():
+    show_id = uuid.uuid4()
+    pipeline = _Pipeline(
+        {
+            "0:1": orjson.dumps({"owner": "a", "fixture_id": "x"}),
+            "0:2": orjson.dumps({"owner": "a", "fixture_id": "y"}),
+            "0:3": orjson.dumps({"owner": "b", "fixture_id": "y"}),
+        },
+        conflicts=1,
+    )
+    service = ProgrammerService(None, _Redis(pipeline))
+
+    assert asyncio.run(service.clear_values(show_id, "a")) == 1
+    assert pipeline.watches == 2
+    assert sorted(pipeline.hash) == ["0:1", "0:3"]
@@ -0,0 +1,80 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from src.engine.recorder import Recorder, Recording
+
+
+def _universe(value: int, changed: int = 0) -> bytes:
+    values = bytearray([value]) * 512
+    values[changed] = 255
+    return bytes(values)
+
+
+def _record(path, frames, keyframe_interval=1.0):
+    recorder = Recorder(str(path), 40.0, 10.0, keyframe_interval)
+    recorder.start()
+    for now, frame in frames:
+        recorder.capture(now, frame)
+    return recorder.close()
+
+
+FRAMES = [
+    (10.0, {1: _universe(0)}),
+    (10.5, {1: _universe(0, 100), 2: _universe(7)}),
+    (11.0, {1: _universe(0, 100), 2: _universe(7)}),
+    (11.5, {1: _universe(3, 300), 2: _universe(7)}),
+]
+
+
+def test_recordings_replay_their_frames(tmp_path):
+    path = tmp_path / "show.hyrc"
+    info = _record(path, FRAMES)
+    assert (info.rate, info.duration, info.universes) == (40.0, 1.5, (1, 2))
+
+    recording = Recording(str(path))
+    try:
+        assert recording.info.duration == 1.5
+        assert recording.info.universes == (1, 2)
+        for now, frame in FRAMES:
+            assert recording.frame_at(now - 10.0) == frame
+        # Going back jumps to the sync before the position.
+        assert recording.frame_at(0.7) == FRAMES[1][1]
+        assert recording.frame_at(9.0) == FRAMES[-1][1]
+    finally:
+        recording.close()
+
+
+def test_truncated_recordings_end_at_their_last_record(tmp_path):
+    path = tmp_path / "show.hyrc"
+    _record(path, FRAMES)
+    data = path.read_bytes()
+    # Cut into the last delta, behind the end marker.
+    path.write_bytes(data[:-40])
+    recording = Recording(str(path))
+    try:
+        assert recording.frame_at(9.0) == FRAMES[2][1]
+    finally:
+        recording.close()
+
+
+@pytest.mark.parametrize("data", [b"", b"HYRC", b"NOPE" + bytes(18)])
+def test_other_files_are_rejected(tmp_path, data):
+    path = tmp_path / "other.hyrc"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        Recording(str(path))
@@ -0,0 +1,78 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+
+from src.engine.baker import Baker
+from src.engine.effects import compile_effect
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.engine.selection import FixtureIndex
+from src.models.dmx.effects import FxTypes
+from src.models.fixtures import AttributeType
+
+SPOT = uuid.uuid4()
+WASH = uuid.uuid4()
+
+
+def _patch() -> Patch:
+    fixtures = []
+    for fid in range(1, 9):
+        fixture_type = SPOT if fid % 2 else WASH
+        channels = {AttributeType.DIMMER: PatchedChannel(AttributeType.DIMMER, 0)}
+        if fixture_type == SPOT:
+            channels[AttributeType.PAN] = PatchedChannel(AttributeType.PAN, 1)
+        fixtures.append(
+            PatchedFixture(
+                uuid.uuid4(), fid, f"Fixture {fid}", fid, fixture_type, channels
+            )
+        )
+    return Patch(fixtures)
+
+
+def test_query_parses_json_criteria():
+    patch = _patch()
+    index = FixtureIndex.from_patch(patch)
+    selection = index.query({"fixture_type": str(SPOT), "attributes": ["pan"]})
+    assert [fixture.fid for fixture in index.fixtures(selection)] == [1, 3, 5, 7]
+    assert index.query({"fixture_type": str(WASH), "universe": 3}) == 0
+
+
+def test_effect_selects_through_the_index():
+    patch = _patch()
+    index = FixtureIndex.from_patch(patch)
+    parameters = {"select": {"fixture_type": str(WASH)}}
+    kernel = compile_effect(uuid.uuid4(), FxTypes.SINE, parameters, patch, index)
+
+    expected = index.masks(index.select(fixture_type=WASH), [AttributeType.DIMMER])
+    assert {u: bytes(mask) for u, mask in kernel.masks.items()} == expected
+
+
+def test_baked_effects_follow_index_updates():
+    patch = _patch()
+    index = FixtureIndex.from_patch(patch)
+    baker = Baker(patch, index=index)
+    group_id = uuid.uuid4()
+    members = [fixture.id for fixture in patch.fixtures.values()][:2]
+    index.set_group(group_id, members)
+
+    kernel = compile_effect(
+        uuid.uuid4(),
+        FxTypes.SINE,
+        {"select": {"group": str(group_id)}},
+        baker.patch,
+        baker.index,
+    )
+    assert sorted(kernel.masks) == [1, 2]
@@ -0,0 +1,116 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+import threading
+
+import pytest
+
+from src.engine.playback import PlaybackEngine
+from src.engine.shared_output import SharedOutput
+
+
+@pytest.fixture
+def output():
+    block = SharedOutput.create(capacity=4)
+    yield block
+    block.close()
+
+
+def _universe(value: int) -> bytes:
+    return bytes([value]) * 512
+
+
+def test_readers_only_copy_changed_universes(output):
+    reader = SharedOutput.attach(output.name)
+    try:
+        assert output.write({1: _universe(1), 2: _universe(2)}) == 2
+        sequence, frame = reader.read()
+        assert frame == {1: _universe(1), 2: _universe(2)}
+
+        assert output.write({1: _universe(1), 2: _universe(2)}) == 0
+        assert reader.read(sequence) == (sequence, {})
+
+        assert output.write({1: _universe(1), 2: _universe(3)}) == 1
+        sequence, frame = reader.read(sequence)
+        assert frame == {2: _universe(3)}
+        assert reader.sequence == sequence
+    finally:
+        reader.close()
+
+
+def test_missing_universes_are_blanked(output):
+    output.write({5: _universe(255), 6: _universe(1)})
+    sequence = output.sequence
+    assert output.write({6: _universe(1)}) == 1
+    sequence, frame = output.read(sequence)
+    assert frame == {5: _universe(0)}
+    assert output.write({}) == 1
+    assert output.read(sequence)[1] == {6: _universe(0)}
+    assert output.write({}) == 0
+
+
+def test_released_programmer_goes_dark(output):
+    engine = PlaybackEngine(output)
+    engine.programmer.set_many("a", [(5, 0, 255)])
+    output.write(engine.render_frame(0.0))
+    assert output.read()[1][5][0] == 255
+
+    engine.programmer.clear("a")
+    output.write(engine.render_frame(0.0))
+    assert output.read()[1] == {5: _universe(0)}
+
+
+def test_capacity_is_enforced(output):
+    with pytest.raises(ValueError):
+        output.write({universe: _universe(1) for universe in range(5)})
+
+
+def test_readers_never_see_a_torn_frame(output):
+    reader = SharedOutput.attach(output.name)
+    done = threading.Event()
+
+    def write():
+        value = 0
+        while not done.is_set():
+            value = (value + 1) % 256
+            output.write({1: _universe(value), 2: _universe(value)})
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(2000):
+            snapshot = reader.read()
+            if snapshot is None or not snapshot[1]:
+                continue
+            frame = snapshot[1]
+            assert frame[1] == frame[2]
+    finally:
+        done.set()
+        writer.join()
+        sys.setswitchinterval(interval)
+        reader.close()
+
+
+def test_frames_carry_their_engine_time(output):
+    output.write({1: _universe(1)}, 12.5)
+    sequence, timestamp, frame = output.read_timed()
+    assert (timestamp, frame) == (12.5, {1: _universe(1)})
+    # An unchanged frame keeps the time of the last change.
+    output.write({1: _universe(1)}, 12.525)
+    assert output.read_timed(sequence) == (sequence, 12.5, {})
@@ -0,0 +1,68 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Golden frame regression test of the playback engine.
+
+A synthetic show is played on a simulated clock and the digest of every
+frame compared with the committed record. After an intended change of the
+rendered output, rewrite the record with::
+
+    HYPERION_UPDATE_GOLDEN=1 python -m pytest tests/test_simulation.py
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+import orjson
+
+from src.engine.bench import synthetic_patch, synthetic_show
+from src.engine.clock import SimulatedClock
+from src.engine.parallel import UniverseRenderer
+from src.engine.playback import PlaybackEngine
+from src.engine.simulation import ScriptEvent, check, record
+
+GOLDEN = Path(__file__).parent / "golden" / "synthetic_show.json"
+SCRIPT = [
+    ScriptEvent(0.0, "go"),
+    ScriptEvent(6.5, "set_fader", ["main", 0.5]),
+    ScriptEvent(9.0, "goto", [1]),
+]
+DURATION = 16.0
+
+
+async def _simulate(golden: dict | None) -> dict | int | None:
+    patch = synthetic_patch(2)
+    engine = PlaybackEngine(
+        None, renderer=UniverseRenderer(1, force=True), clock=SimulatedClock()
+    )
+    try:
+        await engine.load_cues(patch, {"main": synthetic_show(patch, cues=4)})
+        if golden is None:
+            return await record(engine, DURATION, SCRIPT)
+        return await check(engine, golden)
+    finally:
+        await engine.stop()
+        engine.renderer.close()
+
+
+def test_golden_frames():
+    if os.environ.get("HYPERION_UPDATE_GOLDEN"):
+        golden = asyncio.run(_simulate(None))
+        GOLDEN.write_bytes(orjson.dumps(golden, option=orjson.OPT_INDENT_2))
+    golden = orjson.loads(GOLDEN.read_bytes())
+    assert asyncio.run(_simulate(golden)) is None
@@ -0,0 +1,104 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import uuid
+from types import SimpleNamespace
+
+from src.engine.baker import BakedCue, Baker, UniverseState
+from src.engine.buffers import crossfade, lane_mask, split_crossfade
+from src.engine.fade import CueFade
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.models.dmx.cues import EasingProfile
+from src.models.fixtures import AttributeGroup, AttributeType
+
+# One moving head on universe 1: dimmer on channel 0, pan on channel 1.
+# Channel 2 is a plain dimmer that is not patched.
+PATCH = Patch(
+    [
+        PatchedFixture(
+            uuid.uuid4(),
+            1,
+            "Spot 1",
+            1,
+            uuid.uuid4(),
+            {
+                AttributeType.DIMMER: PatchedChannel(AttributeType.DIMMER, 0),
+                AttributeType.PAN: PatchedChannel(AttributeType.PAN, 1),
+            },
+        )
+    ]
+)
+
+
+def _timing(group: AttributeGroup, delay: float | None, fade: float | None):
+    return SimpleNamespace(group=group, delay=delay, fade=fade)
+
+
+def _cue(timings: list) -> BakedCue:
+    state = UniverseState()
+    for address in range(3):
+        state.set(address, 200)
+    return BakedCue(
+        id=uuid.uuid4(),
+        number=1,
+        label=None,
+        hold=0.0,
+        fade=2.0,
+        easing=EasingProfile.LINEAR,
+        universes={1: state},
+        tracked={1: state},
+        timings=Baker(PATCH).bake_timings(SimpleNamespace(timings=timings), 0.0, 2.0),
+    )
+
+
+def test_split_crossfade_matches_crossfade_per_part():
+    source = bytes(range(256)) * 2
+    target = bytes(reversed(range(256))) * 2
+    first = bytes([0xFF]) * 100 + bytes(412)
+    rest = bytes(100) + bytes([0xFF]) * 412
+    result = split_crossfade(
+        source, target, [(0.25, lane_mask(first)), (0.75, lane_mask(rest))]
+    )
+    assert result[:100] == crossfade(source, target, 0.25)[:100]
+    assert result[100:] == crossfade(source, target, 0.75)[100:]
+
+
+def test_groups_fade_with_their_own_timing():
+    cue = _cue(
+        [
+            _timing(AttributeGroup.INTENSITY, None, 4.0),
+            _timing(AttributeGroup.POSITION, 1.0, None),
+        ]
+    )
+    assert len(cue.timings[1]) == 3
+    assert cue.duration == 4.0
+
+    fade = CueFade(cue, {}, 0.0)
+    source, target = bytes(512), fade.target[1]
+    frame = fade.render(1.0)[1]
+    # Intensity: 1 of 4 s; position: delayed by 1 s; the rest: 1 of 2 s.
+    assert frame[0] == crossfade(source, target, 0.25)[0]
+    assert frame[1] == 0
+    assert frame[2] == crossfade(source, target, 0.5)[2]
+    frame = fade.render(2.0)[1]
+    assert frame[:3] == bytes([crossfade(source, target, 0.5)[0], 100, 200])
+    assert fade.render(4.0)[1][:3] == bytes([200, 200, 200])
+
+
+def test_timings_equal_to_the_cue_are_not_split():
+    cue = _cue([_timing(AttributeGroup.COLOR, 0.0, 2.0)])
+    assert cue.timings == {}
+    assert cue.duration == 2.0
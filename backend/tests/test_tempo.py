@@ -0,0 +1,58 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from src.engine.tempo import MAX_BPM, MIN_BPM, TAP_TIMEOUT, TempoClock
+
+
+def test_bpm_changes_keep_the_beat_position():
+    clock = TempoClock(120)
+    assert clock.current.beats(3.0) == 6.0
+    tempo = clock.set_bpm(60, 3.0)
+    assert tempo.beats(3.0) == 6.0
+    assert tempo.beats(5.0) == 8.0
+
+
+def test_taps_set_the_tempo_and_land_on_a_beat():
+    clock = TempoClock(120)
+    for tap in (10.0, 10.4, 10.8, 11.2):
+        tempo = clock.tap(tap)
+    assert tempo.bpm == pytest.approx(150.0)
+    assert tempo.beats(11.2) == round(tempo.beats(11.2))
+
+
+def test_a_pause_starts_a_new_tap_measurement():
+    clock = TempoClock(120)
+    clock.tap(0.0)
+    clock.tap(1.0)
+    assert clock.current.bpm == pytest.approx(60.0)
+    clock.tap(1.0 + TAP_TIMEOUT + 0.1)
+    assert clock.current.bpm == pytest.approx(60.0)
+    clock.tap(1.5 + TAP_TIMEOUT + 0.1)
+    assert clock.current.bpm == pytest.approx(120.0)
+
+
+def test_reset_makes_now_the_first_beat():
+    clock = TempoClock(120)
+    tempo = clock.reset(7.3)
+    assert tempo.beats(7.3) == 0.0
+    assert tempo.beats(7.8) == 1.0
+
+
+@pytest.mark.parametrize("bpm, expected", [(1, MIN_BPM), (10_000, MAX_BPM)])
+def test_bpm_is_clamped(bpm, expected):
+    assert TempoClock(bpm).current.bpm == expected
@@ -0,0 +1,76 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bisect
+import uuid
+
+import pytest
+
+from src.engine.baker import BakedCue, UniverseState
+from src.engine.timeline import Timeline, render_timeline, schedule
+from src.models.dmx.cues import EasingProfile
+
+RATE = 20.0
+
+
+def _cue(number: int, universe: int, address: int, value: int) -> BakedCue:
+    state = UniverseState()
+    state.set(address, value)
+    return BakedCue(
+        id=uuid.uuid4(),
+        number=number,
+        label=None,
+        hold=0.5,
+        fade=1.0,
+        easing=EasingProfile.LINEAR,
+        universes={universe: state},
+        tracked={universe: state},
+    )
+
+
+def test_rendered_timeline_matches_live_fades(tmp_path):
+    cues = [_cue(1, 1, 0, 255), _cue(2, 2, 5, 100), _cue(3, 1, 0, 10)]
+    path = str(tmp_path / "show.hytl")
+    info = render_timeline(path, cues, RATE, workers=2)
+    assert info.universes == (1, 2)
+    assert info.tick_count == 90
+
+    fades, _ = schedule(cues)
+    starts = [fade.started_at for fade in fades]
+    timeline = Timeline(path)
+    try:
+        assert timeline.info == info
+        for tick in range(info.tick_count):
+            now = tick / RATE
+            fade = fades[bisect.bisect_right(starts, now) - 1]
+            expected = fade.render(now)
+            frame = timeline.frame(tick)
+            assert {u: bytes(v) for u, v in frame.items()} == {
+                u: expected.get(u, bytes(512)) for u in info.universes
+            }
+        last = timeline.frame(info.tick_count - 1)
+        assert bytes(timeline.frame_at(1000.0)[1]) == bytes(last[1])
+        del frame, last
+    finally:
+        timeline.close()
+
+
+@pytest.mark.parametrize("content", [b"", b"HYTL", b"NOPE" + bytes(600)])
+def test_invalid_files_are_rejected(tmp_path, content):
+    path = tmp_path / "broken.hytl"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        Timeline(str(path))
@@ -0,0 +1,75 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+
+from src.engine.timer_wheel import TimerWheel
+
+
+def _fired(timers):
+    return [timer.args[0] for timer in timers]
+
+
+def test_timers_expire_on_their_tick_in_order():
+    wheel = TimerWheel()
+    wheel.call_at(3, print, "b")
+    wheel.call_at(2, print, "a")
+    wheel.call_at(3, print, "c")
+    assert _fired(wheel.advance(1)) == []
+    assert _fired(wheel.advance(3)) == ["a", "b", "c"]
+    assert len(wheel) == 0
+
+
+def test_timers_cascade_through_levels():
+    # Small levels, so deadlines cross several slot rollovers.
+    wheel = TimerWheel(bits=2, levels=3)
+    rng = random.Random(7)
+    deadlines = [rng.randrange(1, 200) for _ in range(100)]
+    for deadline in deadlines:
+        wheel.call_at(deadline, print, deadline)
+    fired = []
+    for tick in range(1, 201):
+        for timer in wheel.advance(tick):
+            assert timer.deadline == tick
+            fired.append(timer.deadline)
+    assert fired == sorted(deadlines)
+
+
+def test_cancelled_timers_do_not_fire():
+    wheel = TimerWheel()
+    keep = wheel.call_later(300, print, "keep")
+    drop = wheel.call_later(300, print, "drop")
+    drop.cancel()
+    drop.cancel()
+    assert not drop.active and keep.active
+    assert len(wheel) == 1
+    assert _fired(wheel.advance(300)) == ["keep"]
+    assert not keep.active
+
+
+def test_past_deadlines_fire_on_the_next_advance():
+    wheel = TimerWheel(now=10)
+    wheel.call_at(4, print, "late")
+    assert _fired(wheel.advance(10)) == ["late"]
+
+
+def test_clear_cancels_everything():
+    wheel = TimerWheel()
+    timers = [wheel.call_later(ticks, print, ticks) for ticks in (0, 5, 70000)]
+    wheel.clear()
+    assert len(wheel) == 0
+    assert not any(timer.active for timer in timers)
+    assert wheel.advance(100000) == []
@@ -0,0 +1,116 @@
+# Hyperion
+# Copyright (C) 2025 Arian Ott <arian.ott@ieee.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import uuid
+
+from src.engine.baker import BakedCue, Baker, TrackingResolver
+from src.engine.cue_cache import CueCache
+from src.engine.patch import Patch, PatchedChannel, PatchedFixture
+from src.engine.playback import Playback
+from src.models.dmx.cues import EasingProfile
+from src.models.fixtures import AttributeType
+
+
+def _patch(count: int) -> Patch:
+    fixture_type_id = uuid.uuid4()
+    return Patch(
+        [
+            PatchedFixture(
+                uuid.uuid4(),
+                fid,
+                f"Dimmer {fid}",
+                1,
+                fixture_type_id,
+                {AttributeType.DIMMER: PatchedChannel(AttributeType.DIMMER, fid - 1)},
+            )
+            for fid in range(1, count + 1)
+        ]
+    )
+
+
+def _dimmers(resolver: TrackingResolver, number: int, count: int) -> bytes:
+    return bytes(resolver.state(number)[1].values[:count])
+
+
+def test_inserted_cue_invalidates_later_states():
+    patch = _patch(2)
+    f1, f2 = patch.fixtures
+    resolver = TrackingResolver(
+        Baker(patch), {1: [(f1, AttributeType.DIMMER, 100)], 10: []}
+    )
+    assert _dimmers(resolver, 10, 2) == bytes([100, 0])
+
+    resolver.update(5, [(f2, AttributeType.DIMMER, 200)])
+
+    assert _dimmers(resolver, 5, 2) == bytes([100, 200])
+    assert _dimmers(resolver, 10, 2) == bytes([100, 200])
+
+
+def test_removed_cue_invalidates_later_states():
+    patch = _patch(2)
+    f1, f2 = patch.fixtures
+    resolver = TrackingResolver(
+        Baker(patch),
+        {
+            1: [(f1, AttributeType.DIMMER, 100)],
+            5: [(f2, AttributeType.DIMMER, 200)],
+            10: [],
+        },
+    )
+    assert _dimmers(resolver, 10, 2) == bytes([100, 200])
+
+    resolver.remove(5)
+
+    assert _dimmers(resolver, 10, 2) == bytes([100, 0])
+
+
+def test_editing_the_playing_cue_rebuilds_its_fade():
+    patch = _patch(2)
+    f1, f2 = patch.fixtures
+    resolver = TrackingResolver(
+        Baker(patch), {1: [(f1, AttributeType.DIMMER, 100)], 2: []}
+    )
+
+    async def loader(number):
+        cue = BakedCue(
+            id=uuid.uuid4(),
+            number=number,
+            label=None,
+            hold=0.0,
+            fade=2.0,
+            easing=EasingProfile.LINEAR,
+        )
+        return resolver.track(cue)
+
+    async def run():
+        playback = Playback(CueCache([1, 2], loader))
+        await playback.cache.prime()
+        await playback.go(0.0)
+        assert playback.render(1.0)[1][:2] == bytes([50, 0])
+
+        resolver.update(
+            1, [(f1, AttributeType.DIMMER, 100), (f2, AttributeType.DIMMER, 200)]
+        )
+        playback.reload(await playback.cache.reload_current())
+
+        # The fade keeps its start time and continues into the edited look.
+        assert playback.render(1.0)[1][:2] == bytes([50, 100])
+        assert playback.render(2.0)[1][:2] == bytes([100, 200])
+        assert playback.masks[1][:2] == b"\xff\xff"
+        await playback.cache.close()
+
+    asyncio.run(run())